@@ -1,125 +1,62 @@
 import argparse
-from src.anomaly_detection import detect_anomalies
-from src.can_parser import parse_can_log
-from src.data_analysis import (
-    calculate_message_frequency,
-    calculate_statistics,
-    filter_by_time_range,
-    evaluate_data_quality,
-    calculate_time_interval_statistics,
-    generate_diagnostics  # 진단 함수 추가
-)
-from src.data_visualization import (
-    plot_message_frequency,
-    plot_time_series,
-    plot_anomalies,
-    save_plot_message_frequency,
-    save_plot_anomalies,
-    plot_time_intervals
-)
-from src.report_generator import generate_html_report, generate_pdf_report
+import os
+from src.anomaly_detection import DEFAULT_SAMPLE_SIZE, DEFAULT_PER_ID_SAMPLE
+from src.batch_analysis import run_batch
+from src.can_parser import get_log_formats, DEFAULT_CHUNK_SIZE
+from src.pipeline import analyze_log
+from src.report_generator import MAX_INLINE_ANOMALIES, import_pyarrow
 
 
 def main():
     # 명령줄 인자 설정
     parser = argparse.ArgumentParser(description="CANalyzer: Analyze CAN logs.")
-    parser.add_argument("--file", help="Path to the CAN log file", required=True)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--file", help="Path to the CAN log file (csv, candump, asc, blf, trc)")
+    source.add_argument("--batch", help="Directory or glob pattern of CAN logs to analyse concurrently")
+    parser.add_argument("--output-dir", help="Directory for plots and reports (batch: one sub-directory per log, default batch_output)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Logs analysed at the same time in batch mode")
+    parser.add_argument("--force", action="store_true", help="Batch mode: re-analyse logs whose outputs are up to date")
+    parser.add_argument("--log-format", choices=get_log_formats(), help="Log format (detected from the file if omitted)")
     parser.add_argument("--start-time", type=float, help="Start time for filtering", default=0.0)
     parser.add_argument("--end-time", type=float, help="End time for filtering", default=float("inf"))
     parser.add_argument("--report-type", choices=["pdf", "html"], help="Report type to generate", default="pdf")
     parser.add_argument("--anomaly-detection", action="store_true", help="Enable anomaly detection")
+    parser.add_argument("--model", help="Score anomalies with a saved model instead of fitting on this log")
+    parser.add_argument("--train-model", help="Train an anomaly model on this (known-good) log and save it (under --output-dir / each batch log directory)")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="Fit the anomaly model on a sample and score the log chunk by chunk, writing only anomalous rows")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE, help="Uniform sample size for --out-of-core")
+    parser.add_argument("--stratified-sample", action="store_true", help="Sample up to --per-id-sample frames per CAN ID instead")
+    parser.add_argument("--per-id-sample", type=int, default=DEFAULT_PER_ID_SAMPLE, help="Frames per CAN ID for --stratified-sample")
+    parser.add_argument("--chunk-size", type=int, help="Rows per chunk when reading the log", default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the parsed log cache")
+    parser.add_argument("--workers", type=int, help="Worker processes for the analysis pass and plot rendering (1 = serial)", default=1)
+    parser.add_argument("--dbc", help="DBC database used to decode physical signals")
+    parser.add_argument("--show-plots", action="store_true", help="Also display the plots (blocks until closed)")
+    parser.add_argument("--max-report-anomalies", type=int, default=MAX_INLINE_ANOMALIES,
+                        help="Anomaly rows inlined in the report; larger tables are summarised per CAN ID")
+    parser.add_argument("--anomaly-file", help="Write the full anomaly table to this .csv or .parquet file")
+    parser.add_argument("--rules", help="JSON/YAML diagnostic rule file (default: built-in bus-wide checks)")
+    parser.add_argument("--findings-file", help="Write all diagnostic rule findings to this CSV file")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record wall/CPU time, peak RSS and rows per stage (printed, saved as JSON, added to the report)")
+    parser.add_argument("--profile-json", default="CAN_analysis_profile.json", help="Stage timing JSON file for --profile")
+    parser.add_argument("--cprofile", help="Collect cProfile stats for all stages and save them to this pstats file")
 
     args = parser.parse_args()
-
-    # 1. CAN 로그 데이터 읽기
-    data = parse_can_log(args.file)
-    if data is None:
-        print("Failed to load CAN log data.")
-        return
-
-    # 2. 데이터 분석
-    stats = calculate_statistics(data)
-    freq_data = calculate_message_frequency(data)
-
-    # 3. 데이터 품질 평가
-    evaluation_report = evaluate_data_quality(data)
-    print("Data Quality Evaluation:")
-    print(evaluation_report)
-
-    # 4. 시간 간격 통계 계산
-    time_interval_stats = calculate_time_interval_statistics(data)
-    print("Time Interval Statistics:")
-    for key, value in time_interval_stats.items():
-        print(f"{key}: {value:.6f} seconds")
-
-    # 5. 진단 결과 생성
-    diagnostics = generate_diagnostics(data)
-    print("Diagnostics Summary:")
-    for diagnostic in diagnostics:
-        print(f"- {diagnostic}")
-
-    # 6. 데이터 시각화 (전체 데이터 기준)
-    plot_message_frequency(freq_data)
-
-    # 7. 시간 기반 데이터 필터링
-    filtered_data = filter_by_time_range(data, args.start_time, args.end_time)
-    print(f"Filtered Data from {args.start_time} to {args.end_time}:")
-    print(filtered_data)
-
-    # 8. 시간 기반 시각화
-    plot_time_series(filtered_data, file_name="message_frequency_over_time.png")
-
-    # 9. 시간 간격 시각화 저장
-    plot_time_intervals(data, file_name="time_interval_plot.png")
-
-    # 10. 이상 탐지 실행
-    detected_data = detect_anomalies(data)
-    print("Anomalies Detected:")
-    print(detected_data[detected_data["Anomaly"] == -1])  # 이상치 출력
-
-    # 11. 이상 탐지 결과 시각화
-    plot_anomalies(detected_data)
-
-    # 12. 그래프 저장
-    save_plot_message_frequency(freq_data, file_name="frequency_plot.png")
-    save_plot_anomalies(detected_data, file_name="anomalies_plot.png")
-
-    # 13. 보고서 생성
-    if args.report_type == "pdf":
-        # PDF 생성
-        generate_pdf_report(
-            analysis_results=stats,
-            graph_files=[
-                "frequency_plot.png",
-                "anomalies_plot.png",
-                "message_frequency_over_time.png",
-                "time_interval_plot.png"
-            ],
-            anomalies=detected_data[detected_data["Anomaly"] == -1],
-            evaluation_report=evaluation_report,
-            time_interval_stats=time_interval_stats,
-            diagnostics=diagnostics,  # 진단 결과 추가
-            file_name="CAN_analysis_report.pdf",
-            report_type="with_graphs"
-        )
-        print(f"Report generated as PDF: CAN_analysis_report.pdf")
-    elif args.report_type == "html":
-        # HTML 생성
-        generate_html_report(
-            analysis_results=stats,
-            graph_files=[
-                "frequency_plot.png",
-                "anomalies_plot.png",
-                "message_frequency_over_time.png",
-                "time_interval_plot.png"
-            ],
-            evaluation_report=evaluation_report,
-            time_interval_stats=time_interval_stats,
-            anomalies=detected_data[detected_data["Anomaly"] == -1],
-            diagnostics=diagnostics,  # 진단 결과 추가
-            file_name="CAN_analysis_report.html"
-        )
-        print(f"Report generated as HTML: CAN_analysis_report.html")
+    if args.anomaly_file and args.anomaly_file.lower().endswith(".parquet"):
+        # 분석이 끝난 뒤 (또는 점수 계산 도중) 실패하지 않도록 시작 전에 확인
+        try:
+            import_pyarrow()
+        except ImportError:
+            parser.error("--anomaly-file: writing .parquet files requires pyarrow (pip install pyarrow)")
+    if args.batch:
+        # 여러 로그를 프로세스 풀에서 동시에 분석 (로그별 출력 디렉토리 + 전체 요약 표)
+        run_batch(args, args.batch, output_root=args.output_dir or "batch_output", jobs=args.jobs, force=args.force)
+    else:
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        analyze_log(args, output_dir=args.output_dir)
 
 
 if __name__ == "__main__":
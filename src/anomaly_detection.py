@@ -6,39 +6,673 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
 
+from src.can_parser import (
+    PAYLOAD_COLUMNS, DEFAULT_CHUNK_SIZE, payload_columns, payload_matrix, frame_payload_width, iter_can_log_chunks
+)
+from src.data_analysis import iter_frame_blocks
+from src.feature_extraction import FEATURE_COLUMNS, build_features, iter_feature_chunks
 
-def detect_anomalies(data, contamination=0.05):
+
+# 이상 탐지 모델에 입력하는 기본 특징 컬럼 (feature_extraction 참고)
+ANOMALY_FEATURES = list(FEATURE_COLUMNS)
+
+# 저장된 모델 파일 포맷 버전 (특징 구성이 바뀌면 올림)
+MODEL_FORMAT_VERSION = 2
+
+# 병렬 점수 계산 시 배치당 행 수
+DEFAULT_SCORE_BATCH_SIZE = 250_000
+
+# 메모리 밖 (out-of-core) 탐지에서 모델 학습에 쓰는 균등 표본 크기와 CAN ID별 층화 표본 크기
+DEFAULT_SAMPLE_SIZE = 200_000
+DEFAULT_PER_ID_SAMPLE = 2_000
+
+
+def _to_dataframe(data):
+    # Ensure data is a DataFrame
+    if isinstance(data, dict):  # 단일 행 처리
+        return pd.DataFrame([data])
+    elif isinstance(data, list):  # 리스트 처리
+        return pd.DataFrame(data)
+    return data
+
+
+def _select_features(feature_frame, features):
+    missing = [feature for feature in features if feature not in feature_frame.columns]
+    if missing:
+        raise ValueError(f"모델 특징 컬럼을 만들 수 없습니다: {missing}")
+    return feature_frame[features]
+
+
+def train_anomaly_model(data, contamination=0.05, features=None):
+    """
+    정상 데이터로 Isolation Forest 모델을 한 번 학습.
+    :param data: 정상(known-good) CAN 로그 데이터프레임
+    :param contamination: 이상치 비율
+    :param features: 사용할 특징 컬럼 목록 (기본 ANOMALY_FEATURES)
+    :return: 모델과 특징 스키마를 담은 딕셔너리
+    """
+    features = list(features or ANOMALY_FEATURES)
+    return _fit_model_bundle(_select_features(build_features(_to_dataframe(data)), features), features, contamination)
+
+
+def _fit_model_bundle(feature_frame, features, contamination):
+    import sklearn
+
+    model = IsolationForest(contamination=contamination, random_state=42)
+    model.fit(feature_frame)
+    return {
+        "format_version": MODEL_FORMAT_VERSION,
+        "model": model,
+        "features": features,
+        "contamination": contamination,
+        "sklearn_version": sklearn.__version__,
+    }
+
+
+def save_anomaly_model(model_bundle, file_path):
+    """
+    학습된 모델을 특징 스키마와 함께 파일로 저장.
+    :param model_bundle: train_anomaly_model 결과
+    :param file_path: 저장할 파일 경로 (예: model.joblib)
+    """
+    import joblib
+
+    joblib.dump(model_bundle, file_path)
+    print(f"Anomaly model saved as {file_path}")
+
+
+def load_anomaly_model(file_path):
+    """
+    저장된 모델을 읽고 포맷을 확인.
+    :param file_path: save_anomaly_model로 저장한 파일 경로
+    :return: 모델과 특징 스키마를 담은 딕셔너리
+    """
+    import joblib
+
+    model_bundle = joblib.load(file_path)
+    if not isinstance(model_bundle, dict) or model_bundle.get("format_version") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 이상 탐지 모델 파일: {file_path}")
+    return model_bundle
+
+
+def _score_batch(model, features):
+    # IsolationForest.predict와 동일하게 decision_function < 0 이면 이상 (-1), 점수 계산은 한 번만 수행
+    scores = model.decision_function(features)
+    return scores, np.where(scores < 0, -1, 1)
+
+
+def score_anomalies(data, model_bundle, batch_size=DEFAULT_SCORE_BATCH_SIZE, n_jobs=-1):
+    """
+    학습된 모델로 예측만 수행 (재학습 없음). 배치 단위로 나누어 병렬로 점수를 계산함.
+    :param data: CAN 로그 데이터프레임
+    :param model_bundle: train_anomaly_model / load_anomaly_model 결과
+    :param batch_size: 배치당 행 수
+    :param n_jobs: 병렬 작업 수 (-1이면 모든 코어)
+    :return: Score(낮을수록 이상), Anomaly(정상 1 / 이상 -1) 컬럼이 추가된 새 데이터프레임
+    """
+    from joblib import Parallel, delayed
+
+    data = _to_dataframe(data)
+    model = model_bundle["model"]
+
+    # 특징은 배치 순서대로 이어서 만들고 (ID별 상태 전달), 점수 계산은 병렬로 수행
+    feature_batches = iter_feature_chunks(iter_frame_blocks(data, batch_size))
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(_score_batch)(model, _select_features(features, model_bundle["features"]))
+        for _, features in feature_batches
+    )
+
+    scores = np.concatenate([score for score, _ in results]) if results else np.empty(0)
+    anomalies = np.concatenate([anomaly for _, anomaly in results]) if results else np.empty(0, dtype=np.int64)
+    return data.assign(Score=scores, Anomaly=anomalies)
+
+
+def detect_anomalies(data, contamination=0.05, model_bundle=None):
     """
     Isolation Forest를 사용해 이상치를 탐지합니다.
+    model_bundle이 주어지면 학습된 모델로 점수만 계산하고, 없으면 입력 데이터로 학습 후 탐지합니다.
     :param data: 데이터프레임 또는 단일 데이터
     :param contamination: 이상치 비율
-    :return: 이상치가 추가된 데이터프레임
+    :param model_bundle: train_anomaly_model / load_anomaly_model 결과 (옵션)
+    :return: Score(낮을수록 이상), Anomaly(정상 1 / 이상 -1) 컬럼이 추가된 새 데이터프레임
+             (두 경로 모두 같은 컬럼을 반환하며, 입력 데이터프레임은 바꾸지 않음)
     """
-    # Ensure data is a DataFrame
-    if isinstance(data, dict):  # 단일 행 처리
-        data = pd.DataFrame([data])
-    elif isinstance(data, list):  # 리스트 처리
-        data = pd.DataFrame(data)
+    data = _to_dataframe(data)
+    if model_bundle is not None:
+        return score_anomalies(data, model_bundle)
+
+    # CAN 데이터에서 분석에 사용할 특징 추출 (ID별 수신 간격, 빈도, 페이로드 변화량, 엔트로피)
+    features = build_features(data)[ANOMALY_FEATURES]
+    scores, anomalies = _score_batch(_fit_model_bundle(features, ANOMALY_FEATURES, contamination)["model"], features)
+    return data.assign(Score=scores, Anomaly=anomalies)
+
+
+def _iter_source_chunks(source, chunksize, log_format=None):
+    # 로그 파일 경로이면 유효한 컬럼 캐시가 있을 때 메모리 맵에서, 없으면 로그를 청크 단위로 다시 읽음.
+    # 데이터프레임 (캐시 메모리 맵 등)이면 블록으로 나눔
+    if isinstance(source, (str, os.PathLike)):
+        from src.log_cache import load_cached_log
+
+        cached = load_cached_log(source)
+        if cached is None:
+            return iter_can_log_chunks(source, chunksize=chunksize, log_format=log_format)
+        source = cached
+    return iter_frame_blocks(source, chunksize)
+
+
+def _bottom_k(keys, k, groups=None):
+    """
+    난수 키가 가장 작은 k개 행의 위치 (groups가 주어지면 그룹마다 k개).
+    모든 행에 균등 난수 키를 붙이고 작은 키만 남기면 스트림 전체에서 뽑은 균등 표본 (reservoir sample)이 됨.
+    """
+    if groups is None:
+        return np.arange(len(keys)) if len(keys) <= k else np.argpartition(keys, k)[:k]
+    order = np.lexsort((keys, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+    return order[rank < k]
+
+
+def sample_features(source, sample_size=DEFAULT_SAMPLE_SIZE, per_id=None, chunksize=DEFAULT_CHUNK_SIZE,
+                    log_format=None, features=None, seed=42):
+    """
+    로그 전체를 한 번 스트리밍하면서 특징 행의 표본을 추출 (메모리는 청크 크기 + 표본 크기에 비례).
+    :param source: 로그 파일 경로 (컬럼 캐시가 있으면 캐시에서 읽음) 또는 시간 순 프레임 데이터프레임
+    :param sample_size: 균등 표본 크기 (per_id가 없을 때)
+    :param per_id: 주어지면 CAN ID마다 최대 per_id개를 뽑는 층화 표본 (드문 ID도 학습에 포함됨)
+    :param chunksize: 청크당 행 수
+    :param log_format: 로그 포맷 이름 (파일 경로일 때, None이면 자동 판별)
+    :param features: 특징 컬럼 목록 (기본 ANOMALY_FEATURES)
+    :param seed: 난수 시드
+    :return: (표본 특징 데이터프레임, 전체 프레임 수)
+    """
+    features = list(features or ANOMALY_FEATURES)
+    rng = np.random.default_rng(seed)
+    sample, keys, groups = None, np.empty(0), np.empty(0, dtype=np.uint32)
+    total = 0
+    for chunk, feature_chunk in iter_feature_chunks(_iter_source_chunks(source, chunksize, log_format)):
+        chunk_features = _select_features(feature_chunk, features).reset_index(drop=True)
+        candidates = chunk_features if sample is None else pd.concat([sample, chunk_features], ignore_index=True)
+        keys = np.concatenate([keys, rng.random(len(chunk))])
+        groups = np.concatenate([groups, chunk["CAN_ID"].to_numpy()])
+        keep = np.sort(_bottom_k(keys, sample_size if per_id is None else per_id, None if per_id is None else groups))
+        sample, keys, groups = candidates.iloc[keep].reset_index(drop=True), keys[keep], groups[keep]
+        total += len(chunk)
+    if sample is None:
+        sample = pd.DataFrame(columns=features, dtype=np.float64)
+    return sample, total
 
-    # CAN 데이터에서 분석에 사용할 특징 선택
-    features = data[["Timestamp", "DLC"]]
+
+def detect_anomalies_out_of_core(source, output_file, model_bundle=None, contamination=0.05,
+                                 sample_size=DEFAULT_SAMPLE_SIZE, per_id=None, chunksize=DEFAULT_CHUNK_SIZE,
+                                 log_format=None, seed=42, on_chunk=None):
+    """
+    메모리에 다 올릴 수 없는 로그의 이상 탐지.
+    1) 로그를 한 번 스트리밍하며 특징 표본 (균등 또는 CAN ID별 층화)을 뽑아 Isolation Forest를 학습하고
+    2) 로그를 다시 청크 단위로 스트리밍하며 점수를 계산해 이상 행만 output_file에 이어 씀
+    (Timestamp, CAN_ID, DLC, Data, Score, Row). 전체 프레임의 복사본은 만들지 않음.
+    model_bundle이 주어지면 1)을 건너뛰고 그 모델로 점수만 계산함.
+    :param source: 로그 파일 경로 (컬럼 캐시가 있으면 캐시에서 읽음) 또는 시간 순 프레임 데이터프레임 (캐시 메모리 맵 등)
+    :param output_file: 이상 행을 저장할 파일 (.csv 또는 .parquet, Parquet은 pyarrow가 없으면 시작 전에 ImportError)
+    :param model_bundle: train_anomaly_model / load_anomaly_model 결과 (옵션)
+    :param contamination: 이상치 비율 (학습 시)
+    :param sample_size: 균등 표본 크기
+    :param per_id: 주어지면 CAN ID별 층화 표본 크기
+    :param chunksize: 청크당 행 수
+    :param log_format: 로그 포맷 이름 (파일 경로일 때)
+    :param seed: 표본 추출 난수 시드
+    :param on_chunk: 청크마다 (청크, 점수, Anomaly 값 배열)로 호출할 함수 (옵션, 그래프 요약 등)
+    :return: frames, sampled, anomalies, output_file, model, rows (이상 행 번호), scores 키를 가진 딕셔너리
+    """
+    from src.report_generator import anomaly_table, import_pyarrow
+
+    # Parquet이면 pyarrow를 먼저 확인 (점수 계산 도중에 실패해 일부만 쓴 파일이 남지 않도록)
+    parquet = output_file.lower().endswith(".parquet")
+    if parquet:
+        pa = import_pyarrow()
+        import pyarrow.parquet as pq
+
+        # 첫 청크에 이상 행이 없어도 컬럼 타입이 null로 고정되지 않도록 스키마를 미리 선언
+        schema = pa.schema([("Timestamp", pa.float64()), ("CAN_ID", pa.string()), ("DLC", pa.uint8()),
+                            ("Data", pa.string()), ("Score", pa.float64()), ("Row", pa.int64())])
+
+    sampled = 0
+    if model_bundle is None:
+        sample, _ = sample_features(source, sample_size=sample_size, per_id=per_id, chunksize=chunksize,
+                                    log_format=log_format, seed=seed)
+        sampled = len(sample)
+        model_bundle = _fit_model_bundle(sample, list(ANOMALY_FEATURES), contamination)
+    model = model_bundle["model"]
+
+    parquet_writer = None
+    rows, scores = [], []
+    offset = 0
+    try:
+        for chunk, feature_chunk in iter_feature_chunks(_iter_source_chunks(source, chunksize, log_format)):
+            chunk_scores, labels = _score_batch(model, _select_features(feature_chunk, model_bundle["features"]))
+            anomalous = np.flatnonzero(labels == -1)
+            table = anomaly_table(chunk.iloc[anomalous].assign(Score=chunk_scores[anomalous], Row=offset + anomalous))
+            if parquet:
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(output_file, schema)
+                parquet_writer.write_table(pa.Table.from_pandas(table, schema=schema, preserve_index=False))
+            else:
+                table.to_csv(output_file, mode="w" if offset == 0 else "a", header=offset == 0, index=False)
+            if on_chunk is not None:
+                on_chunk(chunk, chunk_scores, labels)
+            rows.append(offset + anomalous)
+            scores.append(chunk_scores[anomalous])
+            offset += len(chunk)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    print(f"Out-of-core anomaly detection: {len(rows)} anomalies in {offset} frames "
+          f"(model fitted on {sampled} sampled frames), saved as {output_file}")
+    return {
+        "frames": offset,
+        "sampled": sampled,
+        "anomalies": len(rows),
+        "output_file": output_file,
+        "model": model_bundle,
+        "rows": rows,
+        "scores": np.concatenate(scores) if scores else np.empty(0),
+    }
+
+
+def detect_signal_anomalies(signals, contamination=0.05, columns=None):
+    """
+    DBC로 디코딩한 물리 값 시그널에 Isolation Forest를 적용해 이상 프레임을 탐지.
+    멀티플렉스 등으로 값이 없는 칸(NaN)은 시그널별 중앙값으로 채움.
+    :param signals: decode_signals가 반환한 메시지 하나의 시그널 데이터프레임
+    :param contamination: 이상치 비율
+    :param columns: 사용할 시그널 컬럼 목록 (기본은 Timestamp, CAN_ID를 제외한 모든 컬럼)
+    :return: Anomaly(정상 1 / 이상 -1) 컬럼이 추가된 새 데이터프레임
+    """
+    columns = list(columns or [column for column in signals.columns if column not in ("Timestamp", "CAN_ID")])
+    features = signals[columns]
+    features = features.fillna(features.median()).fillna(0.0)
+    if len(features) == 0 or not columns:
+        return signals.assign(Anomaly=np.ones(len(signals), dtype=np.int64))
     model = IsolationForest(contamination=contamination, random_state=42)
-    data["Anomaly"] = model.fit_predict(features)
+    return signals.assign(Anomaly=model.fit_predict(features))
 
-    return data
+
+def _byte_deltas(payload, previous):
+    """
+    바이트별 차이 (mod 256을 -128 ~ 127로 표현, 255 → 0은 +1).
+    """
+    return (payload - previous).view(np.int8).astype(np.int16)
+
+
+class StreamingAnomalyDetector:
+    """
+    실시간 스트림용 상태 기반 이상 탐지기.
+    기준(정상) 구간에서 CAN ID별 수신 주기의 평균/표준편차, DLC 범위, 바이트별 변화 패턴을 학습한 뒤,
+    새 프레임(또는 마이크로 배치)을 재학습 없이 학습된 통계와 비교해 점수를 매김.
+    바이트는 값이 아닌 변화량 (같은 ID 이전 프레임 대비 차이)이 직전 변화량에서 얼마나 바뀌었는지로 비교하므로
+    롤링 카운터나 천천히 변하는 신호는 기준 구간에서 값/변화량 범위를 다 보지 못해도 정상으로 보며,
+    기준 구간이 끝날 때까지 범위가 계속 넓어진 (포화되지 않은) 바이트는 점수에 사용하지 않음.
+    상태 크기는 CAN ID 수에 비례하며 스트림 길이와 무관함.
+    """
+
+    def __init__(self, threshold=6.0, min_relative_std=0.05, adapt_rate=0.0, byte_tolerance=0.05,
+                 saturation_frames=16):
+        """
+        :param threshold: 이상으로 판단하는 점수 (주기는 표준편차 배수, 바이트는 허용 폭 배수)
+        :param min_relative_std: 표준편차 하한 (평균 주기 대비 비율, 지터가 거의 없는 ID의 과민 반응 방지)
+        :param adapt_rate: 정상 프레임으로 주기 평균/분산을 갱신하는 EWMA 비율 (0이면 갱신하지 않음)
+        :param byte_tolerance: 바이트 변화 허용 폭 (학습된 범위 폭 대비 비율, 최소 1). 범위를 벗어난 거리를 이 폭으로 나눈 값이
+                               바이트 점수가 됨
+        :param saturation_frames: 바이트 범위가 마지막으로 넓어진 뒤 이 프레임 수 이상 (그리고 학습한 프레임의 절반 이상)
+                                  더 넓어지지 않은 바이트만 점수에 사용 (기준 구간이 짧아 변화 패턴을 다 보지 못한 바이트의 오탐 방지)
+        """
+        self.threshold = threshold
+        self.min_relative_std = min_relative_std
+        self.adapt_rate = adapt_rate
+        self.byte_tolerance = byte_tolerance
+        self.saturation_frames = saturation_frames
+        self._reset()
+
+    def _reset(self):
+        width = len(PAYLOAD_COLUMNS)
+        self._slots = {}
+        self._ids = np.empty(0, dtype=np.uint32)
+        self._last_timestamp = np.empty(0)
+        self._count = np.empty(0, dtype=np.int64)
+        self._mean = np.empty(0)
+        self._m2 = np.empty(0)
+        self._scale = np.empty(0)
+        self._dlc_min = np.empty(0, dtype=np.uint8)
+        self._dlc_max = np.empty(0, dtype=np.uint8)
+        # ID별 마지막 페이로드와 그 직전 프레임 대비 변화량 (mod 256)
+        self._last_payload = np.empty((0, width), dtype=np.uint8)
+        self._last_delta = np.empty((0, width), dtype=np.uint8)
+        self._has_delta = np.empty(0, dtype=bool)
+        # 변화량의 변화 (2차 차분) 범위, 학습한 수, 바이트별로 범위가 마지막으로 넓어진 뒤 학습한 수
+        self._change_min = np.empty((0, width), dtype=np.int16)
+        self._change_max = np.empty((0, width), dtype=np.int16)
+        self._change_count = np.empty(0, dtype=np.int64)
+        self._stable = np.empty((0, width), dtype=np.int64)
+
+    def _intervals(self, df):
+        """
+        같은 ID의 이전 프레임과의 간격. 배치의 첫 프레임은 이전 배치의 마지막 프레임과 비교함.
+        """
+        intervals = df.groupby("CAN_ID", sort=False)["Timestamp"].diff().to_numpy(copy=True)
+        first = np.isnan(intervals)
+        if first.any() and len(self._ids):
+            slots = pd.Index(self._ids).get_indexer(df["CAN_ID"].to_numpy()[first])
+            previous = np.where(slots >= 0, self._last_timestamp[np.maximum(slots, 0)], np.nan)
+            intervals[first] = df["Timestamp"].to_numpy()[first] - previous
+        return intervals
+
+    def _add_ids(self, can_ids):
+        new_ids = np.setdiff1d(can_ids, self._ids)
+        if len(new_ids) == 0:
+            return
+        n = len(new_ids)
+        width = self._last_payload.shape[1]
+        self._ids = np.concatenate([self._ids, new_ids.astype(np.uint32)])
+        self._slots = {int(can_id): slot for slot, can_id in enumerate(self._ids)}
+        self._last_timestamp = np.concatenate([self._last_timestamp, np.full(n, np.nan)])
+        self._count = np.concatenate([self._count, np.zeros(n, dtype=np.int64)])
+        self._mean = np.concatenate([self._mean, np.zeros(n)])
+        self._m2 = np.concatenate([self._m2, np.zeros(n)])
+        self._scale = np.concatenate([self._scale, np.full(n, np.nan)])
+        self._dlc_min = np.concatenate([self._dlc_min, np.full(n, 255, dtype=np.uint8)])
+        self._dlc_max = np.concatenate([self._dlc_max, np.zeros(n, dtype=np.uint8)])
+        self._last_payload = np.vstack([self._last_payload, np.zeros((n, width), dtype=np.uint8)])
+        self._last_delta = np.vstack([self._last_delta, np.zeros((n, width), dtype=np.uint8)])
+        self._has_delta = np.concatenate([self._has_delta, np.zeros(n, dtype=bool)])
+        # 아직 학습하지 않은 바이트는 빈 범위 (최소 > 최대)로 시작
+        self._change_min = np.vstack([self._change_min, np.full((n, width), 128, dtype=np.int16)])
+        self._change_max = np.vstack([self._change_max, np.full((n, width), -129, dtype=np.int16)])
+        self._change_count = np.concatenate([self._change_count, np.zeros(n, dtype=np.int64)])
+        self._stable = np.vstack([self._stable, np.zeros((n, width), dtype=np.int64)])
+
+    def _widen_payload(self, width):
+        """
+        바이트 상태를 width 바이트까지 넓힘 (FD 프레임이 처음 들어올 때).
+        지금까지 본 프레임의 추가 바이트는 0으로 채워진 것과 같으므로, 학습한 ID는 범위 [0, 0]이
+        그동안 학습한 프레임 수만큼 넓어지지 않은 것으로 시작함.
+        """
+        extra = width - self._last_payload.shape[1]
+        if extra <= 0:
+            return
+        learned = np.repeat((self._change_count > 0)[:, None], extra, axis=1)
+        zeros = np.zeros((len(self._ids), extra), dtype=np.uint8)
+        self._last_payload = np.hstack([self._last_payload, zeros])
+        self._last_delta = np.hstack([self._last_delta, zeros])
+        self._change_min = np.hstack([self._change_min, np.where(learned, 0, 128).astype(np.int16)])
+        self._change_max = np.hstack([self._change_max, np.where(learned, 0, -129).astype(np.int16)])
+        self._stable = np.hstack([self._stable, np.repeat(self._change_count[:, None], extra, axis=1)])
+
+    def _payload_score(self, changes, slots):
+        """
+        학습된 변화량 변화 범위에서 벗어난 거리를 허용 폭 (범위 폭 × byte_tolerance, 최소 1) 단위로 잰 바이트별 최대값.
+        범위 안이거나 범위가 포화되지 않은 바이트는 0이며, 프레임 한 개 (slots가 정수) 또는 배치에 모두 사용함.
+        """
+        low, high = self._change_min[slots], self._change_max[slots]
+        excess = np.maximum(low - changes, 0) + np.maximum(changes - high, 0)
+        tolerance = np.maximum(self.byte_tolerance * (high - low + 1), 1.0)
+        saturation = np.maximum(self.saturation_frames, self._change_count[slots] // 2)
+        scored = (self._stable[slots] >= np.expand_dims(saturation, -1)) & (low <= high)
+        return np.where(scored, excess / tolerance, 0.0).max(axis=-1, initial=0.0)
+
+    def _learn_changes(self, slots, changes):
+        """
+        ID 순으로 묶인 (ID 안에서는 시간 순) 바이트 변화량의 변화로 ID별 범위와 포화 상태를 갱신.
+        """
+        if len(slots) == 0:
+            return
+        starts = np.flatnonzero(np.r_[True, slots[1:] != slots[:-1]])
+        counts = np.diff(np.r_[starts, len(slots)])
+        group_slots = slots[starts]
+
+        # 이전 상태를 포함한 누적 최소/최대와, 범위가 넓어진 행
+        groups = pd.DataFrame(changes).groupby(np.repeat(np.arange(len(starts)), counts))
+        low = np.minimum(groups.cummin().to_numpy(dtype=np.int16), self._change_min[slots])
+        high = np.maximum(groups.cummax().to_numpy(dtype=np.int16), self._change_max[slots])
+        previous_low, previous_high = np.roll(low, 1, axis=0), np.roll(high, 1, axis=0)
+        previous_low[starts], previous_high[starts] = self._change_min[group_slots], self._change_max[group_slots]
+        widened = (low < previous_low) | (high > previous_high)
+
+        # 마지막으로 넓어진 뒤의 수 (배치에서 넓어지지 않았으면 이전 값에 이어서 셈)
+        position = np.arange(len(slots)) - np.repeat(starts, counts)
+        last_widened = np.maximum.reduceat(np.where(widened, position[:, None], -1), starts, axis=0)
+        self._stable[group_slots] = np.where(last_widened < 0, self._stable[group_slots] + counts[:, None],
+                                             counts[:, None] - 1 - last_widened)
+        ends = starts + counts - 1
+        self._change_min[group_slots] = low[ends]
+        self._change_max[group_slots] = high[ends]
+        self._change_count[group_slots] += counts
+
+    def _payload_changes(self, payload, slots, has_previous):
+        """
+        시간 순 배치의 같은 ID 이전 프레임 대비 변화량과, 그 변화량이 직전 변화량에서 바뀐 정도.
+        배치의 ID별 첫 프레임은 상태의 마지막 페이로드/변화량과 비교함.
+        :param payload: (n, width) uint8 페이로드 행렬
+        :param slots: 프레임별 상태 위치 (모두 알려진 ID)
+        :param has_previous: 같은 ID 이전 프레임이 있는 프레임 (간격이 있는 프레임)
+        :return: (변화량, 변화량의 변화 (int16), 변화량의 변화가 있는 프레임)
+        """
+        predecessor = pd.Series(np.arange(len(slots))).groupby(slots, sort=False).shift().to_numpy()
+        in_batch = ~np.isnan(predecessor)
+        predecessor = predecessor[in_batch].astype(np.int64)
+
+        previous = self._last_payload[slots]
+        previous[in_batch] = payload[predecessor]
+        deltas = payload - previous
+        previous_deltas = self._last_delta[slots]
+        previous_deltas[in_batch] = deltas[predecessor]
+        has_delta = self._has_delta[slots]
+        has_delta[in_batch] = has_previous[predecessor]
+        return deltas, _byte_deltas(deltas, previous_deltas), has_previous & has_delta
+
+    def _update_payload_state(self, payload, deltas, slots, has_previous):
+        """
+        배치의 ID별 마지막 프레임으로 마지막 페이로드/변화량 상태를 갱신.
+        """
+        last = pd.Series(np.arange(len(slots))).groupby(slots).last().to_numpy()
+        self._last_payload[slots[last]] = payload[last]
+        self._last_delta[slots[last]] = deltas[last]
+        self._has_delta[slots[last]] = has_previous[last]
+
+    def _update_scale(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self._m2 / (self._count - 1))
+        self._scale = np.maximum(np.nan_to_num(std), self.min_relative_std * self._mean)
+
+    def partial_fit(self, df):
+        """
+        정상 구간 배치로 ID별 통계를 누적 학습 (평균/분산은 Chan 병합).
+        :param df: CAN 로그 데이터프레임 (시간 순)
+        :return: self
+        """
+        if len(df) == 0:
+            return self
+        intervals = self._intervals(df)
+        self._add_ids(df["CAN_ID"].unique())
+        can_ids = df["CAN_ID"].to_numpy()
+
+        batch = pd.DataFrame({"CAN_ID": can_ids, "Interval": intervals})
+        grouped = batch.groupby("CAN_ID")["Interval"].agg(["count", "mean", "var"])
+        slots = np.array([self._slots[int(can_id)] for can_id in grouped.index])
+        count = grouped["count"].to_numpy()
+        valid = count > 0
+        slots, count = slots[valid], count[valid]
+        mean = grouped["mean"].to_numpy()[valid]
+        m2 = np.nan_to_num(grouped["var"].to_numpy()[valid]) * (count - 1)
+
+        total = self._count[slots] + count
+        delta = mean - self._mean[slots]
+        self._mean[slots] += delta * count / total
+        self._m2[slots] += m2 + delta * delta * self._count[slots] * count / total
+        self._count[slots] = total
+        self._update_scale()
+
+        limits = pd.Series(df["DLC"].to_numpy()).groupby(can_ids).agg(["min", "max"])
+        slots = np.array([self._slots[int(can_id)] for can_id in limits.index])
+        self._dlc_min[slots] = np.minimum(self._dlc_min[slots], limits["min"].to_numpy())
+        self._dlc_max[slots] = np.maximum(self._dlc_max[slots], limits["max"].to_numpy())
+
+        # 바이트 변화 패턴 학습 (Classic 프레임만 있는 배치는 8바이트, FD 프레임이 있으면 64바이트까지)
+        self._widen_payload(frame_payload_width(df))
+        payload = payload_matrix(df, self._last_payload.shape[1])
+        slots = pd.Index(self._ids).get_indexer(can_ids)
+        has_previous = ~np.isnan(intervals)
+        deltas, changes, has_change = self._payload_changes(payload, slots, has_previous)
+        order = np.argsort(slots[has_change], kind="stable")
+        self._learn_changes(slots[has_change][order], changes[has_change][order])
+        self._update_payload_state(payload, deltas, slots, has_previous)
+
+        last = df.groupby("CAN_ID")["Timestamp"].last()
+        self._last_timestamp[[self._slots[int(can_id)] for can_id in last.index]] = last.to_numpy()
+        return self
+
+    def fit(self, df):
+        """
+        상태를 초기화하고 정상 구간 데이터로 학습.
+        """
+        self._reset()
+        return self.partial_fit(df)
+
+    def reset_stream(self):
+        """
+        학습된 통계는 유지하고 ID별 마지막 수신 시각과 변화량만 초기화 (다른 캡처를 새로 스트리밍할 때 사용).
+        """
+        self._last_timestamp[:] = np.nan
+        self._has_delta[:] = False
+
+    def score_frame(self, timestamp, can_id, dlc, payload=()):
+        """
+        프레임 한 개의 이상 점수를 계산하고 상태를 갱신 (배치 변환 없이 스칼라 연산만 수행).
+        :param timestamp: 수신 시각 (초)
+        :param can_id: 정수 CAN ID
+        :param dlc: DLC
+        :param payload: 페이로드 바이트 (bytes 또는 정수 시퀀스, 뒤의 빠진 바이트는 0)
+        :return: (점수, Anomaly 값) - Anomaly는 IsolationForest와 같이 정상 1 / 이상 -1
+        """
+        slot = self._slots.get(can_id)
+        if slot is None:
+            return np.inf, -1
+
+        score = 0.0
+        previous = self._last_timestamp[slot]
+        self._last_timestamp[slot] = timestamp
+        interval = timestamp - previous
+        has_previous = interval == interval
+        scale = self._scale[slot]
+        if has_previous and scale > 0:
+            score = abs(interval - self._mean[slot]) / scale
+
+        values = np.frombuffer(bytes(payload), dtype=np.uint8)
+        self._widen_payload(len(values))
+        current = np.zeros(self._last_payload.shape[1], dtype=np.uint8)
+        current[:len(values)] = values
+        deltas = current - self._last_payload[slot]
+        if not self._dlc_min[slot] <= dlc <= self._dlc_max[slot]:
+            score = np.inf
+        elif has_previous and self._has_delta[slot]:
+            score = max(score, self._payload_score(_byte_deltas(deltas, self._last_delta[slot]), slot))
+        self._last_payload[slot] = current
+        self._last_delta[slot] = deltas
+        self._has_delta[slot] = has_previous
+
+        if score > self.threshold:
+            return score, -1
+        if self.adapt_rate and has_previous:
+            self._adapt(slot, interval)
+        return score, 1
+
+    def _adapt(self, slots, intervals):
+        rate = self.adapt_rate
+        delta = intervals - self._mean[slots]
+        self._mean[slots] += rate * delta
+        variance = (1 - rate) * (np.square(self._scale[slots]) + rate * delta * delta)
+        self._scale[slots] = np.maximum(np.sqrt(variance), self.min_relative_std * self._mean[slots])
+
+    def score_batch(self, df):
+        """
+        마이크로 배치 단위 이상 점수 계산 (벡터 연산).
+        :param df: CAN 로그 데이터프레임 (시간 순)
+        :return: Score, Anomaly 컬럼이 추가된 새 데이터프레임
+        """
+        if len(df) == 0:
+            return df.assign(Score=np.empty(0), Anomaly=np.empty(0, dtype=np.int64))
+        intervals = self._intervals(df)
+        slots = pd.Index(self._ids).get_indexer(df["CAN_ID"].to_numpy())
+        known = slots >= 0
+        safe = np.maximum(slots, 0)
+
+        # 기준 구간에서 한 번만 본 ID (scale 0)는 score_frame과 같이 주기 점수를 0으로 둠
+        scale = self._scale[safe]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = np.where(scale > 0, np.abs(intervals - self._mean[safe]) / scale, 0.0)
+        score = np.nan_to_num(score, nan=0.0, posinf=np.inf)
+
+        # 알려진 ID의 바이트 변화 패턴 점수
+        self._widen_payload(frame_payload_width(df))
+        payload = payload_matrix(df, self._last_payload.shape[1])[known]
+        has_previous = ~np.isnan(intervals[known])
+        deltas, changes, has_change = self._payload_changes(payload, slots[known], has_previous)
+        score[known] = np.maximum(score[known],
+                                  np.where(has_change, self._payload_score(changes, slots[known]), 0.0))
+        self._update_payload_state(payload, deltas, slots[known], has_previous)
+
+        dlc = df["DLC"].to_numpy()
+        score[(dlc < self._dlc_min[safe]) | (dlc > self._dlc_max[safe]) | ~known] = np.inf
+        anomaly = np.where(score > self.threshold, -1, 1)
+
+        last = df[known].groupby("CAN_ID")["Timestamp"].last()
+        self._last_timestamp[[self._slots[int(can_id)] for can_id in last.index]] = last.to_numpy()
+
+        if self.adapt_rate:
+            normal = (anomaly == 1) & known & ~np.isnan(intervals)
+            batch_mean = pd.Series(intervals[normal]).groupby(slots[normal]).mean()
+            self._adapt(batch_mean.index.to_numpy(), batch_mean.to_numpy())
+
+        return df.assign(Score=score, Anomaly=anomaly)
 
 
 if __name__ == "__main__":
-    from src.can_parser import parse_can_log
+    import argparse
+    from src.report_generator import import_pyarrow
+
+    parser = argparse.ArgumentParser(description="Out-of-core anomaly detection for CAN logs larger than RAM")
+    parser.add_argument("--file", help="CAN log to score (without it, the sample log is analysed in memory)")
+    parser.add_argument("--output", help="File for the anomalous rows (.csv or .parquet)", default="anomalies_scored.csv")
+    parser.add_argument("--model", help="Score with a saved model instead of fitting on a sample")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE, help="Uniform sample size")
+    parser.add_argument("--per-id-sample", type=int, help="Sample up to this many frames per CAN ID instead")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    args = parser.parse_args()
+    if args.output.lower().endswith(".parquet"):
+        try:
+            import_pyarrow()
+        except ImportError:
+            parser.error("--output: writing .parquet files requires pyarrow (pip install pyarrow)")
+
+    if args.file:
+        detect_anomalies_out_of_core(
+            args.file, args.output, model_bundle=load_anomaly_model(args.model) if args.model else None,
+            sample_size=args.sample_size, per_id=args.per_id_sample, chunksize=args.chunk_size)
+    else:
+        from src.can_parser import parse_can_log
 
-    # 샘플 데이터 로드
-    file_path = "data/sample_can_log.csv"
-    data = parse_can_log(file_path)
+        # 샘플 데이터 로드
+        file_path = "data/sample_can_log.csv"
+        data = parse_can_log(file_path)
 
-    # 이상치 탐지 실행
-    detected_data = detect_anomalies(data)
-    print("Anomaly Detection Results:")
-    print(detected_data[detected_data["Anomaly"] == -1])  # 이상치만 출력
+        # 이상치 탐지 실행
+        detected_data = detect_anomalies(data)
+        print("Anomaly Detection Results:")
+        print(detected_data[detected_data["Anomaly"] == -1])  # 이상치만 출력
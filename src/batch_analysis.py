@@ -0,0 +1,197 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import get_log_extensions
+from src.log_cache import CACHE_SUFFIX
+from src.pipeline import analyze_log
+
+# 로그별 출력 디렉토리에 저장하는 분석 요약 (최신 여부 판단에 사용)
+SUMMARY_FILE = "analysis_summary.json"
+
+# 로그별 콘솔 출력을 저장하는 파일
+CONSOLE_FILE = "analysis.log"
+
+# 출력 결과에 영향을 주는 옵션 (바뀌면 최신 출력이 있어도 다시 분석)
+OUTPUT_OPTIONS = ["log_format", "start_time", "end_time", "report_type", "model", "train_model", "dbc",
+                  "max_report_anomalies", "anomaly_file", "profile", "out_of_core", "sample_size",
+                  "stratified_sample", "per_id_sample", "rules", "findings_file"]
+
+# 전체 요약 표 컬럼 (analyze_log 요약 키 → 표 제목)
+FLEET_COLUMNS = {
+    "log": "Log",
+    "status": "Status",
+    "frames": "Frames",
+    "unique_ids": "Unique IDs",
+    "duration_s": "Duration (s)",
+    "anomalies": "Anomalies",
+    "diagnostics": "Diagnostics",
+    "wall_s": "Wall (s)",
+    "report": "Report",
+}
+
+
+def find_logs(pattern):
+    """
+    디렉토리 또는 glob 패턴에 해당하는 로그 파일 목록 (정렬).
+    디렉토리이면 바로 아래의 등록된 확장자 (.csv, .log, .asc, .blf, .trc) 파일만 사용함.
+    """
+    if os.path.isdir(pattern):
+        extensions = tuple(get_log_extensions())
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern) if name.lower().endswith(extensions)]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path) and CACHE_SUFFIX not in path)
+
+
+def log_output_dirs(log_paths, output_root):
+    """
+    로그별 출력 디렉토리 (output_root/<로그 이름>). 다른 디렉토리에 같은 이름의 로그가 있으면 경로 해시를 붙임.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in log_paths]
+    output_dirs = []
+    for path, stem in zip(log_paths, stems):
+        if stems.count(stem) > 1:
+            stem = f"{stem}_{hashlib.blake2b(os.path.abspath(path).encode(), digest_size=4).hexdigest()}"
+        output_dirs.append(os.path.join(output_root, stem))
+    return output_dirs
+
+
+def _output_options(args):
+    return {name: getattr(args, name, None) for name in OUTPUT_OPTIONS}
+
+
+def load_summary(output_dir):
+    """
+    출력 디렉토리의 분석 요약을 읽음 (없거나 손상되었으면 None).
+    """
+    try:
+        with open(os.path.join(output_dir, SUMMARY_FILE), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_up_to_date(log_path, output_dir, args):
+    """
+    로그 크기/수정 시각과 출력 옵션이 지난 분석과 같고 보고서가 남아 있으면 True.
+    """
+    summary = load_summary(output_dir)
+    if summary is None or summary.get("status") != "analyzed":
+        return False
+    stat = os.stat(log_path)
+    return (summary.get("log_size") == stat.st_size
+            and summary.get("log_mtime_ns") == stat.st_mtime_ns
+            and summary.get("options") == json.loads(json.dumps(_output_options(args)))
+            and os.path.exists(summary.get("report", "")))
+
+
+def _analyze_one(args, log_path, output_dir):
+    """
+    프로세스 풀 작업: 로그 하나를 분석하고 요약을 출력 디렉토리에 저장. 콘솔 출력은 CONSOLE_FILE로 보냄.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    log_args = argparse.Namespace(**{**vars(args), "file": log_path, "show_plots": False})
+    stat = os.stat(log_path)
+    started = time.perf_counter()
+    with open(os.path.join(output_dir, CONSOLE_FILE), "w", encoding="utf-8") as console, \
+            contextlib.redirect_stdout(console):
+        try:
+            result = analyze_log(log_args, output_dir=output_dir)
+            summary = {"status": "analyzed", **result} if result else {"status": "failed: could not read log"}
+        except Exception as e:
+            print(f"Analysis failed: {e}")
+            summary = {"status": f"failed: {e}"}
+
+    summary.update({
+        "log": log_path,
+        "wall_s": time.perf_counter() - started,
+        "log_size": stat.st_size,
+        "log_mtime_ns": stat.st_mtime_ns,
+        "options": _output_options(args),
+    })
+    with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+def write_fleet_summary(summaries, output_root):
+    """
+    로그별 요약을 하나의 표로 모아 CSV/HTML로 저장하고 DataFrame으로 반환.
+    """
+    table = pd.DataFrame([{title: summary.get(key) for key, title in FLEET_COLUMNS.items()} for summary in summaries],
+                         columns=list(FLEET_COLUMNS.values()))
+    # 실패한 로그 (값 없음)가 있어도 정수 컬럼은 정수로 표시
+    table = table.astype({"Frames": "Int64", "Unique IDs": "Int64", "Anomalies": "Int64", "Diagnostics": "Int64"})
+    table.to_csv(os.path.join(output_root, "fleet_summary.csv"), index=False)
+
+    html = table.copy()
+    html["Report"] = [f"<a href='{os.path.relpath(report, output_root)}'>report</a>" if isinstance(report, str) else ""
+                      for report in table["Report"]]
+    with open(os.path.join(output_root, "fleet_summary.html"), "w", encoding="utf-8") as file:
+        file.write("<html><head><title>CAN Fleet Summary</title></head><body><h1>CAN Fleet Summary</h1>")
+        file.write(html.to_html(index=False, escape=False, float_format=lambda value: f"{value:.3f}"))
+        file.write("</body></html>")
+    print(f"Fleet summary saved as {os.path.join(output_root, 'fleet_summary.csv')} and fleet_summary.html")
+    return table
+
+
+def run_batch(args, pattern, output_root="batch_output", jobs=None, force=False):
+    """
+    디렉토리/glob 패턴의 로그들을 최대 jobs개 프로세스에서 동시에 분석.
+    로그마다 output_root/<로그 이름>/ 에 그래프, 보고서, 콘솔 출력, 요약을 저장하고,
+    출력이 최신인 로그는 건너뛴 뒤 (force=False) 전체 요약 표를 만듦.
+    :param args: main.py 명령줄 옵션 (로그마다 file만 바꿔서 사용)
+    :param pattern: 로그 디렉토리 또는 glob 패턴
+    :param output_root: 출력 최상위 디렉토리
+    :param jobs: 동시에 분석할 로그 수 (None이면 CPU 수)
+    :param force: True이면 최신 출력이 있어도 다시 분석
+    :return: 전체 요약 DataFrame (로그 순서)
+    """
+    log_paths = find_logs(pattern)
+    if not log_paths:
+        print(f"No CAN logs found for {pattern}")
+        return None
+    os.makedirs(output_root, exist_ok=True)
+    output_dirs = log_output_dirs(log_paths, output_root)
+
+    summaries = {}
+    pending = []
+    for log_path, output_dir in zip(log_paths, output_dirs):
+        if not force and is_up_to_date(log_path, output_dir, args):
+            summaries[log_path] = {**load_summary(output_dir), "status": "up to date"}
+        else:
+            pending.append((log_path, output_dir))
+    print(f"Found {len(log_paths)} logs: {len(pending)} to analyse, {len(log_paths) - len(pending)} up to date")
+
+    if pending:
+        max_workers = max(1, min(jobs or os.cpu_count(), len(pending)))
+        # 로그별 --workers 프로세스 풀은 CPU를 동시 작업 수로 나눈 만큼만 사용 (jobs × workers 과다 생성 방지)
+        workers = max(1, min(getattr(args, "workers", 1), (os.cpu_count() or 1) // max_workers))
+        job_args = argparse.Namespace(**{**vars(args), "workers": workers})
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_analyze_one, job_args, log_path, output_dir): log_path
+                       for log_path, output_dir in pending}
+            for done, future in enumerate(as_completed(futures), 1):
+                log_path = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:  # 작업 프로세스 자체가 종료된 경우 (메모리 부족 등)
+                    summary = {"log": log_path, "status": f"failed: {e}"}
+                summaries[log_path] = summary
+                print(f"[{done}/{len(pending)}] {log_path}: {summary['status']} ({summary.get('wall_s', 0.0):.1f} s)")
+
+    table = write_fleet_summary([summaries[log_path] for log_path in log_paths], output_root)
+    print(table.drop(columns=["Report"]).to_string(index=False))
+    return table
@@ -0,0 +1,293 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.anomaly_detection import detect_anomalies
+from src.can_parser import parse_can_log
+from src.create_sample_data import write_synthetic_log
+from src.data_analysis import run_analysis, calculate_cycle_time_statistics
+from src.data_visualization import (
+    render_figures, frequency_plot_data, time_series_plot_data, anomaly_plot_data, interval_plot_data
+)
+from src.log_cache import clear_cached_log
+from src.profiling import peak_rss_mb
+from src.report_generator import generate_pdf_report, generate_html_report
+
+# 기본 측정 로그 크기 (프레임 수). --sizes 1e4 1e5 1e6 1e7 1e8 처럼 지정 가능
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# 그래프/보고서 단계에서 이상치로 표시할 행 간격 (이상 탐지 단계와 독립적으로 측정하기 위함)
+ANOMALY_STRIDE = 1000
+
+# 회귀 판정에서 제외할 짧은 단계 (초). 이보다 짧은 단계는 측정 잡음이 더 큼
+MIN_COMPARE_SECONDS = 0.05
+
+
+def _load(log_path):
+    # 캐시가 있으면 메모리 맵으로 바로 읽음
+    return parse_can_log(log_path)
+
+
+def _mark_anomalies(data):
+    labels = np.where(np.arange(len(data)) % ANOMALY_STRIDE == 0, -1, 1)
+    return data.assign(Anomaly=labels)
+
+
+def _graph_files(workdir):
+    return [os.path.join(workdir, name) for name in
+            ("frequency_plot.png", "anomalies_plot.png", "message_frequency_over_time.png", "time_interval_plot.png")]
+
+
+def _setup_parse(log_path, workdir):
+    # 캐시를 지운 뒤 파싱 + 캐시 저장까지 측정 (첫 실행 비용)
+    clear_cached_log(log_path)
+    return lambda: parse_can_log(log_path)
+
+
+def _setup_cache_load(log_path, workdir):
+    # 캐시를 연 뒤 모든 컬럼을 한 번 읽는 비용 (이후 실행 비용)
+    _load(log_path)
+
+    def run():
+        data = _load(log_path)
+        for column in data.columns:
+            data[column].to_numpy().sum()
+    return run
+
+
+def _setup_analysis(log_path, workdir):
+    data = _load(log_path)
+    return lambda: (run_analysis(data), calculate_cycle_time_statistics(data))
+
+
+def _setup_anomaly(log_path, workdir):
+    data = _load(log_path)
+    return lambda: detect_anomalies(data)
+
+
+def _setup_plots(log_path, workdir):
+    data = _load(log_path)
+    analysis = run_analysis(data)
+    detected = _mark_anomalies(data)
+    files = _graph_files(workdir)
+
+    def run():
+        jobs = [
+            ("frequency", frequency_plot_data(analysis["frequency"]), files[0]),
+            ("anomalies", anomaly_plot_data(detected), files[1]),
+            ("time_series", time_series_plot_data(data), files[2]),
+            ("time_intervals", interval_plot_data(data, analysis["interval_histogram"]), files[3]),
+        ]
+        render_figures(jobs)
+    return run
+
+
+def _report_inputs(log_path, workdir):
+    data = _load(log_path)
+    analysis = run_analysis(data)
+    detected = _mark_anomalies(data)
+    return {
+        "analysis_results": analysis["statistics"],
+        "graph_files": [name for name in _graph_files(workdir) if os.path.exists(name)],
+        "anomalies": detected[detected["Anomaly"] == -1],
+        "evaluation_report": analysis["evaluation_report"],
+        "time_interval_stats": analysis["time_interval_stats"],
+        "diagnostics": analysis["diagnostics"],
+        "cycle_time_stats": calculate_cycle_time_statistics(data),
+    }
+
+
+def _setup_report_pdf(log_path, workdir):
+    inputs = _report_inputs(log_path, workdir)
+    file_name = os.path.join(workdir, "benchmark_report.pdf")
+    return lambda: generate_pdf_report(**inputs, file_name=file_name, report_type="with_graphs")
+
+
+def _setup_report_html(log_path, workdir):
+    inputs = _report_inputs(log_path, workdir)
+    file_name = os.path.join(workdir, "benchmark_report.html")
+    return lambda: generate_html_report(**inputs, file_name=file_name)
+
+
+# 단계 이름 → 준비 함수. 준비 함수는 (로그 경로, 작업 디렉토리)를 받아 측정할 인자 없는 함수를 반환함
+BENCHMARK_STAGES = {
+    "parse": _setup_parse,
+    "cache_load": _setup_cache_load,
+    "analysis": _setup_analysis,
+    "anomaly": _setup_anomaly,
+    "plots": _setup_plots,
+    "report_pdf": _setup_report_pdf,
+    "report_html": _setup_report_html,
+}
+
+
+def _measure(run):
+    baseline = peak_rss_mb()
+    wall, cpu = time.perf_counter(), time.process_time()
+    run()
+    peak = peak_rss_mb()
+    return {
+        "wall_s": time.perf_counter() - wall,
+        "cpu_s": time.process_time() - cpu,
+        "peak_rss_mb": peak,
+        "rss_growth_mb": None if peak is None else peak - baseline,
+    }
+
+
+def _run_stage(stage, log_path, workdir):
+    # 새 프로세스에서 실행되므로 최대 RSS는 이 단계 (와 준비 과정)만 반영함
+    return _measure(BENCHMARK_STAGES[stage](log_path, workdir))
+
+
+def _run_generate(log_path, n_frames, seed, generator_options):
+    return _measure(lambda: write_synthetic_log(log_path, n_frames, seed=seed, **generator_options))
+
+
+def _in_fresh_process(function, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(function, *args).result()
+
+
+def environment_info():
+    """
+    측정 환경 정보 (결과 비교 시 같은 환경인지 확인용).
+    """
+    import sklearn
+    import matplotlib
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=None, workdir="benchmark_data", seed=0, log_format="csv",
+                   regenerate=False, generator_options=None):
+    """
+    합성 로그 크기별로 파이프라인 단계의 실행 시간과 최대 메모리를 측정.
+    각 단계는 새 프로세스에서 실행하므로 단계별 최대 RSS가 서로 섞이지 않음.
+    :param sizes: 로그 크기 (프레임 수) 목록
+    :param stages: 측정할 단계 이름 목록 (None이면 BENCHMARK_STAGES 전체)
+    :param workdir: 합성 로그, 캐시, 그래프, 보고서를 저장할 디렉토리
+    :param seed: 합성 로그 난수 시드
+    :param log_format: 합성 로그 포맷 ("csv" 또는 "candump")
+    :param regenerate: True이면 같은 이름의 합성 로그가 있어도 다시 생성
+    :param generator_options: write_synthetic_log 추가 인자 (attack_rate, fd_fraction 등)
+    :return: {"environment": ..., "config": ..., "results": [단계별 측정 딕셔너리, ...]}
+    """
+    stages = list(BENCHMARK_STAGES) if stages is None else stages
+    generator_options = generator_options or {}
+    os.makedirs(workdir, exist_ok=True)
+    extension = ".log" if log_format == "candump" else ".csv"
+
+    results = []
+    for n_frames in sizes:
+        log_path = os.path.join(workdir, f"synthetic_{n_frames}_seed{seed}{extension}")
+        measurements = []
+        if regenerate or not os.path.exists(log_path):
+            clear_cached_log(log_path)
+            measurements.append(("generate", _in_fresh_process(_run_generate, log_path, n_frames, seed, generator_options)))
+        for stage in stages:
+            measurements.append((stage, _in_fresh_process(_run_stage, stage, log_path, workdir)))
+
+        for stage, measurement in measurements:
+            record = {"frames": n_frames, "stage": stage, **measurement,
+                      "frames_per_s": n_frames / measurement["wall_s"] if measurement["wall_s"] > 0 else None}
+            results.append(record)
+            print(format_result(record))
+
+    return {
+        "environment": environment_info(),
+        "config": {"sizes": list(sizes), "stages": stages, "seed": seed, "log_format": log_format,
+                   "generator_options": generator_options},
+        "results": results,
+    }
+
+
+def format_result(record):
+    """
+    측정 결과 한 줄 요약.
+    """
+    memory = "n/a" if record["peak_rss_mb"] is None else f"{record['peak_rss_mb']:.0f} MB"
+    return (f"{record['frames']:>11,} frames  {record['stage']:<12} {record['wall_s']:9.3f} s wall  "
+            f"{record['cpu_s']:9.3f} s cpu  peak {memory}")
+
+
+def compare_results(results, baseline, tolerance=0.2, min_seconds=MIN_COMPARE_SECONDS):
+    """
+    이전 측정 결과와 비교해 느려지거나 메모리가 늘어난 단계를 찾음.
+    :param results: run_benchmarks 결과의 "results"
+    :param baseline: 비교 기준 결과의 "results"
+    :param tolerance: 허용 증가 비율 (0.2 = 20%)
+    :param min_seconds: 기준 실행 시간이 이보다 짧은 단계는 시간 비교에서 제외
+    :return: 회귀 설명 문자열 목록
+    """
+    reference = {(record["frames"], record["stage"]): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = reference.get((record["frames"], record["stage"]))
+        if old is None:
+            continue
+        label = f"{record['stage']} @ {record['frames']:,} frames"
+        if old["wall_s"] >= min_seconds and record["wall_s"] > old["wall_s"] * (1 + tolerance):
+            regressions.append(f"{label}: wall time {old['wall_s']:.3f} s -> {record['wall_s']:.3f} s")
+        if old.get("peak_rss_mb") and record.get("peak_rss_mb") and \
+                record["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{label}: peak RSS {old['peak_rss_mb']:.0f} MB -> {record['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+# 실행
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic CAN logs")
+    parser.add_argument("--sizes", nargs="+", type=lambda value: int(float(value)), default=DEFAULT_SIZES,
+                        help="Log sizes in frames (e.g. 1e4 1e5 1e6 1e7 1e8)")
+    parser.add_argument("--stages", nargs="+", choices=list(BENCHMARK_STAGES), help="Stages to run (default: all)")
+    parser.add_argument("--workdir", default="benchmark_data", help="Directory for synthetic logs, caches and outputs")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic log seed")
+    parser.add_argument("--log-format", choices=["csv", "candump"], default="csv", help="Synthetic log format")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerate synthetic logs that already exist")
+    parser.add_argument("--attack-rate", type=float, default=0.05, help="Injected attacks per second")
+    parser.add_argument("--fd-fraction", type=float, default=0.0, help="Fraction of IDs sent as CAN FD frames")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown / memory growth vs. the baseline")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        sizes=args.sizes,
+        stages=args.stages,
+        workdir=args.workdir,
+        seed=args.seed,
+        log_format=args.log_format,
+        regenerate=args.regenerate,
+        generator_options={"attack_rate": args.attack_rate, "fd_fraction": args.fd_fraction},
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Benchmark results saved as {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare_results(report["results"], json.load(file)["results"], tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
@@ -1,17 +1,448 @@
+import os
+import re
+import sys
+
+import numpy as np
 import pandas as pd
 
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.log_cache import load_cached_log, store_cached_log, prefer_sparse_column, sparse_column
+from src.payload_codec import (
+    PAYLOAD_WIDTH,
+    FD_PAYLOAD_WIDTH,
+    decode_hex_payloads,
+    pack_payloads,
+    dlc_to_length,
+    length_to_dlc,
+    payload_width_for
+)
+
+# CSV 로그의 컬럼 순서
+LOG_COLUMNS = ["Timestamp", "CAN_ID", "DLC", "Data"]
+
+# Flags 컬럼 비트 (프레임 종류)
+FLAG_EXTENDED = 0x01  # IDE: 29비트 확장 ID
+FLAG_FD = 0x02        # CAN FD 프레임
+FLAG_BRS = 0x04       # FD 데이터 구간 비트레이트 전환
+FLAG_ESI = 0x08       # FD 송신 노드 error passive 상태
+FLAG_REMOTE = 0x10    # 원격 프레임 (RTR)
+
+# 표준(11비트) / 확장(29비트) ID 최대값
+MAX_STANDARD_ID = 0x7FF
+MAX_EXTENDED_ID = 0x1FFFFFFF
+
+# Classic CAN 페이로드 바이트별 컬럼 이름 (B0 ~ B7). FD 프레임이 있는 로그는 B0 ~ B63까지 사용
+PAYLOAD_COLUMNS = [f"B{i}" for i in range(PAYLOAD_WIDTH)]
+
+# FD 프레임에만 있는 바이트 컬럼 (B8 ~ B63). 로그 전체에서 0이 아닌 값이 적으면 (FD 프레임이 일부인 로그)
+# 0이 아닌 값만 행 번호와 함께 저장하는 희소 컬럼으로 유지해서 Classic 프레임이 64바이트를 차지하지 않도록 함
+FD_EXTENSION_COLUMNS = [f"B{i}" for i in range(PAYLOAD_WIDTH, FD_PAYLOAD_WIDTH)]
+
+# 청크 단위 읽기 시 기본 행 수 (Classic 약 1M 프레임 ≈ 22MB)
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# 파싱된 프레임의 컬럼별 고정 dtype (페이로드 컬럼은 모두 uint8)
+FRAME_DTYPES = {
+    "Timestamp": np.float64,
+    "CAN_ID": np.uint32,
+    "DLC": np.uint8,
+    "Flags": np.uint8,
+    **{column: np.uint8 for column in PAYLOAD_COLUMNS},
+}
+
+
+def parse_can_id(can_id):
+    """
+    CAN ID를 정수로 변환.
+    :param can_id: "0x123" / "123" 형태의 16진수 문자열 또는 정수
+    :return: 정수 CAN ID
+    """
+    if isinstance(can_id, str):
+        return int(can_id, 16)
+    return int(can_id)
+
+
+def format_can_id(can_id):
+    """
+    정수 CAN ID를 "0x123" 형태의 문자열로 변환 (보고서/그래프 표시용).
+    """
+    return f"0x{int(can_id):03X}"
+
+
+def _parse_can_ids(can_ids):
+    """
+    16진수 CAN ID 컬럼을 uint32 배열로 변환.
+    고유 ID 수는 전체 행 수보다 훨씬 적으므로 고유값만 변환한 뒤 인덱싱함.
+    """
+    codes, uniques = pd.factorize(can_ids)
+    lookup = np.array([int(value, 16) for value in uniques], dtype=np.uint32)
+    return lookup[codes]
+
+
+# 포맷 이름 → (리더 함수, 확장자 목록, 매직 바이트 판별 함수)
+_READERS = {}
+
+# 포맷 판별 시 읽는 파일 앞부분 바이트 수
+_SNIFF_SIZE = 512
+
+
+def register_reader(name, extensions=(), magic=None):
+    """
+    로그 포맷 리더를 등록하는 데코레이터.
+    리더 함수는 (file_path, chunksize)를 받아 프레임 청크를 yield 해야 함.
+    :param name: 포맷 이름 (예: "csv", "candump")
+    :param extensions: 이 포맷으로 간주할 파일 확장자 목록 (예: [".csv"])
+    :param magic: 파일 앞부분 바이트를 받아 이 포맷인지 판별하는 함수 (옵션)
+    """
+    def decorator(reader):
+        _READERS[name] = (reader, tuple(ext.lower() for ext in extensions), magic)
+        return reader
+    return decorator
+
+
+def get_log_formats():
+    """
+    등록된 로그 포맷 이름 목록을 반환.
+    """
+    return sorted(_READERS)
+
+
+def get_log_extensions():
+    """
+    등록된 로그 포맷의 파일 확장자 목록을 반환 (디렉토리에서 로그 파일을 찾을 때 사용).
+    """
+    return sorted({extension for _, extensions, _ in _READERS.values() for extension in extensions})
+
+
+def detect_log_format(file_path):
+    """
+    파일 앞부분의 매직 바이트로 로그 포맷을 판별하고, 판별되지 않으면 확장자를 사용.
+    :param file_path: CAN 로그 파일 경로
+    :return: 포맷 이름
+    """
+    with open(file_path, "rb") as file:
+        head = file.read(_SNIFF_SIZE)
+    for name, (_, _, magic) in _READERS.items():
+        if magic is not None and magic(head):
+            return name
+
+    extension = os.path.splitext(file_path)[1].lower()
+    for name, (_, extensions, _) in _READERS.items():
+        if extension in extensions:
+            return name
+    raise ValueError(f"지원하지 않는 로그 포맷: {file_path}")
+
+
+def payload_columns(width=PAYLOAD_WIDTH):
+    """
+    페이로드 폭에 해당하는 바이트 컬럼 이름 목록 (B0 ~ B{width-1}).
+    """
+    return [f"B{i}" for i in range(width)]
+
+
+def make_frame(timestamps, can_ids, dlcs, payload, flags=None):
+    """
+    컬럼 배열들로 고정 dtype 프레임을 생성 (모든 리더가 공통으로 사용).
+    :param payload: (n, 8) 또는 (n, 64) uint8 페이로드 행렬 (폭이 그대로 바이트 컬럼 수가 됨)
+    :param flags: Flags 비트 배열 (None이면 표준 ID 범위를 넘는 ID만 확장 ID로 표시)
+    """
+    can_ids = np.asarray(can_ids, dtype=np.uint32)
+    if flags is None:
+        flags = np.where(can_ids > MAX_STANDARD_ID, FLAG_EXTENDED, 0)
+    return pd.DataFrame({
+        "Timestamp": np.asarray(timestamps, dtype=np.float64),
+        "CAN_ID": can_ids,
+        "DLC": np.asarray(dlcs, dtype=np.uint8),
+        "Flags": np.asarray(flags, dtype=np.uint8),
+        **{column: payload[:, i] for i, column in enumerate(payload_columns(payload.shape[1]))},
+    })
+
+
+@register_reader("csv", extensions=[".csv"], magic=lambda head: head.lstrip(b"\xef\xbb\xbf").startswith(b"Timestamp,"))
+def _read_csv_chunks(file_path, chunksize):
+    """
+    Timestamp,CAN_ID,DLC,Data 4컬럼 CSV 로그 리더.
+    Data가 8바이트를 넘는 행은 CAN FD 프레임으로 보고 DLC를 바이트 수에 맞는 FD DLC 코드로 저장함
+    (DLC 컬럼에 12, 64 같은 바이트 수가 기록된 경우도 포함). 표준 범위를 넘는 ID는 확장 ID로 표시함.
+    """
+    reader = pd.read_csv(
+        file_path,
+        header=0,
+        names=LOG_COLUMNS,
+        dtype={"Timestamp": np.float64, "CAN_ID": str, "DLC": np.uint8, "Data": str},
+        chunksize=chunksize,
+    )
+    with reader:
+        for raw in reader:
+            can_ids = _parse_can_ids(raw["CAN_ID"])
+            lengths = (raw["Data"].fillna("").str.replace(" ", "", regex=False).str.len() // 2).to_numpy()
+            dlc = raw["DLC"].to_numpy()
+            is_fd = (lengths > PAYLOAD_WIDTH) | (dlc > 15)
+            dlc = np.where(is_fd, length_to_dlc(np.maximum(lengths, np.where(dlc > 15, dlc, 0))), dlc)
+            flags = np.where(is_fd, FLAG_FD, 0) | np.where(can_ids > MAX_STANDARD_ID, FLAG_EXTENDED, 0)
+            yield make_frame(
+                raw["Timestamp"].to_numpy(), can_ids, dlc,
+                decode_hex_payloads(raw["Data"], width=payload_width_for(lengths), lengths=dlc_to_length(dlc, is_fd)),
+                flags
+            )
+
+
+@register_reader("candump", extensions=[".log"], magic=lambda head: re.match(rb"\(\d+\.\d+\) \S+ [0-9A-Fa-f]+#", head) is not None)
+def _read_candump_chunks(file_path, chunksize):
+    """
+    Linux `candump -l` 로그 리더.
+    예: (1436509052.249713) vcan0 044#2A366C2BBA
+    FD 프레임(123##<flags><data>)은 BRS/ESI 플래그와 함께 최대 64바이트까지 저장하고,
+    원격 프레임(123#R[DLC])은 페이로드 없이 저장함. 8자리 ID는 확장 ID.
+    """
+    reader = pd.read_csv(
+        file_path,
+        sep=" ",
+        header=None,
+        names=["Timestamp", "Interface", "Frame"],
+        usecols=[0, 2],
+        # 뒤에 방향 표시(R/T)가 붙은 행의 남는 필드는 무시
+        index_col=False,
+        dtype=str,
+        chunksize=chunksize,
+    )
+    with reader:
+        for raw in reader:
+            timestamps = raw["Timestamp"].str.strip("()").astype(np.float64)
+            parts = raw["Frame"].str.split("#", n=1, expand=True)
+            data = parts[1].fillna("")
+
+            # FD 프레임은 "#" 뒤에 플래그 16진수 1글자 (0x1: BRS, 0x2: ESI)가 붙음
+            is_fd = data.str.startswith("#").to_numpy()
+            fd_flags = np.where(is_fd, _parse_can_ids(data.str.slice(1, 2).where(is_fd, "0")), 0)
+            data = data.where(~is_fd, data.str.slice(2))
 
-def parse_can_log(file_path):
+            is_remote = data.str.startswith("R").to_numpy()
+            remote_dlc = pd.to_numeric(data.str.slice(1).where(is_remote, ""), errors="coerce").fillna(0).to_numpy()
+            data = data.where(~is_remote, "")
+
+            lengths = (data.str.len() // 2).to_numpy()
+            dlc = np.where(is_remote, remote_dlc, np.where(is_fd, length_to_dlc(lengths), lengths))
+            flags = (np.where(parts[0].str.len().to_numpy() > 3, FLAG_EXTENDED, 0)
+                     | np.where(is_fd, FLAG_FD, 0)
+                     | np.where(fd_flags & 0x1, FLAG_BRS, 0)
+                     | np.where(fd_flags & 0x2, FLAG_ESI, 0)
+                     | np.where(is_remote, FLAG_REMOTE, 0))
+            yield make_frame(
+                timestamps.to_numpy(), _parse_can_ids(parts[0]), dlc,
+                decode_hex_payloads(data, width=payload_width_for(lengths)), flags
+            )
+
+
+def _read_python_can_chunks(reader, chunksize):
+    """
+    python-can 메시지 리더의 출력을 청크 단위 컬럼 배열로 모아서 프레임으로 변환.
+    에러 프레임은 건너뜀.
+    """
+    timestamps, can_ids, dlcs, flags, payloads = [], [], [], [], []
+
+    def flush():
+        lengths = np.array([len(payload) for payload in payloads])
+        return make_frame(timestamps, can_ids, dlcs, pack_payloads(payloads, payload_width_for(lengths)), flags)
+
+    for message in reader:
+        if message.is_error_frame:
+            continue
+        timestamps.append(message.timestamp)
+        can_ids.append(message.arbitration_id)
+        flags.append(message_flags(message))
+        # python-can의 dlc는 바이트 수이므로 FD 프레임은 DLC 코드로 변환
+        dlcs.append(int(length_to_dlc(len(message.data))) if message.is_fd else message.dlc)
+        payloads.append(message.data)
+        if len(timestamps) >= chunksize:
+            yield flush()
+            timestamps, can_ids, dlcs, flags, payloads = [], [], [], [], []
+    if timestamps:
+        yield flush()
+
+
+def message_flags(message):
+    """
+    python-can 메시지의 프레임 종류를 Flags 비트로 변환.
+    """
+    return ((FLAG_EXTENDED if message.is_extended_id else 0)
+            | (FLAG_FD if message.is_fd else 0)
+            | (FLAG_BRS if message.bitrate_switch else 0)
+            | (FLAG_ESI if message.error_state_indicator else 0)
+            | (FLAG_REMOTE if message.is_remote_frame else 0))
+
+
+def _import_python_can():
+    try:
+        import can
+    except ImportError as e:
+        raise ImportError("ASC/BLF/TRC 로그를 읽으려면 python-can이 필요합니다: pip install python-can") from e
+    return can
+
+
+@register_reader("asc", extensions=[".asc"], magic=lambda head: head.lstrip().lower().startswith(b"date "))
+def _read_asc_chunks(file_path, chunksize):
+    """
+    Vector ASC 로그 리더 (python-can 사용).
+    """
+    can = _import_python_can()
+    with can.ASCReader(file_path) as reader:
+        yield from _read_python_can_chunks(reader, chunksize)
+
+
+@register_reader("blf", extensions=[".blf"], magic=lambda head: head.startswith(b"LOGG"))
+def _read_blf_chunks(file_path, chunksize):
+    """
+    Vector BLF 바이너리 로그 리더 (python-can 사용).
+    """
+    can = _import_python_can()
+    with can.BLFReader(file_path) as reader:
+        yield from _read_python_can_chunks(reader, chunksize)
+
+
+@register_reader("trc", extensions=[".trc"], magic=lambda head: head.startswith(b";$FILEVERSION"))
+def _read_trc_chunks(file_path, chunksize):
+    """
+    PEAK TRC 로그 리더 (python-can 사용).
+    """
+    can = _import_python_can()
+    with can.TRCReader(file_path) as reader:
+        yield from _read_python_can_chunks(reader, chunksize)
+
+
+def iter_can_log_chunks(file_path, chunksize=DEFAULT_CHUNK_SIZE, log_format=None):
+    """
+    CAN 로그를 고정 크기 청크 단위로 읽어서 DataFrame을 순서대로 반환 (제너레이터).
+    메모리 사용량은 파일 크기가 아닌 청크 크기에 비례함.
+    :param file_path: CAN 로그 파일 경로
+    :param chunksize: 청크당 행 수
+    :param log_format: 로그 포맷 이름 (None이면 매직 바이트/확장자로 자동 판별)
+    :return: Timestamp(float64), CAN_ID(uint32), DLC(uint8), Flags(uint8), B0~B7 또는 B0~B63(uint8) 컬럼 DataFrame
+             (FD 프레임이 있는 청크만 64바이트 폭)
+    """
+    if log_format is None:
+        log_format = detect_log_format(file_path)
+    if log_format not in _READERS:
+        raise ValueError(f"지원하지 않는 로그 포맷: {log_format}")
+    reader, _, _ = _READERS[log_format]
+    yield from reader(file_path, chunksize)
+
+
+def frame_payload_width(df):
+    """
+    프레임의 페이로드 바이트 컬럼 수 (Classic 로그 8, FD 로그 64).
+    """
+    width = 0
+    while f"B{width}" in df.columns:
+        width += 1
+    return width
+
+
+def frame_flags(df):
+    """
+    프레임의 Flags 배열 (Flags 컬럼이 없는 프레임은 모두 0 = 표준 ID Classic 프레임).
+    """
+    if "Flags" in df.columns:
+        return df["Flags"].to_numpy()
+    return np.zeros(len(df), dtype=np.uint8)
+
+
+def payload_lengths(df):
+    """
+    프레임별 페이로드 바이트 수 (DLC 코드와 FD 플래그로 계산, 원격 프레임은 0).
+    """
+    flags = frame_flags(df)
+    lengths = dlc_to_length(df["DLC"].to_numpy(), (flags & FLAG_FD) != 0)
+    return np.where(flags & FLAG_REMOTE, 0, lengths).astype(np.uint8)
+
+
+def payload_matrix(df, width=None):
+    """
+    프레임의 페이로드 바이트 컬럼을 (n, width) uint8 행렬로 반환.
+    :param width: 행렬 폭 (None이면 프레임의 바이트 컬럼 수, 더 넓으면 0으로 채움)
+    """
+    own = frame_payload_width(df)
+    payload = df[payload_columns(own)].to_numpy(dtype=np.uint8)
+    if width is None or width == own:
+        return payload
+    widened = np.zeros((len(df), width), dtype=np.uint8)
+    widened[:, :min(own, width)] = payload[:, :width]
+    return widened
+
+
+def _frame_chunks(file_path, chunksize, log_format):
+    """
+    로그의 프레임 청크를 yield (프레임이 없는 로그는 고정 dtype의 빈 프레임 하나).
+    """
+    empty = True
+    for chunk in iter_can_log_chunks(file_path, chunksize=chunksize, log_format=log_format):
+        empty = False
+        yield chunk
+    if empty:
+        yield pd.DataFrame({column: np.empty(0, dtype=dtype) for column, dtype in FRAME_DTYPES.items()})
+
+
+def _concat_chunks(chunks):
+    """
+    청크를 컬럼별 배열로 나눠 모았다가 컬럼 하나씩 미리 할당한 배열에 복사해서 합침
+    (pd.concat처럼 청크 전체와 결과 프레임이 한꺼번에 메모리에 있지 않음).
+    FD 청크가 있으면 Classic 청크에 없는 바이트 컬럼은 0으로 채우고, 0이 아닌 값이 적은 FD 바이트 컬럼은 희소 컬럼으로 만듦.
+    """
+    parts, dtypes, nonzero, rows = {}, {}, dict.fromkeys(FD_EXTENSION_COLUMNS, 0), 0
+    for chunk in chunks:
+        for column in chunk.columns:
+            # 청크 블록과 분리된 배열로 복사해서 컬럼을 합칠 때마다 해당 청크 메모리를 놓을 수 있게 함
+            values = np.array(chunk[column].to_numpy())
+            parts.setdefault(column, []).append((rows, values))
+            dtypes.setdefault(column, values.dtype)
+            if column in nonzero:
+                nonzero[column] += np.count_nonzero(values)
+        rows += len(chunk)
+
+    columns = {}
+    for column in list(parts):
+        pieces = parts.pop(column)
+        if column in nonzero and prefer_sparse_column(nonzero[column], rows, dtypes[column]):
+            found = [(offset + np.flatnonzero(values), values[values != 0]) for offset, values in pieces]
+            del pieces
+            columns[column] = sparse_column(np.concatenate([found_rows for found_rows, _ in found]),
+                                            np.concatenate([found_values for _, found_values in found]), rows)
+            continue
+        merged = np.zeros(rows, dtype=dtypes[column])
+        for offset, values in pieces:
+            merged[offset:offset + len(values)] = values
+        columns[column] = merged
+    return pd.DataFrame(columns, copy=False)
+
+
+def parse_can_log(file_path, chunksize=DEFAULT_CHUNK_SIZE, use_cache=True, log_format=None):
     """
     CAN 로그 데이터를 읽어서 DataFrame으로 반환.
-    파일 경로를 입력으로 받아 CSV 데이터를 읽고 컬럼을 정리함.
+    CSV, candump, ASC, BLF, TRC 포맷을 지원하며, 파일을 청크 단위로 읽어 고정 dtype 컬럼으로 변환함.
+    FD 프레임이 일부인 로그의 B8 ~ B63 컬럼은 희소 컬럼이므로 바이트 값은 payload_matrix로 읽음.
+    use_cache가 켜져 있으면 청크를 로그 옆의 컬럼 캐시에 바로 이어 쓰고 메모리 맵으로 읽으므로
+    메모리는 청크 크기에 비례함. 캐시가 유효하면 다시 파싱하지 않음.
+    캐시를 쓰지 않으면 (또는 캐시 저장이 실패하면) 메모리에서 컬럼별로 합침.
+    :param file_path: CAN 로그 파일 경로
+    :param chunksize: 청크당 행 수
+    :param use_cache: 컬럼 캐시 사용 여부
+    :param log_format: 로그 포맷 이름 (None이면 자동 판별)
+    :return: 파싱된 DataFrame (실패 시 None)
     """
     try:
-        # CSV 파일 읽기
-        df = pd.read_csv(file_path)
-        # 컬럼 이름 설정
-        df.columns = ["Timestamp", "CAN_ID", "DLC", "Data"]
-        return df
+        if use_cache:
+            cached = load_cached_log(file_path)
+            if cached is not None:
+                return cached
+            if store_cached_log(file_path, _frame_chunks(file_path, chunksize, log_format),
+                                sparse_columns=FD_EXTENSION_COLUMNS):
+                cached = load_cached_log(file_path)
+                if cached is not None:
+                    return cached
+
+        return _concat_chunks(_frame_chunks(file_path, chunksize, log_format))
     except Exception as e:
         print(f"파일 읽기 실패: {e}")
         return None
@@ -23,3 +454,4 @@ if __name__ == "__main__":
     data = parse_can_log(file_path)
     if data is not None:
         print(data.head())
+        print(data.dtypes)
@@ -1,5 +1,36 @@
+import argparse
+import os
+import sys
+
+import numpy as np
 import pandas as pd
 
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import make_frame, DEFAULT_CHUNK_SIZE, FLAG_FD, FLAG_BRS
+from src.payload_codec import PAYLOAD_WIDTH, FD_PAYLOAD_WIDTH, FD_DLC_LENGTHS, encode_hex_payloads, length_to_dlc
+
+# 합성 버스의 주기형 메시지 주기 후보 (초)와 선택 확률 (10~100ms 메시지가 대부분)
+SYNTHETIC_PERIODS = np.array([0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0])
+SYNTHETIC_PERIOD_WEIGHTS = np.array([0.2, 0.2, 0.2, 0.2, 0.1, 0.05, 0.05])
+
+# Classic 메시지 DLC 후보와 선택 확률
+SYNTHETIC_DLCS = np.array([2, 4, 6, 8])
+SYNTHETIC_DLC_WEIGHTS = np.array([0.1, 0.15, 0.15, 0.6])
+
+# 주입 공격 종류 (with_labels=True일 때 Attack 컬럼 값, 0은 정상 프레임)
+ATTACK_FLOOD = 1  # ID 0x000 고속 전송 (버스 점유)
+ATTACK_SPOOF = 2  # 기존 ID를 10배 빠르게, 임의 페이로드로 전송
+ATTACK_FUZZ = 3   # 임의 ID, 임의 DLC/페이로드
+
+# 공격별 프레임 간격 (초)
+_FLOOD_INTERVAL = 0.00025
+_FUZZ_INTERVAL = 0.001
+
+# 이벤트성 버스트의 프레임 간격 (초)
+_BURST_INTERVAL = 0.001
+
 
 def create_sample_data():
     # 샘플 데이터 정의
@@ -17,6 +48,222 @@ def create_sample_data():
     print("샘플 데이터가 'data/sample_can_log.csv'에 저장되었습니다.")
 
 
+def synthetic_bus_profile(n_ids=64, seed=0, fd_fraction=0.0):
+    """
+    합성 버스의 주기형 메시지 구성 (ID, 주기, 위상, 페이로드 길이, 기본 페이로드)을 생성.
+    :param n_ids: 주기형 CAN ID 수 (표준 ID 0x080 ~ 0x7FF에서 선택)
+    :param seed: 난수 시드 (같은 시드는 같은 버스를 만듦)
+    :param fd_fraction: CAN FD(BRS) 메시지로 만들 ID 비율
+    :return: 배열 딕셔너리 (ids, periods, phases, lengths, dlcs, flags, base)
+    """
+    rng = np.random.default_rng(seed)
+    ids = np.sort(rng.choice(np.arange(0x080, 0x800), size=n_ids, replace=False)).astype(np.uint32)
+    periods = rng.choice(SYNTHETIC_PERIODS, size=n_ids, p=SYNTHETIC_PERIOD_WEIGHTS)
+    is_fd = rng.random(n_ids) < fd_fraction
+    lengths = np.where(is_fd, rng.choice(FD_DLC_LENGTHS[9:], size=n_ids),
+                       rng.choice(SYNTHETIC_DLCS, size=n_ids, p=SYNTHETIC_DLC_WEIGHTS))
+
+    width = FD_PAYLOAD_WIDTH if is_fd.any() else PAYLOAD_WIDTH
+    base = rng.integers(0, 256, size=(n_ids, width), dtype=np.uint8)
+    base[np.arange(width) >= lengths[:, None]] = 0
+    return {
+        "ids": ids,
+        "periods": periods,
+        "phases": rng.random(n_ids) * periods,
+        "lengths": lengths,
+        "dlcs": length_to_dlc(lengths),
+        "flags": np.where(is_fd, FLAG_FD | FLAG_BRS, 0).astype(np.uint8),
+        "base": base,
+    }
+
+
+def _periodic_frames(profile, t0, t1, jitter, rng):
+    """
+    [t0, t1) 구간에 예정된 주기형 프레임. 전송 지연(지터)은 주기의 jitter배를 평균으로 하는 지수 분포 (주기의 절반 이하).
+    """
+    periods, phases = profile["periods"], profile["phases"]
+    first = np.maximum(np.ceil((t0 - phases) / periods), 0).astype(np.int64)
+    counts = np.maximum(np.ceil((t1 - phases) / periods).astype(np.int64) - first, 0)
+    slots = np.repeat(np.arange(len(periods)), counts)
+    k = first[slots] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    nominal = phases[slots] + k * periods[slots]
+    delay = np.minimum(rng.exponential(jitter * periods[slots]), 0.5 * periods[slots])
+
+    # 바이트 0은 롤링 카운터, 바이트 1~2는 천천히 변하는 16비트 신호, 나머지는 ID별 고정값
+    payload = profile["base"][slots]
+    payload[:, 0] = k & 0xFF
+    signal = (32767 * (1 + np.sin(2 * np.pi * nominal / (10.0 + slots)))).astype(np.uint16)
+    payload[:, 1] = signal >> 8
+    payload[:, 2] = signal & 0xFF
+    payload[np.arange(payload.shape[1]) >= profile["lengths"][slots][:, None]] = 0
+    return nominal + delay, slots, payload
+
+
+def _episode_times(start, duration, interval, rng):
+    """
+    [start, start + duration) 구간에 interval 간격으로 보내는 프레임 시각 (간격의 10% 이내 흔들림).
+    """
+    times = start + np.arange(int(duration / interval)) * interval
+    return times + rng.random(len(times)) * 0.1 * interval
+
+
+def _event_frames(profile, t0, t1, burst_rate, attack_rate, rng):
+    """
+    [t0, t1) 구간에 시작하는 이벤트성 버스트 (정상)와 주입 공격 프레임.
+    :return: (timestamps, can_ids, dlcs, flags, payload, labels) 튜플 목록
+    """
+    events = []
+    width = profile["base"].shape[1]
+
+    # 이벤트성 버스트: 기존 ID 하나가 1ms 간격으로 5~50개 프레임을 연속 전송 (진단 응답 등)
+    for start in rng.uniform(t0, t1, size=rng.poisson(burst_rate * (t1 - t0))):
+        slot = rng.integers(len(profile["ids"]))
+        times = _episode_times(start, rng.integers(5, 50) * _BURST_INTERVAL, _BURST_INTERVAL, rng)
+        payload = np.repeat(profile["base"][slot:slot + 1], len(times), axis=0)
+        payload[:, 0] = np.arange(len(times)) & 0xFF
+        events.append((times, np.full(len(times), profile["ids"][slot]), np.full(len(times), profile["dlcs"][slot]),
+                       np.full(len(times), profile["flags"][slot]), payload, np.zeros(len(times), dtype=np.uint8)))
+
+    # 주입 공격: 0.2~2초 동안 플러딩 / 스푸핑 / 퍼징
+    for start in rng.uniform(t0, t1, size=rng.poisson(attack_rate * (t1 - t0))):
+        kind = rng.choice([ATTACK_FLOOD, ATTACK_SPOOF, ATTACK_FUZZ])
+        duration = rng.uniform(0.2, 2.0)
+        if kind == ATTACK_FLOOD:
+            times = _episode_times(start, duration, _FLOOD_INTERVAL, rng)
+            n = len(times)
+            ids, dlcs, flags = np.zeros(n, dtype=np.uint32), np.full(n, PAYLOAD_WIDTH), np.zeros(n, dtype=np.uint8)
+            payload = np.zeros((n, width), dtype=np.uint8)
+        elif kind == ATTACK_SPOOF:
+            slot = rng.integers(len(profile["ids"]))
+            times = _episode_times(start, duration, profile["periods"][slot] / 10, rng)
+            n = len(times)
+            ids, dlcs, flags = (np.full(n, profile["ids"][slot]), np.full(n, profile["dlcs"][slot]),
+                                np.full(n, profile["flags"][slot]))
+            payload = rng.integers(0, 256, size=(n, width), dtype=np.uint8)
+            payload[:, profile["lengths"][slot]:] = 0
+        else:
+            times = _episode_times(start, duration, _FUZZ_INTERVAL, rng)
+            n = len(times)
+            ids, dlcs = rng.integers(0, 0x800, size=n), rng.integers(0, PAYLOAD_WIDTH + 1, size=n)
+            flags = np.zeros(n, dtype=np.uint8)
+            payload = rng.integers(0, 256, size=(n, width), dtype=np.uint8)
+            payload[np.arange(width) >= dlcs[:, None]] = 0
+        events.append((times, ids, dlcs, flags, payload, np.full(n, kind, dtype=np.uint8)))
+    return events
+
+
+def iter_synthetic_frames(n_frames, seed=0, n_ids=64, jitter=0.02, burst_rate=0.5, attack_rate=0.05,
+                          fd_fraction=0.0, chunk_size=DEFAULT_CHUNK_SIZE, with_labels=False):
+    """
+    재현 가능한 합성 CAN 버스 로그를 시간 순서대로 청크 단위로 생성 (제너레이터).
+    주기형 메시지 (지터 포함)에 이벤트성 버스트와 주입 공격을 섞으며, 메모리 사용량은 청크 크기에 비례하므로
+    1억 프레임 이상도 생성할 수 있음. 청크 경계를 넘는 지연/공격 프레임은 다음 청크로 넘겨 시간 순서를 유지함.
+    :param n_frames: 생성할 총 프레임 수
+    :param seed: 난수 시드 (같은 인자와 시드는 같은 로그를 만듦)
+    :param n_ids: 주기형 CAN ID 수
+    :param jitter: 주기 대비 평균 전송 지연 비율
+    :param burst_rate: 초당 이벤트성 버스트 수
+    :param attack_rate: 초당 주입 공격 수
+    :param fd_fraction: CAN FD 메시지로 만들 ID 비율 (0보다 크면 페이로드 폭 64)
+    :param chunk_size: 청크당 대략적인 프레임 수
+    :param with_labels: True이면 공격 종류 Attack 컬럼 (0 = 정상)을 추가
+    :return: make_frame 형식 DataFrame 청크
+    """
+    rng = np.random.default_rng(seed)
+    profile = synthetic_bus_profile(n_ids=n_ids, seed=seed, fd_fraction=fd_fraction)
+    window = chunk_size / np.sum(1.0 / profile["periods"])
+    carry = None
+    emitted = 0
+    t0 = 0.0
+    while emitted < n_frames:
+        t1 = t0 + window
+        times, slots, payload = _periodic_frames(profile, t0, t1, jitter, rng)
+        parts = [(times, profile["ids"][slots], profile["dlcs"][slots], profile["flags"][slots], payload,
+                  np.zeros(len(times), dtype=np.uint8))]
+        parts += _event_frames(profile, t0, t1, burst_rate, attack_rate, rng)
+        if carry is not None:
+            parts.append(carry)
+        columns = [np.concatenate(column) for column in zip(*parts)]
+
+        order = np.argsort(columns[0], kind="stable")
+        columns = [column[order] for column in columns]
+        ready = np.searchsorted(columns[0], t1)
+        carry = tuple(column[ready:] for column in columns)
+
+        timestamps, ids, dlcs, flags, payload, labels = (column[:min(ready, n_frames - emitted)] for column in columns)
+        df = make_frame(timestamps, ids, dlcs, payload, flags)
+        if with_labels:
+            df["Attack"] = labels
+        emitted += len(df)
+        t0 = t1
+        yield df
+
+
+def generate_synthetic_log(n_frames, seed=0, **kwargs):
+    """
+    합성 CAN 로그 전체를 하나의 DataFrame으로 생성 (iter_synthetic_frames 인자를 그대로 받음).
+    """
+    return pd.concat(iter_synthetic_frames(n_frames, seed=seed, **kwargs), ignore_index=True)
+
+
+def _format_csv_lines(df, payload, lengths):
+    data = encode_hex_payloads(payload, lengths)
+    return [f"{ts:.6f},0x{can_id:03X},{dlc},{text}\n" for ts, can_id, dlc, text in
+            zip(df["Timestamp"].tolist(), df["CAN_ID"].tolist(), df["DLC"].tolist(), data.tolist())]
+
+
+def _format_candump_lines(df, payload, lengths):
+    data = encode_hex_payloads(payload, lengths, sep="")
+    separators = np.where(df["Flags"].to_numpy() & FLAG_FD, "##1", "#")
+    return [f"({ts:.6f}) can0 {can_id:03X}{separator}{text}\n" for ts, can_id, separator, text in
+            zip(df["Timestamp"].tolist(), df["CAN_ID"].tolist(), separators.tolist(), data.tolist())]
+
+
+def write_synthetic_log(file_path, n_frames, seed=0, log_format=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    합성 CAN 로그를 청크 단위로 파일에 저장 (CSV 또는 candump).
+    :param file_path: 저장할 파일 경로
+    :param n_frames: 총 프레임 수
+    :param seed: 난수 시드
+    :param log_format: "csv" 또는 "candump" (None이면 확장자 .log → candump, 그 외 CSV)
+    :param chunk_size: 청크당 프레임 수
+    :param kwargs: iter_synthetic_frames 인자 (jitter, attack_rate 등)
+    :return: 저장한 프레임 수
+    """
+    from src.can_parser import payload_lengths, payload_matrix
+
+    if log_format is None:
+        log_format = "candump" if file_path.endswith(".log") else "csv"
+    format_lines = _format_candump_lines if log_format == "candump" else _format_csv_lines
+
+    written = 0
+    with open(file_path, "w", encoding="ascii") as file:
+        if log_format == "csv":
+            file.write("Timestamp,CAN_ID,DLC,Data\n")
+        for df in iter_synthetic_frames(n_frames, seed=seed, chunk_size=chunk_size, **kwargs):
+            file.writelines(format_lines(df, payload_matrix(df), payload_lengths(df)))
+            written += len(df)
+    print(f"Synthetic log saved as {file_path} ({written} frames)")
+    return written
+
+
 # 실행
 if __name__ == "__main__":
-    create_sample_data()
+    parser = argparse.ArgumentParser(description="Create the sample CAN log or a synthetic large log")
+    parser.add_argument("--frames", type=lambda value: int(float(value)),
+                        help="Write a synthetic log with this many frames (e.g. 1e6) instead of the 3-row sample")
+    parser.add_argument("--output", help="Synthetic log path (.csv or candump .log)", default="data/synthetic_can_log.csv")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--ids", type=int, default=64, help="Number of periodic CAN IDs")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Mean transmit delay as a fraction of the period")
+    parser.add_argument("--burst-rate", type=float, default=0.5, help="Event bursts per second")
+    parser.add_argument("--attack-rate", type=float, default=0.05, help="Injected attacks (flood/spoof/fuzz) per second")
+    parser.add_argument("--fd-fraction", type=float, default=0.0, help="Fraction of IDs sent as CAN FD frames")
+    args = parser.parse_args()
+
+    if args.frames is None:
+        create_sample_data()
+    else:
+        write_synthetic_log(args.output, args.frames, seed=args.seed, n_ids=args.ids, jitter=args.jitter,
+                            burst_rate=args.burst_rate, attack_rate=args.attack_rate, fd_fraction=args.fd_fraction)
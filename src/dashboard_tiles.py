@@ -0,0 +1,169 @@
+import os
+import sys
+
+import numpy as np
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import parse_can_id
+
+# 가장 세밀한 레벨의 시간 버킷 수 (로그 전체 구간 기준)
+DEFAULT_BASE_BUCKETS = 1 << 18
+
+# 레벨 간 버킷 크기 배율
+DEFAULT_LEVEL_FACTOR = 4
+
+# 그래프 하나에 보내는 최대 점 수
+DEFAULT_MAX_POINTS = 2000
+
+# M4 다운샘플링 전 레벨 선택 시 허용하는 버킷 수 배율 (픽셀 열당 버킷 수)
+_M4_OVERSAMPLE = 8
+
+# 가장 세밀한 레벨보다 더 확대했을 때 원본 타임스탬프로 직접 집계하는 최대 행 수
+_RAW_LIMIT = 5_000_000
+
+
+def _run_length(keys, counts=None):
+    """
+    정렬된 키 배열을 (고유 키, 키별 합계)로 압축.
+    """
+    if len(keys) == 0:
+        return keys, np.empty(0, dtype=np.int64)
+    starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+    if counts is None:
+        totals = np.diff(np.concatenate([starts, [len(keys)]]))
+    else:
+        totals = np.add.reduceat(counts, starts)
+    return keys[starts], totals
+
+
+def m4_downsample(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    M4 다운샘플링: 점들을 max_points / 4 개의 열로 나누고 열마다 처음/마지막/최소/최대 점만 남김.
+    각 열의 최소/최대가 보존되므로 피크가 사라지지 않음.
+    :return: (x, y) - 원래 순서를 유지한 부분 배열
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y
+    columns = max(max_points // 4, 1)
+    column = np.arange(n) * columns // n
+    starts = np.flatnonzero(np.concatenate([[True], column[1:] != column[:-1]]))
+    ends = np.concatenate([starts[1:], [n]]) - 1
+
+    # 열 안에서 y 순으로 정렬하면 각 열의 첫/마지막 원소가 최소/최대
+    by_value = np.lexsort((y, column))
+    keep = np.unique(np.concatenate([starts, ends, by_value[starts], by_value[ends]]))
+    return x[keep], y[keep]
+
+
+class FrequencyTiles:
+    """
+    CAN ID별 메시지 빈도를 여러 해상도의 시간 버킷으로 미리 집계한 피라미드.
+    레벨 0이 가장 세밀하고 레벨이 올라갈 때마다 버킷이 level_factor 배씩 커짐.
+    각 레벨은 (ID 코드, 버킷 번호)를 합친 정렬된 키와 빈도만 저장하므로 메모리는 비어 있지 않은 버킷 수에 비례하고,
+    조회는 이진 탐색으로 보이는 구간만 잘라냄.
+    """
+
+    def __init__(self, index, base_buckets=DEFAULT_BASE_BUCKETS, level_factor=DEFAULT_LEVEL_FACTOR):
+        """
+        :param index: CANLogIndex
+        :param base_buckets: 가장 세밀한 레벨의 버킷 수
+        :param level_factor: 레벨 간 버킷 크기 배율
+        """
+        self.index = index
+        self.level_factor = level_factor
+        self.start_time = float(index.start_time) if len(index) else 0.0
+        span = float(index.end_time) - self.start_time if len(index) else 0.0
+        self.base_width = span / base_buckets if span > 0 else 1.0
+        self._codes = {int(can_id): code for code, can_id in enumerate(index.can_ids)}
+
+        # 전체 트래픽 (ID 구분 없음)과 ID별 버킷 키 (ID 코드 * stride + 버킷 번호)
+        self._stride = base_buckets + 1
+        all_keys = self._bucket(index.timestamps())
+        id_timestamps, id_counts = index.timestamps_by_id()
+        id_codes = np.repeat(np.arange(len(index.can_ids), dtype=np.int64), id_counts)
+        id_keys = id_codes * self._stride + self._bucket(id_timestamps)
+
+        self._levels = {"all": [_run_length(all_keys)], "id": [_run_length(id_keys)]}
+        buckets = base_buckets
+        while buckets > DEFAULT_MAX_POINTS:
+            buckets = -(-buckets // level_factor)
+            for name, levels in self._levels.items():
+                keys, counts = levels[-1]
+                codes, bucket = np.divmod(keys, self._stride)
+                levels.append(_run_length(codes * self._stride + bucket // level_factor, counts))
+
+    def _bucket(self, timestamps):
+        return np.floor((timestamps - self.start_time) / self.base_width).astype(np.int64)
+
+    @property
+    def levels(self):
+        return len(self._levels["all"])
+
+    def level_width(self, level):
+        return self.base_width * self.level_factor ** level
+
+    def _level_series(self, level, start_time, end_time, can_id):
+        width = self.level_width(level)
+        first = int(np.floor((start_time - self.start_time) / width))
+        last = int(np.floor((end_time - self.start_time) / width))
+        if can_id is None:
+            keys, counts = self._levels["all"][level]
+            offset = 0
+        else:
+            keys, counts = self._levels["id"][level]
+            offset = self._codes[can_id] * self._stride
+        lo, hi = np.searchsorted(keys, [offset + first, offset + last + 1])
+
+        # 빈 버킷은 0으로 채운 연속 시계열로 반환
+        buckets = np.arange(first, last + 1)
+        values = np.zeros(len(buckets), dtype=np.float64)
+        values[keys[lo:hi] - offset - first] = counts[lo:hi]
+        return self.start_time + (buckets + 0.5) * width, values / width
+
+    def query(self, start_time=None, end_time=None, can_id=None, max_points=DEFAULT_MAX_POINTS):
+        """
+        보이는 시간 구간의 메시지 빈도(msg/s) 시계열을 최대 max_points 개의 점으로 반환.
+        보이는 버킷 수가 max_points * 8 이하인 가장 세밀한 레벨을 고른 뒤 M4로 줄이고,
+        가장 세밀한 레벨보다 더 확대한 경우에는 인덱스에서 원본 타임스탬프를 직접 집계함.
+        :param start_time: 시작 시간 (None이면 로그 시작)
+        :param end_time: 종료 시간 (None이면 로그 끝)
+        :param can_id: CAN ID (None이면 전체 트래픽)
+        :param max_points: 최대 점 수
+        :return: (시간 배열, 빈도 배열)
+        """
+        if len(self.index) == 0:
+            return np.empty(0), np.empty(0)
+        start_time = self.start_time if start_time is None else max(float(start_time), self.start_time)
+        end_time = float(self.index.end_time) if end_time is None else min(float(end_time), self.index.end_time)
+        if can_id is not None:
+            can_id = parse_can_id(can_id)
+            if can_id not in self._codes:
+                return np.empty(0), np.empty(0)
+        if end_time < start_time:
+            return np.empty(0), np.empty(0)
+
+        span = end_time - start_time
+        if span < self.base_width * max_points and self.index.count(start_time, end_time, can_id) <= _RAW_LIMIT:
+            timestamps = self.index.timestamps(start_time, end_time, can_id)
+            bins = max(max_points, 1)
+            counts, edges = np.histogram(timestamps, bins=bins, range=(start_time, max(end_time, start_time + 1e-9)))
+            width = edges[1] - edges[0]
+            return (edges[:-1] + edges[1:]) / 2, counts / width
+
+        level = 0
+        while level < self.levels - 1 and span / self.level_width(level) > max_points * _M4_OVERSAMPLE:
+            level += 1
+        x, y = self._level_series(level, start_time, end_time, can_id)
+        return m4_downsample(x, y, max_points)
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    from src.can_parser import parse_can_log
+    from src.log_index import CANLogIndex
+
+    tiles = FrequencyTiles(CANLogIndex(parse_can_log("data/sample_can_log.csv")))
+    print(tiles.levels, tiles.query(max_points=10))
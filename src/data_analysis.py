@@ -4,14 +4,26 @@ import sys
 # 현재 파일의 상위 디렉토리를 경로에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.can_parser import parse_can_log  # 이제 경로 문제가 해결됨
+import numpy as np
+import pandas as pd
+
+from src.can_parser import parse_can_log, parse_can_id  # 이제 경로 문제가 해결됨
+from src.can_parser import (
+    frame_flags, FLAG_EXTENDED, FLAG_FD, FLAG_REMOTE, MAX_STANDARD_ID, MAX_EXTENDED_ID
+)
 
 
 def filter_by_can_id(df, can_id):
     """
     특정 CAN ID에 해당하는 데이터를 필터링.
+    :param df: 데이터프레임 또는 CANLogIndex (인덱스이면 ID별 행 오프셋으로 바로 조회)
+    :param can_id: "0x123" 형태의 문자열 또는 정수 CAN ID
     """
-    return df[df["CAN_ID"] == can_id]
+    from src.log_index import CANLogIndex
+
+    if isinstance(df, CANLogIndex):
+        return df.by_can_id(can_id)
+    return df[df["CAN_ID"] == parse_can_id(can_id)]
 
 
 def calculate_message_frequency(df):
@@ -36,14 +48,73 @@ def calculate_statistics(df):
 def filter_by_time_range(df, start_time, end_time):
     """
     특정 시간 범위 내의 데이터를 필터링.
-    :param df: 데이터프레임
+    :param df: 데이터프레임 또는 CANLogIndex (인덱스이면 이진 탐색 후 슬라이스로 조회)
     :param start_time: 시작 시간 (초)
     :param end_time: 종료 시간 (초)
     :return: 필터링된 데이터프레임
     """
+    from src.log_index import CANLogIndex
+
+    if isinstance(df, CANLogIndex):
+        return df.time_range(start_time, end_time)
     return df[(df["Timestamp"] >= start_time) & (df["Timestamp"] <= end_time)]
 
 
+def _frame_type_masks(df):
+    """
+    프레임 종류별 마스크와 종류에 맞지 않는 DLC / ID 마스크.
+    Classic 프레임은 DLC 0~8, FD 프레임은 DLC 0~15 (원격 프레임 불가),
+    표준 ID는 0x7FF, 확장 ID는 0x1FFFFFFF 이하가 유효함.
+    :return: dlc_out_of_range, fd_frames, extended_frames, invalid_ids 키를 가진 bool 배열 딕셔너리
+    """
+    flags = frame_flags(df)
+    dlc = df["DLC"].to_numpy()
+    can_ids = df["CAN_ID"].to_numpy()
+    is_fd = (flags & FLAG_FD) != 0
+    is_extended = (flags & FLAG_EXTENDED) != 0
+    return {
+        "dlc_out_of_range": np.where(is_fd, (dlc > 15) | ((flags & FLAG_REMOTE) != 0), dlc > 8),
+        "fd_frames": is_fd,
+        "extended_frames": is_extended,
+        "invalid_ids": can_ids > np.where(is_extended, MAX_EXTENDED_ID, MAX_STANDARD_ID),
+    }
+
+
+def _frame_type_counts(df):
+    """
+    프레임 종류별 개수와 종류에 맞지 않는 DLC / ID 개수 (_frame_type_masks의 개수).
+    :return: dlc_out_of_range, fd_frames, extended_frames, invalid_ids 키를 가진 딕셔너리
+    """
+    return {key: int(np.count_nonzero(mask)) for key, mask in _frame_type_masks(df).items()}
+
+
+def _format_quality_report(total_messages, unique_ids, short_intervals, out_of_range_dlc,
+                           fd_frames=0, extended_frames=0, invalid_ids=0):
+    """
+    품질 평가 수치를 보고서 문자열로 변환.
+    FD / 확장 ID 프레임 수와 잘못된 ID 수는 0이 아닐 때만 표시함.
+    """
+    report = [f"Total Messages: {total_messages}", f"Unique CAN IDs: {unique_ids}",
+              f"Messages with short intervals (<0.01s): {short_intervals}",
+              f"Messages with out-of-range DLC (>8 classic, >15 FD): {out_of_range_dlc}"]
+    if fd_frames:
+        report.append(f"CAN FD frames: {fd_frames}")
+    if extended_frames:
+        report.append(f"Extended (29-bit) ID frames: {extended_frames}")
+    if invalid_ids:
+        report.append(f"Messages with invalid CAN ID for their ID type: {invalid_ids}")
+
+    # 판단
+    if short_intervals / total_messages > 0.1:
+        report.append("Warning: High frequency of short intervals.")
+    if out_of_range_dlc > 0:
+        report.append("Warning: Out-of-range DLC values detected.")
+    if invalid_ids > 0:
+        report.append("Warning: CAN IDs outside the 11/29-bit range detected.")
+
+    return "\n".join(report)
+
+
 def evaluate_data_quality(data):
     """
     CAN 데이터의 품질 평가.
@@ -55,20 +126,10 @@ def evaluate_data_quality(data):
         total_messages = len(data)
         unique_ids = len(data["CAN_ID"].unique())
         short_intervals = data["Timestamp"].diff().dropna().lt(0.01).sum()  # 0.01초 이하의 간격
-        out_of_range_dlc = data["DLC"].gt(8).sum()  # DLC > 8
-
-        # 결과 계산
-        report = [f"Total Messages: {total_messages}", f"Unique CAN IDs: {unique_ids}",
-                  f"Messages with short intervals (<0.01s): {short_intervals}",
-                  f"Messages with out-of-range DLC (>8): {out_of_range_dlc}"]
+        counts = _frame_type_counts(data)  # 프레임 종류별 DLC / ID 범위
 
-        # 판단
-        if short_intervals / total_messages > 0.1:
-            report.append("Warning: High frequency of short intervals.")
-        if out_of_range_dlc > 0:
-            report.append("Warning: Out-of-range DLC values detected.")
-
-        return "\n".join(report)
+        return _format_quality_report(total_messages, unique_ids, short_intervals, counts["dlc_out_of_range"],
+                                      counts["fd_frames"], counts["extended_frames"], counts["invalid_ids"])
 
     except Exception as e:
         return f"Failed to evaluate data quality: {e}"
@@ -90,30 +151,440 @@ def calculate_time_interval_statistics(data):
     return stats
 
 
-def generate_diagnostics(data):
+def generate_diagnostics(data, rules=None):
     """
     Generate diagnostic insights from CAN data.
     :param data: DataFrame of CAN log data.
-    :return: Diagnostic results as a list of strings.
+    :param rules: Rule dictionaries (diagnostic_rules.load_rules). None uses DEFAULT_RULES.
+    :return: Diagnostic results as a list of strings (one line per rule finding).
+    """
+    from src.diagnostic_rules import evaluate_rules, format_findings
+
+    return format_findings(evaluate_rules(data, rules))
+
+
+def sort_by_can_id(data):
+    """
+    프레임을 CAN ID별, ID 내에서는 시간 순으로 정렬하는 인덱스를 계산.
+    타임스탬프가 이미 정렬된 경우(일반적인 로그) ID 코드에 대한 안정 정렬만 수행하며,
+    고유 ID가 65536개 이하이면 numpy의 기수 정렬이 사용됨.
+    :param data: CAN 로그 데이터프레임
+    :return: (정렬 인덱스, 고유 CAN ID 배열(오름차순), ID별 프레임 수)
+    """
+    timestamps = data["Timestamp"].to_numpy(dtype=np.float64)
+    codes, can_ids = pd.factorize(data["CAN_ID"].to_numpy(), sort=True)
+    if len(can_ids) <= np.iinfo(np.uint16).max + 1:
+        codes = codes.astype(np.uint16)
+
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        order = np.argsort(codes, kind="stable")
+    else:
+        order = np.lexsort((timestamps, codes))
+    return order, can_ids, np.bincount(codes, minlength=len(can_ids))
+
+
+def _grouped_quantile(values, starts, counts, q):
+    """
+    그룹별 분위수 (선형 보간, np.quantile 기본 방식과 동일).
+    values는 그룹별로 연속 구간에 모여 있어야 하며, 구간마다 필요한 순위만 np.partition으로 선택함 (O(n)).
+    """
+    result = np.full(len(counts), np.nan)
+    for group in np.flatnonzero(counts):
+        segment = values[starts[group]:starts[group] + counts[group]]
+        position = q * (len(segment) - 1)
+        lower, upper = int(np.floor(position)), int(np.ceil(position))
+        selected = np.partition(segment, [lower, upper])
+        fraction = position - lower
+        result[group] = selected[lower] * (1 - fraction) + selected[upper] * fraction
+    return result
+
+
+def _segment_sum(values, starts, counts):
+    """
+    연속 구간별 합계 (빈 구간은 0).
+    """
+    result = np.zeros(len(counts), dtype=np.float64)
+    has = counts > 0
+    if has.any():
+        result[has] = np.add.reduceat(values, starts[has])
+    return result
+
+
+def calculate_cycle_time_statistics(data, expected_periods=None, late_tolerance=0.2):
+    """
+    CAN ID별 주기(cycle time) 통계를 계산.
+    ID별로 정렬한 뒤 한 번의 diff로 같은 ID 안의 수신 간격을 구하고, 구간 합계로 그룹 집계함.
+    :param data: CAN 로그 데이터프레임
+    :param expected_periods: {CAN ID: 기대 주기(초)} (옵션, 없으면 ID별 간격의 중앙값 사용)
+    :param late_tolerance: 기대 주기 대비 허용 지연 비율 (0.2 → 1.2배 초과 시 지연)
+    :return: CAN_ID 인덱스의 DataFrame
+             (Count, Expected Period, Mean Interval, Std Interval, P99 Jitter, Late Frames, Missed Frames)
+    """
+    order, can_ids, frame_counts = sort_by_can_id(data)
+    timestamps = data["Timestamp"].to_numpy(dtype=np.float64)[order]
+
+    # 같은 ID 안에서의 간격만 사용 (ID 순으로 정렬되어 있으므로 그룹별로 연속 구간을 이룸)
+    same_id = np.ones(max(len(timestamps) - 1, 0), dtype=bool)
+    same_id[np.cumsum(frame_counts)[:-1] - 1] = False
+    intervals = np.diff(timestamps)[same_id]
+
+    # 각 ID는 최소 1개 프레임을 가지므로 간격 수 = 프레임 수 - 1
+    counts = frame_counts - 1
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = _segment_sum(intervals, starts, counts) / counts
+        deviation = _segment_sum(np.square(intervals - np.repeat(mean, counts)), starts, counts)
+        std = np.where(counts > 1, np.sqrt(deviation / (counts - 1)), np.nan)
+
+    expected = _grouped_quantile(intervals, starts, counts, 0.5)
+    if expected_periods:
+        overrides = pd.Series({parse_can_id(can_id): period for can_id, period in expected_periods.items()})
+        overrides = overrides.reindex(can_ids).to_numpy(dtype=np.float64)
+        expected = np.where(np.isnan(overrides), expected, overrides)
+    expected_per_interval = np.repeat(expected, counts)
+
+    jitter = np.abs(intervals - expected_per_interval)
+    p99_jitter = _grouped_quantile(jitter, starts, counts, 0.99)
+
+    # 기대 주기의 n배 간격 → (n - 1)개 프레임 누락, 누락 없이 허용 범위를 넘으면 지연
+    # 같은 타임스탬프가 반복되어 기대 주기가 0인 ID는 주기를 알 수 없으므로 누락/지연을 세지 않음
+    has_period = expected_per_interval > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        periods = np.where(has_period, np.rint(intervals / expected_per_interval), 1)
+    missed = np.maximum(periods - 1, 0)
+    late = has_period & (periods < 2) & (intervals > expected_per_interval * (1 + late_tolerance))
+
+    result = pd.DataFrame({
+        "Count": frame_counts,
+        "Expected Period": expected,
+        "Mean Interval": mean,
+        "Std Interval": std,
+        "P99 Jitter": p99_jitter,
+        "Late Frames": _segment_sum(late.astype(np.float64), starts, counts).astype(np.int64),
+        "Missed Frames": _segment_sum(missed, starts, counts).astype(np.int64),
+    }, index=pd.Index(can_ids, name="CAN_ID"))
+    return result
+
+
+# 단일 패스 분석 엔진에서 한 번에 처리하는 기본 행 수
+# (병렬 분석의 샤드 경계도 이 단위로 맞추므로, 작은 로그도 여러 프로세스에 나뉘도록 너무 크지 않게 둠)
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# 시간 간격 히스토그램의 빈 개수 (2의 거듭제곱이어야 병합 시 빈 경계가 정확히 맞음)
+INTERVAL_HISTOGRAM_BINS = 1024
+
+# 시간 간격 그래프에 사용하는 빈 개수
+INTERVAL_PLOT_BINS = 64
+
+# 간격이 모두 0일 때 사용하는 히스토그램 상한 지수 (2^-30초 ≈ 1ns)
+_MIN_HISTOGRAM_EXPONENT = -30
+
+
+def _histogram_exponent(max_value):
+    """
+    max_value 보다 큰 가장 작은 2의 거듭제곱 지수를 반환.
+    """
+    if max_value <= 0:
+        return _MIN_HISTOGRAM_EXPONENT
+    mantissa, exponent = np.frexp(max_value)
+    return max(int(exponent), _MIN_HISTOGRAM_EXPONENT)
+
+
+def _interval_histogram(intervals, exponent):
+    """
+    [0, 2^exponent) 범위를 INTERVAL_HISTOGRAM_BINS 개의 빈으로 나눈 히스토그램.
+    빈 폭이 2의 거듭제곱이므로 나눗셈이 정확하고, 범위를 두 배로 늘려도 같은 빈에 속함.
+    음수 간격(타임스탬프 역전)은 첫 번째 빈에 포함됨.
+    """
+    width = np.ldexp(1.0, exponent) / INTERVAL_HISTOGRAM_BINS
+    bins = np.floor(np.clip(intervals, 0, None) / width).astype(np.int64)
+    return np.bincount(np.minimum(bins, INTERVAL_HISTOGRAM_BINS - 1), minlength=INTERVAL_HISTOGRAM_BINS)
+
+
+def _rescale_histogram(counts, exponent, target_exponent):
+    """
+    히스토그램 범위를 2^target_exponent 로 넓혀서 빈을 다시 합침.
+    """
+    factor = 1 << min(target_exponent - exponent, int(np.log2(INTERVAL_HISTOGRAM_BINS)))
+    merged = counts.reshape(-1, factor).sum(axis=1)
+    return np.concatenate([merged, np.zeros(INTERVAL_HISTOGRAM_BINS - len(merged), dtype=np.int64)])
+
+
+def _summarize_intervals(intervals):
+    """
+    시간 간격 배열의 병합 가능한 부분 통계 (개수, 최소/최대, 평균, 편차 제곱합, 짧은 간격 수, 히스토그램).
+    """
+    if len(intervals) == 0:
+        return {"count": 0, "min": np.inf, "max": -np.inf, "mean": 0.0, "m2": 0.0, "short": 0,
+                "hist_exponent": _MIN_HISTOGRAM_EXPONENT,
+                "hist_counts": np.zeros(INTERVAL_HISTOGRAM_BINS, dtype=np.int64)}
+    mean = intervals.mean()
+    max_value = intervals.max()
+    exponent = _histogram_exponent(max_value)
+    return {
+        "count": len(intervals),
+        "min": intervals.min(),
+        "max": max_value,
+        "mean": mean,
+        "m2": np.square(intervals - mean).sum(),
+        "short": int(np.count_nonzero(intervals < 0.01)),  # 0.01초 이하의 간격
+        "hist_exponent": exponent,
+        "hist_counts": _interval_histogram(intervals, exponent),
+    }
+
+
+def _merge_interval_summaries(left, right):
+    """
+    두 구간의 시간 간격 통계를 병합 (평균/분산은 Chan 병렬 알고리즘).
+    """
+    if left["count"] == 0:
+        return right
+    if right["count"] == 0:
+        return left
+    count = left["count"] + right["count"]
+    delta = right["mean"] - left["mean"]
+    exponent = max(left["hist_exponent"], right["hist_exponent"])
+    return {
+        "count": count,
+        "min": min(left["min"], right["min"]),
+        "max": max(left["max"], right["max"]),
+        "mean": left["mean"] + delta * right["count"] / count,
+        "m2": left["m2"] + right["m2"] + delta * delta * left["count"] * right["count"] / count,
+        "short": left["short"] + right["short"],
+        "hist_exponent": exponent,
+        "hist_counts": (_rescale_histogram(left["hist_counts"], left["hist_exponent"], exponent)
+                        + _rescale_histogram(right["hist_counts"], right["hist_exponent"], exponent)),
+    }
+
+
+def summarize_block(df, rules=None):
+    """
+    프레임 블록 하나를 한 번 훑어서 병합 가능한 부분 집계를 계산.
+    :param df: CAN 로그 데이터프레임 (블록)
+    :param rules: 진단 규칙 (diagnostic_rules.compile_rules 결과, None이면 DEFAULT_RULES)
+    :return: 부분 집계 딕셔너리
+    """
+    from src.diagnostic_rules import DEFAULT_RULES, compile_rules, evaluate_rule_block
+
+    timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+    dlc = df["DLC"].to_numpy()
+    return {
+        "rows": len(df),
+        "id_counts": df["CAN_ID"].value_counts(sort=False),
+        "dlc_sum": int(dlc.sum(dtype=np.int64)),
+        "dlc_min": int(dlc.min()) if len(dlc) else np.iinfo(np.int64).max,
+        **_frame_type_counts(df),
+        "first_timestamp": timestamps[0] if len(timestamps) else None,
+        "last_timestamp": timestamps[-1] if len(timestamps) else None,
+        "intervals": _summarize_intervals(np.diff(timestamps)),
+        "rules": evaluate_rule_block(df, compile_rules(DEFAULT_RULES) if rules is None else rules),
+    }
+
+
+def _merge_id_counts(left, right):
     """
-    diagnostics = []
+    ID별 프레임 수를 병합. 처음 나타난 순서를 유지하므로 빈도가 같은 ID의 순서가 블록 분할과 무관함.
+    """
+    index = left.index.append(right.index.difference(left.index, sort=False))
+    return left.reindex(index, fill_value=0) + right.reindex(index, fill_value=0)
 
-    # 1. 빈도 분석
-    freq = data["CAN_ID"].value_counts()
-    for can_id, count in freq.items():
-        if count > 3:  # 임계값 설정
-            diagnostics.append(f"CAN ID {can_id} appears {count} times, which is unusually high.")
 
-    # 2. DLC 값 이상 탐지
-    if (data["DLC"] < 2).any():
-        diagnostics.append("Some DLC values are below 2, which might indicate data corruption.")
+def merge_summaries(left, right):
+    """
+    시간 순으로 이어지는 두 블록의 부분 집계를 병합.
+    블록 경계를 가로지르는 간격 (right 첫 타임스탬프 - left 마지막 타임스탬프)도 포함함.
+    """
+    from src.diagnostic_rules import merge_rule_states
+
+    if left["rows"] == 0:
+        return right
+    if right["rows"] == 0:
+        return left
+
+    boundary = _summarize_intervals(np.array([right["first_timestamp"] - left["last_timestamp"]]))
+    intervals = _merge_interval_summaries(_merge_interval_summaries(left["intervals"], boundary), right["intervals"])
+    return {
+        "rows": left["rows"] + right["rows"],
+        "id_counts": _merge_id_counts(left["id_counts"], right["id_counts"]),
+        "dlc_sum": left["dlc_sum"] + right["dlc_sum"],
+        "dlc_min": min(left["dlc_min"], right["dlc_min"]),
+        **{key: left[key] + right[key] for key in ["dlc_out_of_range", "fd_frames", "extended_frames", "invalid_ids"]},
+        "first_timestamp": left["first_timestamp"],
+        "last_timestamp": right["last_timestamp"],
+        "intervals": intervals,
+        "rules": merge_rule_states(left["rules"], right["rules"]),
+    }
 
-    # 3. 시간 간격 이상
-    time_intervals = data["Timestamp"].diff().dropna()
-    if time_intervals.max() > 0.2:  # 임계값 설정
-        diagnostics.append("Large time gaps detected between messages, which could indicate a communication issue.")
 
-    return diagnostics
+def finalize_summary(summary):
+    """
+    병합된 부분 집계로부터 최종 분석 결과를 생성.
+    :param summary: summarize_block / merge_summaries 결과
+    :return: statistics, frequency, evaluation_report, time_interval_stats,
+             diagnostics, findings, interval_histogram 키를 가진 딕셔너리
+             (findings는 진단 규칙 결과 표, diagnostics는 그 결과의 문자열 목록)
+    """
+    from src.diagnostic_rules import finalize_rule_state, format_findings
+
+    intervals = summary["intervals"]
+    frequency = summary["id_counts"].sort_values(ascending=False, kind="stable")
+    frequency.index.name = "CAN_ID"
+    frequency.name = "count"
+
+    rows = summary["rows"]
+    count = intervals["count"]
+    time_interval_stats = {
+        "Min Interval": intervals["min"] if count else np.nan,
+        "Max Interval": intervals["max"] if count else np.nan,
+        "Mean Interval": intervals["mean"] if count else np.nan,
+        "Std Interval": np.sqrt(intervals["m2"] / (count - 1)) if count > 1 else np.nan,
+    }
+
+    # 그래프용으로 INTERVAL_PLOT_BINS 개의 빈으로 합치고, 마지막으로 값이 있는 빈까지만 사용
+    width = np.ldexp(1.0, intervals["hist_exponent"]) / INTERVAL_PLOT_BINS
+    counts = intervals["hist_counts"].reshape(INTERVAL_PLOT_BINS, -1).sum(axis=1)
+    used = np.flatnonzero(counts)
+    counts = counts[:used[-1] + 1] if len(used) else counts[:1]
+    edges = np.arange(len(counts) + 1) * width
+    findings = finalize_rule_state(summary["rules"])
+
+    return {
+        "statistics": {
+            "Total Messages": rows,
+            "Unique CAN IDs": len(frequency),
+            "Average DLC": summary["dlc_sum"] / rows if rows else np.nan,
+        },
+        "frequency": frequency,
+        "evaluation_report": _format_quality_report(
+            rows, len(frequency), intervals["short"], summary["dlc_out_of_range"],
+            summary["fd_frames"], summary["extended_frames"], summary["invalid_ids"]) if rows else "No messages.",
+        "time_interval_stats": time_interval_stats,
+        "diagnostics": format_findings(findings),
+        "findings": findings,
+        "interval_histogram": (counts, edges),
+    }
+
+
+def iter_frame_blocks(df, block_size):
+    """
+    데이터프레임을 block_size 행씩 나눈 뷰를 순서대로 반환.
+    """
+    for start in range(0, len(df), block_size):
+        yield df.iloc[start:start + block_size]
+
+
+def _iter_blocks(data, block_size):
+    if isinstance(data, pd.DataFrame):
+        yield from iter_frame_blocks(data, block_size)
+    else:
+        yield from data
+
+
+def _fold_summaries(partials, rules=None):
+    """
+    블록 부분 집계를 시간 순서대로 왼쪽부터 병합.
+    직렬/병렬 실행 모두 같은 블록을 같은 순서로 병합하므로 결과가 비트 단위로 같음.
+    """
+    summary = None
+    for partial in partials:
+        summary = partial if summary is None else merge_summaries(summary, partial)
+    if summary is None:
+        summary = summarize_block(pd.DataFrame({"Timestamp": [], "CAN_ID": np.empty(0, dtype=np.uint32),
+                                                 "DLC": np.empty(0, dtype=np.uint8)}), rules)
+    return summary
+
+
+def run_analysis(data, block_size=DEFAULT_BLOCK_SIZE, rules=None):
+    """
+    통계, 빈도, 품질 평가, 시간 간격 통계, 진단, 시간 간격 히스토그램을 한 번의 스캔으로 계산.
+    데이터프레임은 block_size 행씩 나누어 처리하고, 청크 이터레이터(iter_can_log_chunks 등)는 청크 단위로 처리함.
+    :param data: CAN 로그 데이터프레임 또는 시간 순서대로 된 청크 이터레이터
+    :param block_size: 데이터프레임을 나눌 블록 크기
+    :param rules: 진단 규칙 딕셔너리 목록 (diagnostic_rules.load_rules 결과, None이면 DEFAULT_RULES)
+    :return: finalize_summary 결과 딕셔너리
+    """
+    from src.diagnostic_rules import DEFAULT_RULES, compile_rules
+
+    compiled = compile_rules(DEFAULT_RULES if rules is None else rules)
+    return finalize_summary(_fold_summaries((summarize_block(block, compiled) for block in _iter_blocks(data, block_size)),
+                                            compiled))
+
+
+def split_time_shards(data, n_shards, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    로그를 시간 구간 기준으로 n_shards 개의 행 범위로 나눔.
+    경계는 블록 크기의 배수로 맞추므로 각 샤드는 직렬 실행과 같은 블록들로 구성됨.
+    타임스탬프가 정렬되어 있지 않으면 행 수 기준으로 나눔.
+    :param data: CAN 로그 데이터프레임
+    :param n_shards: 샤드 수
+    :param block_size: 블록 크기
+    :return: [(시작 행, 끝 행), ...]
+    """
+    rows = len(data)
+    if rows == 0:
+        return []
+    timestamps = data["Timestamp"].to_numpy(dtype=np.float64)
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        edges = np.linspace(timestamps[0], timestamps[-1], n_shards + 1)[1:-1]
+        cuts = np.searchsorted(timestamps, edges)
+    else:
+        cuts = np.linspace(0, rows, n_shards + 1)[1:-1]
+    cuts = np.rint(np.asarray(cuts) / block_size).astype(np.int64) * block_size
+    bounds = np.unique(np.clip(np.concatenate([[0], cuts, [rows]]), 0, rows))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _summarize_shard(source, start, stop, block_size, rules=None):
+    """
+    샤드 하나의 블록별 부분 집계를 계산 (프로세스 풀 작업 함수).
+    source가 로그 파일 경로이면 캐시를 메모리 맵으로 읽어 복사 없이 해당 행 범위만 사용함.
+    """
+    if isinstance(source, str):
+        from src.log_cache import load_cached_log
+
+        df = load_cached_log(source)
+        if df is None:
+            raise RuntimeError(f"로그 캐시를 읽을 수 없습니다: {source}")
+    else:
+        df, start, stop = source, 0, stop - start
+    return [summarize_block(df.iloc[offset:min(offset + block_size, stop)], rules)
+            for offset in range(start, stop, block_size)]
+
+
+def run_analysis_parallel(data, workers=None, block_size=DEFAULT_BLOCK_SIZE, file_path=None, rules=None):
+    """
+    run_analysis의 병렬 버전. 로그를 시간 샤드로 나눠 프로세스 풀에서 블록별 부분 집계를 계산한 뒤
+    샤드 경계의 간격까지 포함해 순서대로 병합하므로 같은 block_size의 run_analysis(data)와 결과가 비트 단위로 같음
+    (샤드 경계는 블록 단위이므로 workers개 블록보다 작은 로그는 일부 프로세스만 일함).
+    :param data: CAN 로그 데이터프레임
+    :param workers: 프로세스 수 (None이면 CPU 코어 수)
+    :param block_size: 블록 크기 (직렬 실행과 같은 값이어야 결과가 같음)
+    :param file_path: 캐시가 있는 원본 로그 경로 (주면 각 프로세스가 캐시를 메모리 맵으로 읽어 데이터 전송을 생략.
+                      캐시가 없거나 data와 행 수가 다르면 데이터 조각을 직접 전달)
+    :param rules: 진단 규칙 딕셔너리 목록 (None이면 DEFAULT_RULES)
+    :return: finalize_summary 결과 딕셔너리
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from src.diagnostic_rules import DEFAULT_RULES, compile_rules
+
+    from src.log_cache import load_cached_log
+
+    compiled = compile_rules(DEFAULT_RULES if rules is None else rules)
+    workers = workers or os.cpu_count() or 1
+    if file_path is not None:
+        # 캐시 저장이 실패한 경우 (읽기 전용 디렉토리, 디스크 부족 등) 작업 프로세스가 캐시를 읽지 못하므로 미리 확인
+        cached = load_cached_log(file_path)
+        if cached is None or len(cached) != len(data):
+            file_path = None
+    shards = split_time_shards(data, workers, block_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_summarize_shard, file_path if file_path else data.iloc[start:stop], start, stop,
+                            block_size, compiled)
+            for start, stop in shards
+        ]
+        partials = [partial for future in futures for partial in future.result()]
+    return finalize_summary(_fold_summaries(partials, compiled))
 
 
 # 테스트 실행
@@ -150,3 +621,17 @@ if __name__ == "__main__":
     filtered_data = filter_by_time_range(data, 0.001, 0.002)
     print("Filtered Data by Time Range (0.001 to 0.002):")
     print(filtered_data)
+
+    # 단일 패스 분석 엔진
+    analysis = run_analysis(data)
+    print("Single-pass Analysis:")
+    print(analysis["statistics"])
+    print(analysis["time_interval_stats"])
+
+    # 같은 타임스탬프가 반복되는 ID (기대 주기 0)의 주기 통계
+    repeated = pd.DataFrame({"Timestamp": [0.0, 0.0, 0.0, 0.1, 0.2, 0.3, 0.5],
+                             "CAN_ID": np.array([1, 1, 1, 2, 2, 2, 2], dtype=np.uint32),
+                             "DLC": np.full(7, 8, dtype=np.uint8)})
+    cycle_times = calculate_cycle_time_statistics(repeated)
+    print("Cycle Time Statistics with repeated timestamps:")
+    print(cycle_times)
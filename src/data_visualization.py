@@ -1,66 +1,425 @@
 import os
 import sys
 
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from src.can_parser import format_can_id
+
+# 이 점 수를 넘는 산점도는 점마다 경로를 만드는 scatter 대신 픽셀 마커로 그리고 래스터 이미지로 저장
+# (그리는 시간과 파일 크기가 점 수에 거의 비례하지 않도록)
+RASTERIZE_THRESHOLD = 10_000
+
+# 선 그래프에 점 마커를 함께 그리는 최대 점 수
+MARKER_LIMIT = 200
+
+# 정상 점이 이보다 많으면 이상 탐지 그래프를 2D 히스토그램(밀도)으로 그림
+DENSITY_THRESHOLD = 200_000
+
+# 밀도 그래프의 (시간, 값) 축 빈 수
+DENSITY_BINS = (800, 200)
+
+# 밀도 그래프 위에 점으로 겹쳐 그리는 최대 이상치 수 (넘으면 균등 간격으로 추림)
+ANOMALY_OVERLAY_LIMIT = 20_000
+
+# 시간 축 빈도 그래프의 최대 구간 수 (넘으면 구간 폭을 1/2/5 × 10^k 초 단위로 넓힘)
+MAX_TIME_BINS = 2000
+
+# 빈도 막대 그래프의 최대 막대 수 (넘으면 빈도가 낮은 ID를 "Other" 막대 하나로 합침)
+MAX_FREQUENCY_BARS = 50
+
+# 빈 번호 계산을 나눠서 하는 행 수 (중간 배열 메모리를 로그 길이와 무관하게 유지)
+_BIN_CHUNK = 1 << 22
+
+
+def _nice_width(width):
+    """
+    width 이상인 가장 작은 1/2/5 × 10^k 값.
+    """
+    scale = 10.0 ** np.floor(np.log10(width))
+    for step in (1, 2, 5, 10):
+        if step * scale >= width * (1 - 1e-9):
+            return step * scale
+    return 10 * scale
+
+
+def _uniform_edges(values, bins):
+    """
+    값 축의 균등 빈 경계. 정수 값이고 범위가 bins보다 좁으면 정수마다 한 빈 (DLC 등).
+    """
+    finite = values[np.isfinite(values)]
+    low, high = (float(finite.min()), float(finite.max())) if len(finite) else (0.0, 0.0)
+    if high - low < bins and np.all(np.mod(values[:_BIN_CHUNK], 1) == 0):
+        return np.arange(low - 0.5, high + 1.5)
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def _bin_counts_2d(x, y, x_edges, y_edges, weights=None):
+    """
+    균등 빈 경계에 대한 2D 히스토그램을 청크 단위 bincount로 계산 (np.histogram2d보다 빠르고 메모리가 일정함).
+    :param weights: 점별 개수 (옵션, 미리 묶어 둔 점)
+    :return: (len(x_edges) - 1, len(y_edges) - 1) int64 빈도 행렬
+    """
+    nx, ny = len(x_edges) - 1, len(y_edges) - 1
+    dx, dy = (x_edges[-1] - x_edges[0]) / nx, (y_edges[-1] - y_edges[0]) / ny
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    for start in range(0, len(x), _BIN_CHUNK):
+        xs, ys = x[start:start + _BIN_CHUNK], y[start:start + _BIN_CHUNK]
+        valid = ~np.isnan(ys)
+        ix = np.clip(((xs[valid] - x_edges[0]) / dx).astype(np.int64), 0, nx - 1)
+        iy = np.clip(((ys[valid] - y_edges[0]) / dy).astype(np.int64), 0, ny - 1)
+        if weights is None:
+            counts += np.bincount(ix * ny + iy, minlength=nx * ny)
+        else:
+            counts += np.bincount(ix * ny + iy, weights=weights[start:start + _BIN_CHUNK][valid],
+                                  minlength=nx * ny).astype(np.int64)
+    return counts.reshape(nx, ny)
+
+
+def frequency_plot_data(freq_data, max_bars=MAX_FREQUENCY_BARS):
+    """
+    메시지 빈도 Series를 막대 그래프용 (라벨, 값) 배열로 변환.
+    ID가 max_bars개를 넘으면 (퍼징 등) 빈도 상위 max_bars - 1개만 그리고 나머지는 "Other" 막대로 합침.
+    """
+    if len(freq_data) > max_bars:
+        freq_data = freq_data.sort_values(ascending=False, kind="stable")
+        rest = freq_data.iloc[max_bars - 1:]
+        return {
+            "labels": [format_can_id(can_id) for can_id in freq_data.index[:max_bars - 1]] + [f"Other ({len(rest)} IDs)"],
+            "counts": np.append(freq_data.to_numpy()[:max_bars - 1], rest.sum()),
+        }
+    return {
+        "labels": [format_can_id(can_id) for can_id in freq_data.index],
+        "counts": freq_data.to_numpy(),
+    }
+
+
+def time_series_plot_data(df, decimals=2, max_bins=MAX_TIME_BINS):
+    """
+    타임스탬프를 10^-decimals 초 단위로 묶은 시간 구간별 메시지 수 (원본 데이터프레임은 변경하지 않음).
+    로그가 길어 구간이 max_bins개를 넘으면 구간 폭을 넓혀서 점 수를 제한함.
+    :return: bins (구간 중심 시각, 메시지가 있는 구간만), counts, width (구간 폭) 딕셔너리
+    """
+    timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+    width = 10.0 ** -decimals
+    if len(timestamps) == 0:
+        return {"bins": np.empty(0), "counts": np.empty(0, dtype=np.int64), "width": width}
+    first, last = float(timestamps.min()), float(timestamps.max())
+    if (last - first) / width > max_bins:
+        width = _nice_width((last - first) / max_bins)
+
+    # 각 타임스탬프를 가장 가까운 width 배수로 반올림한 구간에 넣음
+    offset = np.round(first / width)
+    counts = np.zeros(int(np.round(last / width) - offset) + 1, dtype=np.int64)
+    for start in range(0, len(timestamps), _BIN_CHUNK):
+        bins = (np.round(timestamps[start:start + _BIN_CHUNK] / width) - offset).astype(np.int64)
+        counts += np.bincount(bins, minlength=len(counts))
+    used = np.flatnonzero(counts)
+    return {"bins": (used + offset) * width, "counts": counts[used], "width": width}
+
+
+def anomaly_plot_data(df, value_column="DLC", density_threshold=DENSITY_THRESHOLD):
+    """
+    이상 탐지 결과에서 그래프에 필요한 컬럼만 정상 / 이상 배열로 분리.
+    정상 점이 density_threshold개를 넘으면 정상 점은 (시간, 값) 2D 히스토그램으로 미리 집계하고,
+    이상치는 최대 ANOMALY_OVERLAY_LIMIT개의 점으로 겹쳐 그림 (그래프 크기와 그리는 시간이 로그 길이와 무관).
+    """
+    anomaly = df["Anomaly"].to_numpy() == -1
+    timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+    values = df[value_column].to_numpy(dtype=np.float64)
+    normal = ~anomaly
+    if np.count_nonzero(normal) <= density_threshold:
+        return {
+            "normal": (timestamps[normal], values[normal]),
+            "anomalies": (timestamps[anomaly], values[anomaly]),
+            "value_column": value_column,
+        }
+
+    return _anomaly_density(timestamps[normal], values[normal], timestamps[anomaly], values[anomaly], value_column)
+
+
+def _anomaly_density(normal_times, normal_values, anomaly_times, anomaly_values, value_column, weights=None):
+    """
+    정상 점은 (시간, 값) 2D 히스토그램으로, 이상치는 최대 ANOMALY_OVERLAY_LIMIT개의 점으로 만든 밀도 그래프 데이터.
+    :param weights: 정상 점별 개수 (옵션, 미리 묶어 둔 점)
+    """
+    anomaly_rows = np.arange(len(anomaly_times))
+    if len(anomaly_rows) > ANOMALY_OVERLAY_LIMIT:
+        anomaly_rows = anomaly_rows[np.linspace(0, len(anomaly_rows) - 1, ANOMALY_OVERLAY_LIMIT).astype(np.int64)]
+    timestamps = np.concatenate([normal_times, anomaly_times])
+    x_edges = np.linspace(timestamps.min(), timestamps.max(), DENSITY_BINS[0] + 1)
+    if x_edges[-1] == x_edges[0]:
+        x_edges = x_edges[0] + np.linspace(-0.5, 0.5, DENSITY_BINS[0] + 1)
+    y_edges = _uniform_edges(np.concatenate([normal_values, anomaly_values]), DENSITY_BINS[1])
+    return {
+        "density": (_bin_counts_2d(normal_times, normal_values, x_edges, y_edges, weights), x_edges, y_edges),
+        "anomalies": (anomaly_times[anomaly_rows], anomaly_values[anomaly_rows]),
+        "anomaly_count": len(anomaly_times),
+        "value_column": value_column,
+    }
+
+
+def normal_point_counts(chunk, labels, value_column="DLC", bins=DENSITY_BINS[0]):
+    """
+    청크 하나의 정상 점을 (시간 구간 중심, 값)별 개수로 줄임 (anomaly_plot_data_from_chunks 입력).
+    청크의 시간 범위를 bins개 구간으로 나누므로 결과 크기는 청크 크기와 무관함.
+    :param chunk: CAN 로그 청크
+    :param labels: 청크의 Anomaly 값 배열 (정상 1 / 이상 -1)
+    :return: (시각, 값, 개수) 배열 튜플
+    """
+    normal = labels != -1
+    timestamps = chunk["Timestamp"].to_numpy(dtype=np.float64)[normal]
+    values = chunk[value_column].to_numpy(dtype=np.float64)[normal]
+    if len(timestamps) == 0:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+    low = timestamps.min()
+    width = (timestamps.max() - low) / bins or 1.0
+    centers = low + (np.minimum(((timestamps - low) / width).astype(np.int64), bins - 1) + 0.5) * width
+    points, counts = np.unique(np.stack([centers, values]), axis=1, return_counts=True)
+    return points[0], points[1], counts
+
+
+def anomaly_plot_data_from_chunks(normal_points, anomalies, value_column="DLC"):
+    """
+    청크별 정상 점 요약 (normal_point_counts 결과 목록)과 이상 행으로 anomaly_plot_data와 같은 형식의 밀도 그래프 데이터를 만듦.
+    전체 프레임 없이 그리므로 out-of-core 이상 탐지에 사용함.
+    """
+    anomaly_times = anomalies["Timestamp"].to_numpy(dtype=np.float64)
+    anomaly_values = anomalies[value_column].to_numpy(dtype=np.float64)
+    normal_times, normal_values, counts = (np.concatenate([points[i] for points in normal_points] + [np.empty(0)])
+                                           for i in range(3))
+    if len(normal_times) + len(anomaly_times) == 0:
+        return {"normal": (np.empty(0), np.empty(0)), "anomalies": (anomaly_times, anomaly_values),
+                "value_column": value_column}
+    return _anomaly_density(normal_times, normal_values, anomaly_times, anomaly_values, value_column, weights=counts)
+
+
+def interval_plot_data(data, histogram=None):
+    """
+    메시지 간 시간 간격 히스토그램 (빈도, 빈 경계). run_analysis의 히스토그램이 있으면 그대로 사용.
+    """
+    if histogram is not None:
+        return {"counts": histogram[0], "edges": histogram[1]}
+    counts, edges = np.histogram(np.diff(data["Timestamp"].to_numpy(dtype=np.float64)), bins=50)
+    return {"counts": counts, "edges": edges}
+
+
+def _m4_reduce(timestamps, values, bins=MAX_TIME_BINS):
+    """
+    시간 순 시계열을 시간 축 bins개 균등 구간으로 나눠 구간마다 첫/마지막/최소/최대 샘플만 남김 (M4 축약).
+    구간 폭이 픽셀 열 이하이면 선 그래프의 열마다 그려지는 세로 범위와 열 사이 연결선이 원본과 같음.
+    :return: 시간 순 (timestamps, values). 샘플이 4 × bins개 이하이면 그대로 반환
+    """
+    if len(timestamps) <= 4 * bins:
+        return timestamps, values
+    low = timestamps[0]
+    width = (timestamps[-1] - low) / bins or 1.0
+    groups = np.minimum(((timestamps - low) / width).astype(np.int64), bins - 1)
+    starts = np.flatnonzero(np.concatenate([[True], groups[1:] != groups[:-1]]))
+    ends = np.concatenate([starts[1:], [len(groups)]])
+
+    # 구간별 최소/최대 값을 가진 첫 샘플 (NaN은 무시)
+    keep = [starts, ends - 1]
+    lengths = ends - starts
+    for reduce in (np.fmin, np.fmax):
+        extreme = np.repeat(reduce.reduceat(values, starts), lengths)
+        hits = np.flatnonzero(values == extreme)
+        keep.append(hits[np.unique(groups[hits], return_index=True)[1]])
+    keep = np.unique(np.concatenate(keep))
+    return timestamps[keep], values[keep]
+
+
+def signal_plot_data(decoded, max_signals=6, max_bins=MAX_TIME_BINS):
+    """
+    디코딩된 시그널에서 그래프에 그릴 최대 max_signals개의 (라벨, 시각, 값) 목록.
+    시그널마다 시간 축 max_bins개 구간의 M4 축약 (_m4_reduce)을 거치므로 점 수가 로그 길이와 무관함.
+    """
+    series = [(f"{name}.{column}", signals["Timestamp"].to_numpy(), signals[column].to_numpy())
+              for name, signals in decoded.items()
+              for column in signals.columns if column not in ("Timestamp", "CAN_ID")][:max_signals]
+    return {"series": [(label, *_m4_reduce(timestamps, values, max_bins)) for label, timestamps, values in series]}
+
+
+def _new_figure(figsize=None, interactive=False):
+    """
+    화면 표시용이면 pyplot이 관리하는 figure를, 아니면 pyplot 전역 상태와 무관한 Figure를 생성.
+    """
+    if interactive:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    return Figure(figsize=figsize)
+
+
+def _scatter(ax, x, y, color=None, **kwargs):
+    if len(x) > RASTERIZE_THRESHOLD:
+        ax.plot(x, y, ",", linestyle="none", color=color, rasterized=True, **kwargs)
+    else:
+        ax.scatter(x, y, color=color, **kwargs)
+
+
+def _frequency_figure(data, interactive=False):
+    fig = _new_figure(interactive=interactive)
+    ax = fig.subplots()
+    ax.bar(data["labels"], data["counts"])
+    ax.tick_params(axis="x", labelrotation=90)
+    ax.set_title("Message Frequency by CAN ID")
+    ax.set_xlabel("CAN ID")
+    ax.set_ylabel("Frequency")
+    return fig
+
+
+def _time_series_figure(data, interactive=False):
+    fig = _new_figure((10, 6), interactive)
+    ax = fig.subplots()
+    ax.plot(data["bins"], data["counts"], marker="o" if len(data["bins"]) <= MARKER_LIMIT else None)
+    ax.set_title("Message Frequency Over Time")
+    ax.set_xlabel("Timestamp (seconds)")
+    ax.set_ylabel(f"Frequency (per {data['width']:g} s)")
+    ax.grid(True)
+    return fig
+
+
+def _anomalies_figure(data, interactive=False):
+    fig = _new_figure(interactive=interactive)
+    ax = fig.subplots()
+    if "density" in data:
+        counts, x_edges, y_edges = data["density"]
+        image = ax.imshow(np.ma.masked_equal(counts.T, 0), origin="lower", aspect="auto", cmap="Blues",
+                          norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)), interpolation="nearest",
+                          extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+        fig.colorbar(image, ax=ax, label="Normal frames per bin")
+        shown = len(data["anomalies"][0])
+        label = "Anomaly" if shown == data["anomaly_count"] else f"Anomaly ({shown} of {data['anomaly_count']})"
+        # 겹쳐 그리는 이상치 수는 ANOMALY_OVERLAY_LIMIT 이하이므로 눈에 보이는 마커로 그림
+        ax.scatter(*data["anomalies"], label=label, color="red", s=6, rasterized=shown > RASTERIZE_THRESHOLD)
+    else:
+        _scatter(ax, *data["normal"], label="Normal", color="C0", alpha=0.7)
+        _scatter(ax, *data["anomalies"], label="Anomaly", color="red", alpha=0.7)
+    ax.set_title("Anomaly Detection Results")
+    ax.set_xlabel("Timestamp")
+    ax.set_ylabel(data["value_column"])
+    # 점이 많으면 loc="best" 위치 계산이 느리므로 고정
+    ax.legend(loc="upper right")
+    return fig
+
+
+def _time_intervals_figure(data, interactive=False):
+    fig = _new_figure((10, 6), interactive)
+    ax = fig.subplots()
+    edges = data["edges"]
+    ax.hist(edges[:-1], bins=edges, weights=data["counts"], alpha=0.7, color="blue")
+    ax.set_title("Message Time Intervals")
+    ax.set_xlabel("Time Interval (seconds)")
+    ax.set_ylabel("Frequency")
+    ax.grid(True)
+    return fig
+
+
+def _signals_figure(data, interactive=False):
+    series = data["series"]
+    fig = _new_figure((10, 2.5 * len(series)), interactive)
+    axes = fig.subplots(len(series), 1, sharex=True, squeeze=False)
+    for ax, (label, timestamps, values) in zip(axes[:, 0], series):
+        ax.plot(timestamps, values, linewidth=0.8)
+        ax.set_ylabel(label)
+        ax.grid(True)
+    axes[0, 0].set_title("Decoded Signals")
+    axes[-1, 0].set_xlabel("Timestamp (seconds)")
+    return fig
+
+
+# 그래프 종류별 (figure 생성 함수, 저장 메시지)
+FIGURE_BUILDERS = {
+    "frequency": (_frequency_figure, "Frequency plot saved as {}"),
+    "time_series": (_time_series_figure, "Time series plot saved as {}"),
+    "anomalies": (_anomalies_figure, "Anomalies plot saved as {}"),
+    "time_intervals": (_time_intervals_figure, "Time interval plot saved as {}"),
+    "signals": (_signals_figure, "Signal plot saved as {}"),
+}
+
+
+def render_figure(kind, data, file_name):
+    """
+    미리 집계된 데이터로 figure를 한 번만 생성해서 파일로 저장 (pyplot을 사용하지 않으므로 화면이 없는 환경과
+    다른 프로세스에서도 안전함).
+    :param kind: FIGURE_BUILDERS의 그래프 종류
+    :param data: *_plot_data 함수의 결과
+    :param file_name: 저장할 파일 이름
+    :return: file_name
+    """
+    fig = FIGURE_BUILDERS[kind][0](data)
+    fig.tight_layout()
+    fig.savefig(file_name)
+    return file_name
+
+
+def render_figures(jobs, workers=1):
+    """
+    서로 독립적인 그래프들을 저장. workers가 2 이상이면 프로세스 풀에서 동시에 그림.
+    :param jobs: (그래프 종류, 그래프 데이터, 파일 이름) 목록
+    :param workers: 프로세스 수 (1이면 현재 프로세스에서 순서대로 그림)
+    :return: 저장된 파일 이름 목록 (jobs 순서)
+    """
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            futures = [executor.submit(render_figure, kind, data, file_name) for kind, data, file_name in jobs]
+            files = [future.result() for future in futures]
+    else:
+        files = [render_figure(kind, data, file_name) for kind, data, file_name in jobs]
+
+    for (kind, _, file_name) in jobs:
+        print(FIGURE_BUILDERS[kind][1].format(file_name))
+    return files
+
+
+def show_figures(jobs):
+    """
+    그래프들을 화면에 표시 (대화형 백엔드에서만 의미 있음). 모든 창을 한 번에 띄움.
+    :param jobs: (그래프 종류, 그래프 데이터[, 파일 이름]) 목록
+    """
+    import matplotlib.pyplot as plt
+
+    for kind, data, *_ in jobs:
+        FIGURE_BUILDERS[kind][0](data, interactive=True).tight_layout()
+    plt.show()
+    plt.close("all")
+
 
 def plot_message_frequency(freq_data):
     """
     CAN 메시지 빈도를 막대 그래프로 시각화.
     """
-    freq_data.plot(kind="bar")
-    plt.title("Message Frequency by CAN ID")
-    plt.xlabel("CAN ID")
-    plt.ylabel("Frequency")
-    plt.show()
+    show_figures([("frequency", frequency_plot_data(freq_data))])
 
 
-def plot_time_series(df, file_name=None):
+def plot_time_series(df, file_name=None, show=True):
     """
     시간 범위에 따른 메시지 빈도 시각화 및 파일 저장.
     :param df: 데이터프레임
     :param file_name: 그래프를 저장할 파일 이름 (옵션)
+    :param show: 화면에 표시할지 여부
     """
-    # 타임 스탬프를 소수점 2자리로 그룹화
-    df["Time Bin"] = df["Timestamp"].round(2)
-    time_series = df["Time Bin"].value_counts().sort_index()
-
-    # 그래프 그리기
-    plt.figure(figsize=(10, 6))
-    time_series.plot(kind="line", marker="o")
-    plt.title("Message Frequency Over Time")
-    plt.xlabel("Timestamp (seconds)")
-    plt.ylabel("Frequency")
-    plt.grid(True)
-    plt.tight_layout()
-
-    # 그래프 저장
+    job = ("time_series", time_series_plot_data(df), file_name)
     if file_name:
-        plt.savefig(file_name)
-        print(f"Time series plot saved as {file_name}")
-
-    # 그래프 표시
-    plt.show()
-    plt.close()
+        render_figures([job])
+    if show:
+        show_figures([job])
 
 
-def plot_anomalies(df):
+def plot_anomalies(df, value_column="DLC"):
     """
     이상 탐지 결과를 시각화합니다.
     :param df: 데이터프레임 (Anomaly 컬럼 포함)
+    :param value_column: y축에 그릴 컬럼 (기본 DLC, 디코딩된 시그널 이름도 가능)
     """
-    normal_data = df[df["Anomaly"] == 1]
-    anomalies = df[df["Anomaly"] == -1]
-
-    plt.scatter(normal_data["Timestamp"], normal_data["DLC"], label="Normal", alpha=0.7)
-    plt.scatter(anomalies["Timestamp"], anomalies["DLC"], label="Anomaly", color="red", alpha=0.7)
-    plt.title("Anomaly Detection Results")
-    plt.xlabel("Timestamp")
-    plt.ylabel("DLC")
-    plt.legend()
-    plt.show()
+    show_figures([("anomalies", anomaly_plot_data(df, value_column))])
 
 
 def save_plot_message_frequency(freq_data, file_name="frequency_plot.png"):
@@ -69,57 +428,51 @@ def save_plot_message_frequency(freq_data, file_name="frequency_plot.png"):
     :param freq_data: 메시지 빈도 데이터
     :param file_name: 저장할 파일 이름
     """
-    freq_data.plot(kind="bar")
-    plt.title("Message Frequency by CAN ID")
-    plt.xlabel("CAN ID")
-    plt.ylabel("Frequency")
-    plt.tight_layout()
-    plt.savefig(file_name)
-    plt.close()
-    print(f"Frequency plot saved as {file_name}")
+    render_figures([("frequency", frequency_plot_data(freq_data), file_name)])
 
 
-def save_plot_anomalies(df, file_name="anomalies_plot.png"):
+def save_plot_anomalies(df, file_name="anomalies_plot.png", value_column="DLC"):
     """
     이상 탐지 결과를 그래프로 저장.
     :param df: 데이터프레임 (Anomaly 컬럼 포함)
     :param file_name: 저장할 파일 이름
+    :param value_column: y축에 그릴 컬럼 (기본 DLC, 디코딩된 시그널 이름도 가능)
     """
-    normal_data = df[df["Anomaly"] == 1]
-    anomalies = df[df["Anomaly"] == -1]
-
-    plt.scatter(normal_data["Timestamp"], normal_data["DLC"], label="Normal", alpha=0.7)
-    plt.scatter(anomalies["Timestamp"], anomalies["DLC"], label="Anomaly", color="red", alpha=0.7)
-    plt.title("Anomaly Detection Results")
-    plt.xlabel("Timestamp")
-    plt.ylabel("DLC")
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(file_name)
-    plt.close()
-    print(f"Anomalies plot saved as {file_name}")
+    render_figures([("anomalies", anomaly_plot_data(df, value_column), file_name)])
 
 
-def plot_time_intervals(data, file_name=None):
+def plot_time_intervals(data, file_name=None, histogram=None, show=True):
     """
     메시지 간 시간 간격 분석 및 시각화.
-    :param data: CAN 로그 데이터프레임
+    :param data: CAN 로그 데이터프레임 (histogram이 주어지면 사용하지 않음)
     :param file_name: 저장할 파일 이름 (옵션)
+    :param histogram: run_analysis가 계산한 (빈도, 빈 경계) 튜플 (옵션)
+    :param show: 화면에 표시할지 여부
     """
-    intervals = data["Timestamp"].diff().dropna()
-    plt.figure(figsize=(10, 6))
-    plt.hist(intervals, bins=50, alpha=0.7, color='blue')
-    plt.title("Message Time Intervals")
-    plt.xlabel("Time Interval (seconds)")
-    plt.ylabel("Frequency")
-    plt.grid(True)
-    plt.tight_layout()
+    job = ("time_intervals", interval_plot_data(data, histogram), file_name)
+    if file_name:
+        render_figures([job])
+    if show:
+        show_figures([job])
+
 
+def plot_signals(decoded, file_name=None, max_signals=6, show=True):
+    """
+    DBC로 디코딩한 시그널을 시간 축 그래프로 시각화 (시그널마다 하나의 서브플롯).
+    :param decoded: decode_signals 결과 ({메시지 이름: 시그널 데이터프레임})
+    :param file_name: 그래프를 저장할 파일 이름 (옵션)
+    :param max_signals: 그릴 최대 시그널 수
+    :param show: 화면에 표시할지 여부
+    """
+    data = signal_plot_data(decoded, max_signals)
+    if not data["series"]:
+        print("No decoded signals to plot.")
+        return
+    job = ("signals", data, file_name)
     if file_name:
-        plt.savefig(file_name)
-        print(f"Time interval plot saved as {file_name}")
-    plt.show()
-    plt.close()
+        render_figures([job])
+    if show:
+        show_figures([job])
 
 
 # 테스트 실행
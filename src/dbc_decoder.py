@@ -0,0 +1,214 @@
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import parse_can_id, payload_matrix
+from src.data_analysis import sort_by_can_id
+
+# BO_ <id> <이름>: <DLC> <송신 노드>
+_MESSAGE_PATTERN = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)")
+
+# SG_ <이름> [M|m<값>] : <시작 비트>|<길이>@<1: Intel, 0: Motorola><+|-> (<scale>,<offset>) [<min>|<max>] "<단위>" <수신 노드>
+_SIGNAL_PATTERN = re.compile(
+    r"^\s+SG_\s+(\w+)\s*(M|m\d+)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*"
+    r"\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)\s*\[\s*([^|\s]*)\s*\|\s*([^\]\s]*)\s*\]\s*\"([^\"]*)\""
+)
+
+# DBC 메시지 ID의 31번 비트는 확장(29비트) ID 표시
+_EXTENDED_ID_FLAG = 0x80000000
+
+
+def load_dbc(file_path):
+    """
+    DBC 파일에서 메시지(BO_)와 시그널(SG_) 정의를 읽음.
+    단순 멀티플렉싱(M / m<값>)을 지원하며, 값 테이블과 주석 등 나머지 항목은 무시함.
+    :param file_path: DBC 파일 경로
+    :return: {CAN ID: 메시지 딕셔너리} - 메시지는 name, can_id, dlc, signals(시그널 딕셔너리 목록)를 가짐
+    """
+    database = {}
+    message = None
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+        for line in file:
+            match = _MESSAGE_PATTERN.match(line)
+            if match:
+                can_id = int(match.group(1)) & ~_EXTENDED_ID_FLAG
+                message = {"name": match.group(2), "can_id": can_id, "dlc": int(match.group(3)), "signals": []}
+                database[can_id] = message
+                continue
+
+            match = _SIGNAL_PATTERN.match(line)
+            if match and message is not None:
+                multiplex = match.group(2)
+                message["signals"].append({
+                    "name": match.group(1),
+                    "start_bit": int(match.group(3)),
+                    "length": int(match.group(4)),
+                    "byte_order": "little_endian" if match.group(5) == "1" else "big_endian",
+                    "is_signed": match.group(6) == "-",
+                    "scale": float(match.group(7)),
+                    "offset": float(match.group(8)),
+                    "minimum": float(match.group(9)) if match.group(9) else None,
+                    "maximum": float(match.group(10)) if match.group(10) else None,
+                    "unit": match.group(11),
+                    "is_multiplexer": multiplex == "M",
+                    "multiplexer_value": int(multiplex[1:]) if multiplex and multiplex != "M" else None,
+                })
+            elif not line.startswith(" "):
+                message = None
+    return database
+
+
+def _assemble(columns, big_endian):
+    """
+    바이트 컬럼들을 하나의 uint64 정수 컬럼으로 합침 (최대 8바이트).
+    """
+    word = np.zeros(columns.shape[0], dtype=np.uint64)
+    count = columns.shape[1]
+    for k in range(count):
+        shift = 8 * (count - 1 - k) if big_endian else 8 * k
+        word |= columns[:, k].astype(np.uint64) << np.uint64(shift)
+    return word
+
+
+def _signal_bytes(signal):
+    """
+    시그널이 걸친 첫/마지막 바이트 번호와, 그 바이트들을 합친 정수에서 LSB까지의 시프트.
+    Intel은 비트 i가 바이트 i // 8의 i % 8번째 비트이고 시작 비트가 LSB,
+    Motorola는 시작 비트가 MSB이므로 바이트 0의 7번 비트부터 MSB 우선으로 다시 번호를 매겨 계산함.
+    """
+    start, length = signal["start_bit"], signal["length"]
+    if signal["byte_order"] == "little_endian":
+        return start // 8, (start + length - 1) // 8, start % 8
+    msb = (start // 8) * 8 + 7 - start % 8
+    lsb = msb + length - 1
+    return msb // 8, lsb // 8, 7 - lsb % 8
+
+
+def extract_raw_signal(payload, signal):
+    """
+    페이로드 행렬의 모든 행에서 시그널 원시 값을 한 번에 추출 (행 단위 루프 없음).
+    시그널이 걸친 바이트(최대 9개)만 골라 정수로 합친 뒤 시프트/마스크함.
+    :param payload: (n, width) uint8 페이로드 행렬
+    :param signal: load_dbc의 시그널 딕셔너리
+    :return: (n,) int64 (부호 있는 시그널) 또는 uint64 원시 값 배열
+    """
+    length = signal["length"]
+    first, last, shift = _signal_bytes(signal)
+    big_endian = signal["byte_order"] == "big_endian"
+    if last - first < 8:
+        raw = _assemble(payload[:, first:last + 1], big_endian) >> np.uint64(shift)
+    elif big_endian:
+        # 9바이트에 걸친 경우 (정렬되지 않은 57비트 이상 시그널): 앞 8바이트와 마지막 바이트를 따로 합침
+        raw = (_assemble(payload[:, first:first + 8], big_endian) << np.uint64(8 - shift)) \
+            | (payload[:, last].astype(np.uint64) >> np.uint64(shift))
+    else:
+        raw = (_assemble(payload[:, first:first + 8], big_endian) >> np.uint64(shift)) \
+            | (payload[:, last].astype(np.uint64) << np.uint64(64 - shift))
+
+    if length < 64:
+        raw &= np.uint64((1 << length) - 1)
+    if not signal["is_signed"]:
+        return raw
+    # 부호 비트를 최상위로 올린 뒤 산술 시프트로 부호 확장
+    spare = np.uint64(64 - length)
+    return (raw << spare).view(np.int64) >> np.int64(64 - length)
+
+
+def decode_payload(payload, message):
+    """
+    한 메시지의 페이로드 행렬을 물리 값 시그널 컬럼으로 변환 (raw * scale + offset).
+    멀티플렉스된 시그널은 멀티플렉서 값이 일치하지 않는 행에서 NaN.
+    :param payload: (n, width) uint8 페이로드 행렬 (해당 메시지 프레임만)
+    :param message: load_dbc의 메시지 딕셔너리
+    :return: {시그널 이름: float64 배열}
+    """
+    width = payload.shape[1]
+    multiplexer = None
+    for signal in message["signals"]:
+        if signal["is_multiplexer"]:
+            multiplexer = extract_raw_signal(payload, signal)
+
+    columns = {}
+    for signal in message["signals"]:
+        if _signal_bytes(signal)[1] >= width:
+            # 페이로드 폭을 넘는 시그널은 디코딩할 수 없음
+            columns[signal["name"]] = np.full(len(payload), np.nan)
+            continue
+        values = extract_raw_signal(payload, signal).astype(np.float64) * signal["scale"] + signal["offset"]
+        if signal["multiplexer_value"] is not None and multiplexer is not None:
+            values[multiplexer != signal["multiplexer_value"]] = np.nan
+        columns[signal["name"]] = values
+    return columns
+
+
+def decode_message(df, message):
+    """
+    로그에서 한 메시지(CAN ID)의 모든 프레임을 디코딩.
+    :param df: CAN 로그 데이터프레임
+    :param message: load_dbc의 메시지 딕셔너리
+    :return: Timestamp, CAN_ID와 시그널 컬럼을 가진 데이터프레임 (원본 행 인덱스 유지)
+    """
+    frames = df[df["CAN_ID"] == message["can_id"]]
+    return pd.DataFrame({
+        "Timestamp": frames["Timestamp"].to_numpy(),
+        "CAN_ID": frames["CAN_ID"].to_numpy(),
+        **decode_payload(payload_matrix(frames), message),
+    }, index=frames.index)
+
+
+def decode_signals(df, database, can_ids=None):
+    """
+    DBC에 정의된 모든 메시지를 한 번에 디코딩.
+    프레임을 ID별로 한 번만 정렬한 뒤 ID 구간마다 시그널을 벡터 연산으로 추출함.
+    :param df: CAN 로그 데이터프레임
+    :param database: load_dbc 결과
+    :param can_ids: 디코딩할 CAN ID 목록 (옵션, 기본은 DBC의 모든 메시지)
+    :return: {메시지 이름: Timestamp, CAN_ID, 시그널 컬럼을 가진 데이터프레임 (시간 순, 원본 행 인덱스 유지)}
+    """
+    wanted = set(database) if can_ids is None else {parse_can_id(can_id) for can_id in can_ids}
+    order, sorted_ids, frame_counts = sort_by_can_id(df)
+    ends = np.cumsum(frame_counts)
+
+    timestamps = df["Timestamp"].to_numpy()
+    payload = payload_matrix(df)
+    decoded = {}
+    for can_id, count, end in zip(sorted_ids, frame_counts, ends):
+        message = database.get(int(can_id))
+        if message is None or int(can_id) not in wanted:
+            continue
+        rows = order[end - count:end]
+        decoded[message["name"]] = pd.DataFrame({
+            "Timestamp": timestamps[rows],
+            "CAN_ID": np.full(count, can_id, dtype=np.uint32),
+            **decode_payload(payload[rows], message),
+        }, index=df.index[rows])
+    return decoded
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    import tempfile
+    from src.can_parser import parse_can_log
+
+    dbc_text = (
+        'BO_ 291 EngineData: 8 ECU\n'
+        ' SG_ EngineSpeed : 0|16@1+ (0.25,0) [0|16383.75] "rpm" Vector__XXX\n'
+        ' SG_ Throttle : 16|8@1+ (0.5,0) [0|127.5] "%" Vector__XXX\n'
+        'BO_ 292 VehicleData: 8 ECU\n'
+        ' SG_ VehicleSpeed : 7|16@0+ (0.01,0) [0|655.35] "km/h" Vector__XXX\n'
+    )
+    with tempfile.NamedTemporaryFile("w", suffix=".dbc", delete=False) as file:
+        file.write(dbc_text)
+    database = load_dbc(file.name)
+    os.remove(file.name)
+
+    data = parse_can_log("data/sample_can_log.csv")
+    for name, signals in decode_signals(data, database).items():
+        print(name)
+        print(signals)
@@ -0,0 +1,435 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import format_can_id, parse_can_id, payload_lengths, payload_matrix
+from src.data_analysis import DEFAULT_BLOCK_SIZE, _frame_type_masks, _iter_blocks, sort_by_can_id
+
+# 규칙 종류
+RULE_TYPES = ["rate", "gap", "dlc", "payload", "frame_type"]
+
+# 규칙 파일을 주지 않았을 때 사용하는 기본 규칙 (버스 전체 검사)
+DEFAULT_RULES = [
+    {"name": "low_dlc", "type": "dlc", "min": 2},
+    {"name": "bus_gap", "type": "gap", "max_gap": 0.2},
+    {"name": "invalid_frame", "type": "frame_type"},
+]
+
+# 진단 문자열 목록에 포함하는 최대 결과 수 (전체 결과는 findings 표에 있음)
+MAX_DIAGNOSTIC_LINES = 100
+
+# 진단 결과 표 컬럼
+FINDING_COLUMNS = ["CAN_ID", "Rule", "Count", "First Timestamp", "Last Timestamp", "Detail"]
+
+# 특정 ID가 아닌 버스 전체 결과 (can_id가 없는 gap 규칙)를 나타내는 내부 CAN ID 값
+_BUS = -1
+
+_VIOLATION_COLUMNS = ["Rule", "CAN_ID", "Count", "First", "Last"]
+
+# 위반 결과 병합 키 ((규칙 번호 << 32) | (CAN ID - _BUS), 29비트 확장 ID와 _BUS 모두 하위 32비트에 들어감)
+_RULE_SHIFT = 32
+_CAN_ID_MASK = (1 << _RULE_SHIFT) - 1
+
+
+def load_rules(file_path):
+    """
+    JSON 또는 YAML (.yaml, .yml) 규칙 파일을 읽음.
+    파일은 규칙 목록이거나 "rules" 키에 규칙 목록을 가진 객체이며, 각 규칙은 다음 형태의 딕셔너리임.
+      {"name": "rpm_rate", "type": "rate", "can_id": "0x0C0", "expected_rate": 100, "tolerance": 0.1}
+      {"name": "rpm_gap", "type": "gap", "can_id": ["0x0C0", "0x0C1"], "max_gap": 0.05}
+      {"name": "rpm_dlc", "type": "dlc", "can_id": "0x0C0", "allowed": [8]}
+      {"name": "gear", "type": "payload", "can_id": "0x1A0", "byte": 2, "mask": "0x0F", "min": 0, "max": 7}
+      {"name": "invalid_frame", "type": "frame_type"}
+    can_id가 없는 dlc/payload/frame_type 규칙은 모든 ID에, can_id가 없는 gap 규칙은 버스 전체 (모든 메시지 사이 간격)에 적용됨.
+    :param file_path: 규칙 파일 경로
+    :return: 규칙 딕셔너리 목록
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        if file_path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML 규칙 파일을 읽으려면 PyYAML이 필요합니다: pip install pyyaml") from e
+            content = yaml.safe_load(file)
+        else:
+            content = json.load(file)
+    rules = content.get("rules", []) if isinstance(content, dict) else content
+    if not isinstance(rules, list):
+        raise ValueError(f"규칙 목록을 찾을 수 없습니다: {file_path}")
+    return rules
+
+
+def _int(value):
+    # "0x0F" 같은 16진수 문자열도 허용
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+
+def _allowed_values(rule, name, mask=0xFF):
+    """
+    allowed / min / max 제약으로부터 바이트 값 (0~255)별 허용 여부 표와 설명 문자열을 만듦.
+    """
+    values = np.arange(256) & mask
+    allowed = np.ones(256, dtype=bool)
+    constraints = []
+    if rule.get("allowed") is not None:
+        choices = [_int(value) for value in rule["allowed"]]
+        allowed &= np.isin(values, choices)
+        constraints.append(f"{name} not in {choices}")
+    minimum = None if rule.get("min") is None else _int(rule["min"])
+    maximum = None if rule.get("max") is None else _int(rule["max"])
+    if minimum is not None:
+        allowed &= values >= minimum
+    if maximum is not None:
+        allowed &= values <= maximum
+    if minimum is not None and maximum is not None:
+        constraints.append(f"{name} outside {minimum}..{maximum}")
+    elif minimum is not None:
+        constraints.append(f"{name} below {minimum}")
+    elif maximum is not None:
+        constraints.append(f"{name} above {maximum}")
+    if not constraints:
+        raise ValueError(f"규칙 {rule.get('name')}: allowed, min, max 중 하나가 필요합니다.")
+    return allowed, " or ".join(constraints)
+
+
+def _required(rule, key, name):
+    if rule.get(key) is None:
+        raise ValueError(f"규칙 {name}: {rule['type']} 규칙에는 {key} 값이 필요합니다.")
+    return rule[key]
+
+
+def compile_rules(rules):
+    """
+    규칙 딕셔너리 목록을 검사하고 평가용으로 변환 (CAN ID 정수화, DLC/페이로드 제약은 값별 허용 표로 변환).
+    :param rules: load_rules 결과 또는 DEFAULT_RULES
+    :return: 변환된 규칙 목록
+    """
+    compiled = []
+    for index, rule in enumerate(rules):
+        kind = rule.get("type")
+        if kind not in RULE_TYPES:
+            raise ValueError(f"규칙 {index}: 알 수 없는 규칙 종류입니다: {kind} (가능한 값: {', '.join(RULE_TYPES)})")
+        name = str(rule.get("name", f"{kind}_{index}"))
+        can_ids = rule.get("can_id")
+        if can_ids is not None:
+            can_ids = [parse_can_id(can_id) for can_id in (can_ids if isinstance(can_ids, list) else [can_ids])]
+        entry = {"name": name, "type": kind, "can_ids": can_ids}
+
+        if kind == "rate":
+            if can_ids is None:
+                raise ValueError(f"규칙 {name}: rate 규칙에는 can_id가 필요합니다.")
+            entry["expected_rate"] = float(_required(rule, "expected_rate", name))
+            entry["tolerance"] = float(rule.get("tolerance", 0.1))
+            entry["detail"] = f"expected {entry['expected_rate']:g} Hz ±{entry['tolerance']:.0%}"
+        elif kind == "gap":
+            entry["max_gap"] = float(_required(rule, "max_gap", name))
+            entry["detail"] = f"gap > {entry['max_gap']:g} s"
+        elif kind == "dlc":
+            entry["allowed"], entry["detail"] = _allowed_values(rule, "DLC")
+        elif kind == "payload":
+            entry["byte"] = _int(_required(rule, "byte", name))
+            mask = _int(rule.get("mask", 0xFF))
+            label = f"byte {entry['byte']}" if mask == 0xFF else f"byte {entry['byte']} & 0x{mask:02X}"
+            entry["allowed"], entry["detail"] = _allowed_values(rule, label, mask)
+        else:
+            entry["detail"] = "DLC or CAN ID invalid for the frame type"
+        compiled.append(entry)
+    return compiled
+
+
+def _frame_violations(rule, columns):
+    """
+    프레임 단위 규칙 (dlc, payload, frame_type)을 위반한 프레임의 마스크.
+    """
+    if rule["type"] == "dlc":
+        return ~rule["allowed"][columns["DLC"]]
+    if rule["type"] == "payload":
+        byte = rule["byte"]
+        if byte >= columns["payload"].shape[1]:
+            return np.zeros(len(columns["DLC"]), dtype=bool)
+        # 해당 바이트가 없는 짧은 프레임은 검사하지 않음 (길이는 dlc 규칙으로 검사)
+        return (columns["lengths"] > byte) & ~rule["allowed"][columns["payload"][:, byte]]
+    return columns["invalid"]
+
+
+def _violations_by_id(rule_index, can_ids, timestamps):
+    """
+    위반 프레임 (시간 순)을 CAN ID별 개수, 첫/마지막 타임스탬프로 묶음.
+    """
+    unique, first, counts = np.unique(can_ids, return_index=True, return_counts=True)
+    last = len(can_ids) - 1 - np.unique(can_ids[::-1], return_index=True)[1]
+    return {"Rule": np.full(len(unique), rule_index), "CAN_ID": unique.astype(np.int64), "Count": counts,
+            "First": timestamps[first], "Last": timestamps[last]}
+
+
+def _violation_table(parts):
+    """
+    위반 결과 조각 (컬럼별 배열 딕셔너리) 목록을 하나의 표로 합침.
+    """
+    parts = [part for part in parts if len(part["Rule"])]
+    if not parts:
+        return pd.DataFrame({"Rule": np.empty(0, dtype=np.int64), "CAN_ID": np.empty(0, dtype=np.int64),
+                             "Count": np.empty(0, dtype=np.int64), "First": np.empty(0), "Last": np.empty(0)})
+    return pd.DataFrame({column: np.concatenate([np.asarray(part[column]) for part in parts])
+                         for column in _VIOLATION_COLUMNS}).astype({"Rule": np.int64, "CAN_ID": np.int64,
+                                                                     "Count": np.int64})
+
+
+def _single_violation(rule_index, can_id, timestamps):
+    return {"Rule": [rule_index], "CAN_ID": [can_id], "Count": [len(timestamps)],
+            "First": [timestamps[0]], "Last": [timestamps[-1]]} if len(timestamps) else {"Rule": []}
+
+
+def _empty_ids():
+    return pd.DataFrame({"Count": np.empty(0, dtype=np.int64), "First": np.empty(0), "Last": np.empty(0)},
+                        index=pd.Index(np.empty(0, dtype=np.int64), name="CAN_ID"))
+
+
+def empty_rule_state(rules):
+    """
+    프레임이 없는 구간의 규칙 부분 결과 (rate 규칙 대상 ID는 finalize_rule_state에서 not present로 보고됨).
+    :param rules: compile_rules 결과
+    """
+    return {"rows": 0, "first_timestamp": None, "last_timestamp": None, "ids": _empty_ids(),
+            "violations": _violation_table([]), "rules": rules}
+
+
+def evaluate_rule_block(df, rules):
+    """
+    프레임 블록 하나에 규칙을 적용해 병합 가능한 부분 결과를 계산.
+    ID가 없는 규칙은 블록 전체 열에 대한 마스크 한 번으로, ID별 규칙은 대상 ID의 프레임만 ID별로 정렬해 둔 뒤
+    ID마다 연속 구간에 대한 마스크로 평가하므로 비용이 (규칙 수 × 블록 크기)가 아닌 대상 ID의 프레임 수에 비례함.
+    :param df: CAN 로그 데이터프레임 (블록, 시간 순)
+    :param rules: compile_rules 결과
+    :return: rows, first_timestamp, last_timestamp, ids (ID별 규칙 대상 ID의 Count/First/Last),
+             violations (규칙 번호, CAN ID별 위반 수와 첫/마지막 타임스탬프), rules 키를 가진 딕셔너리
+    """
+    state = {**empty_rule_state(rules), "rows": len(df)}
+    if len(df) == 0:
+        return state
+
+    timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+    can_ids = df["CAN_ID"].to_numpy()
+    columns = {"Timestamp": timestamps, "DLC": df["DLC"].to_numpy()}
+    kinds = {rule["type"] for rule in rules}
+    if "payload" in kinds:
+        columns["payload"] = payload_matrix(df)
+        columns["lengths"] = payload_lengths(df)
+    if "frame_type" in kinds:
+        masks = _frame_type_masks(df)
+        columns["invalid"] = masks["dlc_out_of_range"] | masks["invalid_ids"]
+    state["first_timestamp"], state["last_timestamp"] = timestamps[0], timestamps[-1]
+
+    # 1. 모든 ID / 버스 전체 규칙
+    parts = []
+    for index, rule in enumerate(rules):
+        if rule["can_ids"] is not None:
+            continue
+        if rule["type"] == "gap":
+            gaps = np.flatnonzero(np.diff(timestamps) > rule["max_gap"]) + 1
+            parts.append(_single_violation(index, _BUS, timestamps[gaps]))
+        else:
+            hits = np.flatnonzero(_frame_violations(rule, columns))
+            parts.append(_violations_by_id(index, can_ids[hits], timestamps[hits]))
+
+    # 2. ID별 규칙: 대상 ID의 프레임만 골라 ID별, ID 안에서는 시간 순으로 정렬
+    targets = np.unique([can_id for rule in rules if rule["can_ids"] is not None for can_id in rule["can_ids"]])
+    if len(targets):
+        selected = np.flatnonzero(np.isin(can_ids, targets))
+        order, block_ids, counts = sort_by_can_id(pd.DataFrame({"Timestamp": timestamps[selected],
+                                                                "CAN_ID": can_ids[selected]}))
+        rows = selected[order]
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        grouped = {key: value[rows] for key, value in columns.items()}
+        grouped_timestamps = grouped["Timestamp"]
+        state["ids"] = pd.DataFrame({"Count": counts.astype(np.int64), "First": grouped_timestamps[starts],
+                                     "Last": grouped_timestamps[ends - 1]},
+                                    index=pd.Index(block_ids.astype(np.int64), name="CAN_ID"))
+
+        positions = dict(zip(block_ids.tolist(), range(len(block_ids))))
+        for index, rule in enumerate(rules):
+            if rule["can_ids"] is None or rule["type"] == "rate":
+                continue
+            for can_id in rule["can_ids"]:
+                position = positions.get(can_id)
+                if position is None:
+                    continue
+                segment = slice(starts[position], ends[position])
+                segment_timestamps = grouped_timestamps[segment]
+                if rule["type"] == "gap":
+                    hits = np.flatnonzero(np.diff(segment_timestamps) > rule["max_gap"]) + 1
+                else:
+                    hits = np.flatnonzero(_frame_violations(rule, {key: value[segment] for key, value in grouped.items()}))
+                parts.append(_single_violation(index, can_id, segment_timestamps[hits]))
+
+    state["violations"] = _violation_table(parts)
+    return state
+
+
+def _combine_by_key(keys, counts, first, last):
+    """
+    같은 키의 개수를 더하고 첫/마지막 타임스탬프의 최소/최대를 취함 (키 정렬 후 reduceat, groupby보다 빠름).
+    :return: (고유 키 (오름차순), 개수, 첫 타임스탬프, 마지막 타임스탬프)
+    """
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if len(keys) else np.empty(0, np.intp)
+    return (keys[starts], np.add.reduceat(counts[order], starts), np.minimum.reduceat(first[order], starts),
+            np.maximum.reduceat(last[order], starts))
+
+
+def merge_rule_states(left, right):
+    """
+    시간 순으로 이어지는 두 블록의 규칙 부분 결과를 병합.
+    블록 경계를 가로지르는 간격 (버스 전체, ID별)도 gap 규칙으로 검사함.
+    """
+    if left["rows"] == 0:
+        return right
+    if right["rows"] == 0:
+        return left
+    rules = left["rules"]
+
+    # 블록 경계의 간격 (위반 시 오른쪽 블록의 첫 프레임에 기록)
+    bus_gap = right["first_timestamp"] - left["last_timestamp"]
+    id_rules = any(rule["type"] == "gap" and rule["can_ids"] is not None for rule in rules)
+    id_gaps = (right["ids"]["First"] - left["ids"]["Last"]).dropna() if id_rules else None
+    parts = []
+    for index, rule in enumerate(rules):
+        if rule["type"] != "gap":
+            continue
+        if rule["can_ids"] is None:
+            if bus_gap > rule["max_gap"]:
+                parts.append(_single_violation(index, _BUS, [right["first_timestamp"]]))
+            continue
+        for can_id in rule["can_ids"]:
+            if id_gaps.get(can_id, -np.inf) > rule["max_gap"]:
+                parts.append(_single_violation(index, can_id, [right["ids"].at[can_id, "First"]]))
+
+    # (규칙, CAN ID) 키별로 위반 수를 더하고 첫/마지막 타임스탬프의 최소/최대를 취함
+    violations = pd.concat([left["violations"], _violation_table(parts), right["violations"]], ignore_index=True)
+    keys, counts, first, last = _combine_by_key(
+        (violations["Rule"].to_numpy() << _RULE_SHIFT) + (violations["CAN_ID"].to_numpy() - _BUS),
+        violations["Count"].to_numpy(), violations["First"].to_numpy(), violations["Last"].to_numpy())
+    violations = _violation_table([{"Rule": keys >> _RULE_SHIFT, "CAN_ID": (keys & _CAN_ID_MASK) + _BUS,
+                                    "Count": counts, "First": first, "Last": last}])
+    ids = pd.concat([left["ids"], right["ids"]])
+    can_ids, counts, first, last = _combine_by_key(ids.index.to_numpy(), ids["Count"].to_numpy(),
+                                                   ids["First"].to_numpy(), ids["Last"].to_numpy())
+    ids = pd.DataFrame({"Count": counts, "First": first, "Last": last}, index=pd.Index(can_ids, name="CAN_ID"))
+    return {
+        "rows": left["rows"] + right["rows"],
+        "first_timestamp": left["first_timestamp"],
+        "last_timestamp": right["last_timestamp"],
+        "ids": ids,
+        "violations": violations,
+        "rules": rules,
+    }
+
+
+def finalize_rule_state(state):
+    """
+    병합된 규칙 부분 결과로부터 진단 결과 표를 만듦. rate 규칙은 여기서 ID별 전체 프레임 수와 기간으로 평가함.
+    :param state: evaluate_rule_block / merge_rule_states 결과
+    :return: FINDING_COLUMNS 컬럼의 DataFrame (규칙 순서, CAN ID 순. 버스 전체 결과의 CAN_ID는 <NA>)
+    """
+    rules = state["rules"]
+    violations = state["violations"]
+    findings = pd.DataFrame({
+        "Order": violations["Rule"].to_numpy(),
+        "CAN_ID": violations["CAN_ID"].to_numpy(),
+        "Rule": [rules[index]["name"] for index in violations["Rule"]],
+        "Count": violations["Count"].to_numpy(),
+        "First Timestamp": violations["First"].to_numpy(),
+        "Last Timestamp": violations["Last"].to_numpy(),
+        "Detail": [rules[index]["detail"] for index in violations["Rule"]],
+    })
+
+    # rate 규칙: 관측 주파수 = (프레임 수 - 1) / 기간
+    ids = state["ids"]
+    rates = []
+    for index, rule in enumerate(rules):
+        if rule["type"] != "rate":
+            continue
+        expected = rule["expected_rate"]
+        for can_id in rule["can_ids"]:
+            if can_id not in ids.index:
+                rates.append([index, can_id, rule["name"], 0, np.nan, np.nan, f"not present ({rule['detail']})"])
+                continue
+            count, first, last = ids.at[can_id, "Count"], ids.at[can_id, "First"], ids.at[can_id, "Last"]
+            observed = (count - 1) / (last - first) if count > 1 and last > first else 0.0
+            if abs(observed - expected) > rule["tolerance"] * expected:
+                rates.append([index, can_id, rule["name"], count, first, last, f"{observed:.1f} Hz, {rule['detail']}"])
+    if rates:
+        findings = pd.concat([findings, pd.DataFrame(rates, columns=["Order"] + FINDING_COLUMNS)], ignore_index=True)
+
+    findings = findings.sort_values(["Order", "CAN_ID"], kind="stable").drop(columns="Order")
+    findings["CAN_ID"] = findings["CAN_ID"].astype("Int64").mask(findings["CAN_ID"] == _BUS)
+    findings["Count"] = findings["Count"].astype(np.int64)
+    return findings.reset_index(drop=True)
+
+
+def format_findings(findings, max_lines=MAX_DIAGNOSTIC_LINES):
+    """
+    진단 결과 표를 결과당 한 줄의 문자열 목록으로 변환 (보고서 / 콘솔 출력용).
+    :param findings: finalize_rule_state 결과
+    :param max_lines: 최대 줄 수 (넘으면 남은 결과 수를 알리는 줄을 추가, None이면 제한 없음)
+    :return: 진단 문자열 목록
+    """
+    shown = findings if max_lines is None else findings.iloc[:max_lines]
+    diagnostics = []
+    for can_id, rule, count, first, last, detail in shown[FINDING_COLUMNS].itertuples(index=False):
+        source = "Bus" if pd.isna(can_id) else f"CAN ID {format_can_id(int(can_id))}"
+        line = f"{source} [{rule}] {detail}"
+        if count:
+            line += f": {count} frames between {first:.6f} s and {last:.6f} s"
+        diagnostics.append(line)
+    if len(findings) > len(shown):
+        diagnostics.append(f"... and {len(findings) - len(shown)} more findings.")
+    return diagnostics
+
+
+def evaluate_rules(data, rules=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    로그 전체에 규칙을 적용 (블록별 부분 결과를 시간 순으로 병합하므로 청크 스트림에도 사용 가능).
+    :param data: CAN 로그 데이터프레임 또는 시간 순서대로 된 청크 이터레이터 (iter_can_log_chunks 등)
+    :param rules: 규칙 딕셔너리 목록 (None이면 DEFAULT_RULES)
+    :param block_size: 데이터프레임을 나눌 블록 크기
+    :return: 진단 결과 DataFrame (finalize_rule_state 참고)
+    """
+    compiled = compile_rules(DEFAULT_RULES if rules is None else rules)
+    state = None
+    for block in _iter_blocks(data, block_size):
+        partial = evaluate_rule_block(block, compiled)
+        state = partial if state is None else merge_rule_states(state, partial)
+    return finalize_rule_state(empty_rule_state(compiled) if state is None else state)
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    import tempfile
+    from src.can_parser import parse_can_log
+
+    rules = {"rules": [
+        {"name": "id_123_rate", "type": "rate", "can_id": "0x123", "expected_rate": 1000, "tolerance": 0.1},
+        {"name": "id_123_dlc", "type": "dlc", "can_id": "0x123", "allowed": [8]},
+        {"name": "id_456_gap", "type": "gap", "can_id": "0x456", "max_gap": 0.0005},
+        {"name": "byte0_range", "type": "payload", "byte": 0, "max": "0x7F"},
+        {"name": "missing_id", "type": "rate", "can_id": "0x7DF", "expected_rate": 10},
+    ]}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(rules, file)
+    loaded = load_rules(file.name)
+    os.remove(file.name)
+
+    data = parse_can_log("data/sample_can_log.csv")
+    findings = evaluate_rules(data, loaded)
+    print(findings)
+    for diagnostic in format_findings(findings):
+        print(f"- {diagnostic}")
@@ -0,0 +1,156 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import payload_matrix, payload_lengths
+from src.data_analysis import sort_by_can_id, iter_frame_blocks, DEFAULT_BLOCK_SIZE
+
+# 생성되는 특징 컬럼
+FEATURE_COLUMNS = ["Interval", "Rolling Frequency", "DLC", "Byte Delta", "Hamming Distance", "Entropy"]
+
+# 롤링 빈도 계산에 사용하는 ID별 최근 프레임 수
+ROLLING_WINDOW = 8
+
+# 바이트 값 → 1인 비트 수
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def payload_entropy(payload, lengths):
+    """
+    프레임별 페이로드 바이트의 Shannon 엔트로피 (비트).
+    행마다 바이트를 정렬한 뒤 같은 값의 연속 구간 길이로 빈도를 구하므로 행 단위 Python 루프가 없음.
+    :param payload: (n, width) uint8 페이로드 행렬
+    :param lengths: 프레임별 유효 바이트 수
+    :return: (n,) float64 엔트로피 배열
+    """
+    n, width = payload.shape
+    lengths = np.minimum(lengths, width).astype(np.int64)
+    # 유효 길이를 넘는 바이트는 256 이상의 값으로 바꿔 정렬 시 뒤로 보냄
+    values = payload.astype(np.int16)
+    padding = np.arange(width) >= lengths[:, None]
+    values[padding] = 256
+    values.sort(axis=1)
+
+    # 행 내 같은 값의 구간 번호와 구간 길이
+    run_ids = np.zeros((n, width), dtype=np.int64)
+    run_ids[:, 1:] = np.cumsum(values[:, 1:] != values[:, :-1], axis=1)
+    keys = run_ids + np.arange(n)[:, None] * width
+    run_lengths = np.bincount(keys.ravel(), minlength=n * width)[keys]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.log2(run_lengths / lengths[:, None])
+    terms[padding] = 0.0
+    entropy = -terms.sum(axis=1) / np.maximum(lengths, 1)
+    return np.where(lengths > 0, entropy, 0.0)
+
+
+def extract_features(df, state=None, window=ROLLING_WINDOW):
+    """
+    CAN 프레임 청크에서 이상 탐지용 특징을 벡터 연산으로 추출.
+    - Interval: 같은 ID 이전 프레임과의 수신 간격
+    - Rolling Frequency: 같은 ID 최근 window개 프레임 기준 수신 빈도 (Hz)
+    - Byte Delta: 같은 ID 이전 프레임 대비 바이트 차이의 절대값 합
+    - Hamming Distance: 같은 ID 이전 프레임 대비 바뀐 비트 수
+    - Entropy: 페이로드 바이트 엔트로피
+    이전 청크의 ID별 마지막 window개 프레임을 state로 넘기면 청크 경계를 넘어 이어서 계산함.
+    :param df: CAN 로그 데이터프레임 (시간 순 청크)
+    :param state: 이전 호출이 반환한 상태 (첫 청크는 None)
+    :param window: 롤링 빈도 계산에 사용할 프레임 수
+    :return: (df와 같은 인덱스의 특징 데이터프레임, 다음 청크에 넘길 상태)
+    """
+    n = len(df)
+    timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+    can_ids = df["CAN_ID"].to_numpy()
+    payload = payload_matrix(df)
+    if state is not None:
+        # Classic 청크와 FD 청크가 섞이면 넓은 쪽 폭으로 맞춤 (빈 바이트는 0)
+        width = max(payload.shape[1], state["Payload"].shape[1])
+        carried_payload = np.zeros((len(state["Payload"]), width), dtype=np.uint8)
+        carried_payload[:, :state["Payload"].shape[1]] = state["Payload"]
+        timestamps = np.concatenate([state["Timestamp"], timestamps])
+        can_ids = np.concatenate([state["CAN_ID"], can_ids])
+        payload = np.concatenate([carried_payload, payload_matrix(df, width)])
+    carried = len(timestamps) - n
+
+    # ID별, ID 내 시간 순으로 정렬 (이전 청크의 프레임이 각 ID 구간의 앞에 옴)
+    order, _, frame_counts = sort_by_can_id(pd.DataFrame({"Timestamp": timestamps, "CAN_ID": can_ids}))
+    sorted_timestamps = timestamps[order]
+    sorted_payload = payload[order]
+    group_starts = np.repeat(np.cumsum(frame_counts) - frame_counts, frame_counts)
+    position = np.arange(len(order)) - group_starts
+
+    has_previous = position >= 1
+    previous = np.maximum(np.arange(len(order)) - 1, 0)
+    interval = np.where(has_previous, sorted_timestamps - sorted_timestamps[previous], 0.0)
+
+    # 최근 window개 (부족하면 구간 시작부터) 프레임으로 빈도 계산
+    span = np.minimum(position, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rolling = span / (sorted_timestamps - sorted_timestamps[np.arange(len(order)) - span])
+    rolling = np.where(has_previous & np.isfinite(rolling), rolling, 0.0)
+
+    previous_payload = sorted_payload[previous]
+    byte_delta = np.abs(sorted_payload.astype(np.int16) - previous_payload).sum(axis=1)
+    hamming = _POPCOUNT[sorted_payload ^ previous_payload].sum(axis=1, dtype=np.int64)
+    byte_delta = np.where(has_previous, byte_delta, 0)
+    hamming = np.where(has_previous, hamming, 0)
+
+    # 정렬 순서를 원래 행 순서로 되돌리고, 이전 청크에서 넘어온 행은 제외
+    restore = np.empty_like(order)
+    restore[order] = np.arange(len(order))
+    rows = restore[carried:]
+    dlc = df["DLC"].to_numpy()
+    features = pd.DataFrame({
+        "Interval": interval[rows],
+        "Rolling Frequency": rolling[rows],
+        "DLC": dlc,
+        "Byte Delta": byte_delta[rows],
+        "Hamming Distance": hamming[rows],
+        "Entropy": payload_entropy(payload[carried:], payload_lengths(df)),
+    }, index=df.index)
+
+    # ID별 마지막 window개 프레임을 시간 순으로 다음 청크에 넘김
+    from_end = np.repeat(frame_counts, frame_counts) - position
+    keep = np.sort(order[from_end <= window])
+    next_state = {"Timestamp": timestamps[keep], "CAN_ID": can_ids[keep], "Payload": payload[keep]}
+    return features, next_state
+
+
+def iter_feature_chunks(chunks, window=ROLLING_WINDOW):
+    """
+    프레임 청크 이터레이터를 특징 청크 이터레이터로 변환 (상태를 이어서 전달).
+    메모리는 청크 크기와 ID 수 × window에 비례함.
+    :param chunks: 시간 순 프레임 청크 이터레이터 (예: iter_can_log_chunks)
+    :return: (프레임 청크, 특징 청크) 튜플을 순서대로 반환하는 제너레이터
+    """
+    state = None
+    for chunk in chunks:
+        features, state = extract_features(chunk, state, window=window)
+        yield chunk, features
+
+
+def build_features(df, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    데이터프레임 전체의 특징을 block_size 행씩 이어서 계산해 하나로 합침.
+    :param df: CAN 로그 데이터프레임 (시간 순)
+    :param block_size: 블록당 행 수 (중간 배열 크기를 제한)
+    :return: df와 같은 인덱스의 특징 데이터프레임
+    """
+    parts = [features for _, features in iter_feature_chunks(iter_frame_blocks(df, block_size))]
+    if not parts:
+        return extract_features(df)[0]
+    return pd.concat(parts)
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    from src.can_parser import parse_can_log
+
+    data = parse_can_log("data/sample_can_log.csv")
+    features, _ = extract_features(data)
+    print(pd.concat([data[["Timestamp", "CAN_ID"]], features], axis=1))
@@ -1,74 +1,204 @@
 import os
 import sys
+import argparse
+from functools import lru_cache
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
-from src.can_parser import parse_can_log
-from src.data_analysis import filter_by_time_range
 
 # 현재 파일의 상위 디렉토리를 sys.path에 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# 샘플 데이터 로드
-file_path = "data/sample_can_log.csv"
-data = parse_can_log(file_path)
-
-# Dash 앱 초기화
-app = dash.Dash(__name__)
-
-# 앱 레이아웃 정의
-app.layout = html.Div([
-    html.H1("CANalyzer Interactive Dashboard", style={'textAlign': 'center'}),
-
-    # CAN ID 선택 드롭다운
-    html.Label("Select CAN ID:"),
-    dcc.Dropdown(
-        id='can-id-selector',
-        options=[{'label': can_id, 'value': can_id} for can_id in data["CAN_ID"].unique()],
-        placeholder="Select a CAN ID",
-    ),
-
-    # 시간 범위 슬라이더
-    html.Label("Time Range (seconds):"),
-    dcc.RangeSlider(
-        id='time-slider',
-        min=data["Timestamp"].min(),
-        max=data["Timestamp"].max(),
-        step=0.001,
-        value=[data["Timestamp"].min(), data["Timestamp"].max()],
-        marks={round(t, 3): str(round(t, 3)) for t in data["Timestamp"].unique()[:10]}  # 표시 제한
-    ),
-
-    # 그래프 출력
-    dcc.Graph(id='time-series-graph'),
-])
-
-
-# 콜백 설정: 드롭다운과 슬라이더를 통해 그래프 업데이트
-@app.callback(
-    Output('time-series-graph', 'figure'),
-    [Input('can-id-selector', 'value'),
-     Input('time-slider', 'value')]
-)
-def update_graph(selected_can_id, time_range):
-    # 시간 범위 필터링
-    filtered_data = filter_by_time_range(data, time_range[0], time_range[1])
-    # CAN ID 필터링
-    if selected_can_id:
-        filtered_data = filtered_data[filtered_data["CAN_ID"] == selected_can_id]
-
-    # 빈도 계산
-    time_series = filtered_data["Timestamp"].value_counts().sort_index()
-
-    # 그래프 반환
+from src.can_parser import parse_can_log, format_can_id, detect_log_format
+from src.log_index import CANLogIndex
+from src.dashboard_tiles import FrequencyTiles
+
+# 기본 로그 경로
+DEFAULT_LOG_PATH = "data/sample_can_log.csv"
+
+# 그래프 하나에 보내는 최대 점 수
+MAX_POINTS = 2000
+
+# 동시에 메모리에 유지하는 로그 수 (로그별 인덱스 + 타일)
+LOG_CACHE_SIZE = 4
+
+# 캐시하는 figure 수 (파일, CAN ID, 시간 범위별)
+FIGURE_CACHE_SIZE = 256
+
+# figure 캐시 키로 쓰는 시간 범위의 소수점 자리수 (슬라이더 step과 동일)
+TIME_KEY_DECIMALS = 3
+
+
+def list_log_files(log_path):
+    """
+    로그 파일 경로 또는 디렉토리에서 지원되는 CAN 로그 파일 목록을 반환.
+    디렉토리인 경우 파일 앞부분/확장자로 포맷이 판별되는 파일만 포함함.
+    :param log_path: 로그 파일 또는 디렉토리 경로
+    :return: 로그 파일 경로 목록 (정렬됨)
+    """
+    if not os.path.isdir(log_path):
+        return [log_path]
+
+    files = []
+    for name in sorted(os.listdir(log_path)):
+        path = os.path.join(log_path, name)
+        if not os.path.isfile(path):
+            continue
+        try:
+            detect_log_format(path)
+        except (ValueError, OSError):
+            continue
+        files.append(path)
+    return files
+
+
+def _file_version(file_path):
+    """
+    캐시 키에 넣는 파일 버전 (수정 시각, 크기). 같은 이름으로 다시 저장된 로그는 새 키가 됨.
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_log(file_path):
+    """
+    로그를 처음 선택될 때 한 번만 읽어서 인덱스와 빈도 타일을 생성 (LRU로 개수 제한).
+    파일이 바뀌면 (수정 시각/크기) 다시 읽음.
+    :return: (CANLogIndex, FrequencyTiles), 읽기 실패 시 None
+    """
+    return _load_log(file_path, _file_version(file_path))
+
+
+@lru_cache(maxsize=LOG_CACHE_SIZE)
+def _load_log(file_path, version):
+    data = parse_can_log(file_path)
+    if data is None:
+        return None
+    index = CANLogIndex(data)
+    return index, FrequencyTiles(index)
+
+
+def build_figure(file_path, can_id, start_time, end_time):
+    """
+    (파일, CAN ID, 시간 범위)별 빈도 그래프. 같은 키의 요청은 모든 사용자가 캐시된 결과를 공유함.
+    파일이 바뀌면 (수정 시각/크기) 캐시된 그래프를 쓰지 않음.
+    """
+    return _build_figure(file_path, _file_version(file_path), can_id, start_time, end_time)
+
+
+@lru_cache(maxsize=FIGURE_CACHE_SIZE)
+def _build_figure(file_path, version, can_id, start_time, end_time):
+    loaded = _load_log(file_path, version)
+    if loaded is None:
+        return {'data': [], 'layout': {'title': f"로그를 읽을 수 없음: {file_path}"}}
+    _, tiles = loaded
+
+    # 보이는 구간에 맞는 해상도의 미리 집계된 빈도 (최대 MAX_POINTS 개 점)
+    x, y = tiles.query(start_time, end_time, can_id, max_points=MAX_POINTS)
     return {
-        'data': [{'x': time_series.index, 'y': time_series.values, 'type': 'line', 'name': 'Frequency'}],
+        'data': [{'x': x, 'y': y, 'type': 'scattergl', 'mode': 'lines', 'name': 'Frequency (msg/s)'}],
         'layout': {
-            'title': f"Message Frequency for CAN ID {selected_can_id}" if selected_can_id else "Message Frequency"}
+            'title': f"Message Frequency for CAN ID {format_can_id(can_id)}" if can_id is not None else "Message Frequency",
+            'yaxis': {'title': 'msg/s'}}
     }
 
 
+def create_app(log_path=DEFAULT_LOG_PATH):
+    """
+    로그 파일 또는 디렉토리를 대상으로 하는 Dash 앱을 생성.
+    로그는 드롭다운에서 선택될 때 읽고, figure는 LRU 캐시에서 재사용함.
+    :param log_path: 로그 파일 또는 로그가 들어 있는 디렉토리 경로
+    :return: dash.Dash 앱
+    """
+    log_files = list_log_files(log_path)
+
+    # Dash 앱 초기화
+    app = dash.Dash(__name__)
+
+    # 앱 레이아웃 정의
+    app.layout = html.Div([
+        html.H1("CANalyzer Interactive Dashboard", style={'textAlign': 'center'}),
+
+        # 로그 파일 선택 드롭다운
+        html.Label("Select Log File:"),
+        dcc.Dropdown(
+            id='log-file-selector',
+            options=[{'label': os.path.basename(path), 'value': path} for path in log_files],
+            value=log_files[0] if log_files else None,
+            clearable=False,
+        ),
+
+        # CAN ID 선택 드롭다운
+        html.Label("Select CAN ID:"),
+        dcc.Dropdown(id='can-id-selector', placeholder="Select a CAN ID"),
+
+        # 시간 범위 슬라이더
+        html.Label("Time Range (seconds):"),
+        dcc.RangeSlider(id='time-slider', min=0, max=1, step=10 ** -TIME_KEY_DECIMALS, value=[0, 1]),
+
+        # 그래프 출력
+        dcc.Graph(id='time-series-graph'),
+    ])
+
+    # 콜백 설정: 로그 파일 선택 시 CAN ID 목록과 시간 범위 갱신
+    @app.callback(
+        [Output('can-id-selector', 'options'),
+         Output('can-id-selector', 'value'),
+         Output('time-slider', 'min'),
+         Output('time-slider', 'max'),
+         Output('time-slider', 'value'),
+         Output('time-slider', 'marks')],
+        [Input('log-file-selector', 'value')]
+    )
+    def update_controls(file_path):
+        loaded = load_log(file_path) if file_path else None
+        if loaded is None or len(loaded[0]) == 0:
+            return [], None, 0, 1, [0, 1], {}
+        index, _ = loaded
+        start_time, end_time = float(index.start_time), float(index.end_time)
+        options = [{'label': format_can_id(can_id), 'value': int(can_id)} for can_id in index.can_ids]
+        ticks = [round(start_time + (end_time - start_time) * i / 10, TIME_KEY_DECIMALS) for i in range(11)]
+        return options, None, start_time, end_time, [start_time, end_time], {t: str(t) for t in ticks}
+
+    # 콜백 설정: 드롭다운과 슬라이더, 그래프 확대 범위를 통해 그래프 업데이트
+    @app.callback(
+        Output('time-series-graph', 'figure'),
+        [Input('log-file-selector', 'value'),
+         Input('can-id-selector', 'value'),
+         Input('time-slider', 'value'),
+         Input('time-series-graph', 'relayoutData')]
+    )
+    def update_graph(file_path, selected_can_id, time_range, relayout_data):
+        if not file_path:
+            return {'data': [], 'layout': {'title': "로그 파일이 없습니다"}}
+
+        # 이번에 바뀐 입력이 그래프 확대/이동이면 보이는 x 범위를, 아니면 (슬라이더, 파일, CAN ID) 슬라이더 범위를 사용.
+        # Dash는 마지막 relayoutData를 계속 넘겨주므로 값이 있는지가 아니라 무엇이 바뀌었는지로 판단함
+        start_time, end_time = time_range
+        triggered = [trigger['prop_id'] for trigger in dash.callback_context.triggered]
+        if 'time-series-graph.relayoutData' in triggered and relayout_data and 'xaxis.range[0]' in relayout_data:
+            start_time, end_time = relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+
+        # 시간 범위를 슬라이더 step 단위로 반올림해서 캐시 키로 사용
+        figure = build_figure(file_path, selected_can_id,
+                              round(float(start_time), TIME_KEY_DECIMALS), round(float(end_time), TIME_KEY_DECIMALS))
+        # 확대 상태는 같은 파일/ID/슬라이더 범위 안에서만 유지 (파일이나 슬라이더가 바뀌면 확대를 초기화)
+        revision = f"{file_path}-{selected_can_id}-{time_range[0]}-{time_range[1]}"
+        return {**figure, 'layout': {**figure['layout'], 'uirevision': revision}}
+
+    return app
+
+
 # 앱 실행
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    parser = argparse.ArgumentParser(description="CANalyzer Interactive Dashboard")
+    parser.add_argument("--log", type=str, default=DEFAULT_LOG_PATH, help="CAN 로그 파일 또는 로그 디렉토리 경로")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="서버 주소")
+    parser.add_argument("--port", type=int, default=8050, help="서버 포트")
+    parser.add_argument("--debug", action="store_true", help="Dash 디버그 모드")
+    args = parser.parse_args()
+
+    create_app(args.log).run(host=args.host, port=args.port, debug=args.debug)
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# 캐시 포맷 버전 (파싱된 프레임 구조가 바뀌면 올려서 기존 캐시를 무효화)
+CACHE_VERSION = 3
+
+# 로그 파일 옆에 생성되는 캐시 디렉토리 접미사
+CACHE_SUFFIX = ".cancache"
+
+# 내용 해시 계산 시 한 번에 읽는 바이트 수
+_HASH_BLOCK_SIZE = 8 * 1024 * 1024
+
+# 희소 컬럼 변환 시 한 번에 읽는 행 수
+_SPARSE_BLOCK = 1 << 22
+
+
+def get_cache_dir(file_path):
+    """
+    로그 파일에 대응하는 캐시 디렉토리 경로를 반환.
+    예: data/sample_can_log.csv → data/sample_can_log.csv.cancache
+    """
+    return os.path.abspath(file_path) + CACHE_SUFFIX
+
+
+def compute_file_hash(file_path):
+    """
+    로그 파일 내용의 BLAKE2b 해시를 계산.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(cache_dir, meta):
+    with open(os.path.join(cache_dir, "meta.json"), "w", encoding="utf-8") as file:
+        json.dump(meta, file, indent=2)
+
+
+def _is_cache_valid(file_path, cache_dir, meta):
+    """
+    캐시가 로그 파일과 일치하는지 확인.
+    크기와 mtime이 같으면 해시 계산 없이 유효로 판단하고,
+    크기는 같지만 mtime만 바뀐 경우(복사, touch 등)에만 내용 해시를 비교함.
+    """
+    if meta is None or meta.get("version") != CACHE_VERSION:
+        return False
+
+    stat = os.stat(file_path)
+    if stat.st_size != meta["size"]:
+        return False
+    if stat.st_mtime_ns == meta["mtime_ns"]:
+        return True
+
+    if compute_file_hash(file_path) != meta["hash"]:
+        return False
+
+    # 내용이 같으므로 mtime만 갱신해 다음 로드에서 해시 계산을 생략
+    meta["mtime_ns"] = stat.st_mtime_ns
+    try:
+        _write_meta(cache_dir, meta)
+    except OSError:
+        pass
+    return True
+
+
+def load_cached_log(file_path):
+    """
+    캐시된 컬럼 데이터를 메모리 맵으로 읽어서 DataFrame으로 반환.
+    :param file_path: 원본 CAN 로그 파일 경로
+    :return: 캐시된 DataFrame (캐시가 없거나 오래된 경우 None)
+    """
+    cache_dir = get_cache_dir(file_path)
+    meta = _read_meta(cache_dir)
+    try:
+        if not _is_cache_valid(file_path, cache_dir, meta):
+            return None
+        columns = {}
+        for column in meta["columns"]:
+            if column in meta["sparse_columns"]:
+                columns[column] = sparse_column(
+                    np.load(os.path.join(cache_dir, f"{column}.rows.npy"), mmap_mode="r"),
+                    np.load(os.path.join(cache_dir, f"{column}.values.npy"), mmap_mode="r"),
+                    meta["rows"])
+            else:
+                columns[column] = np.load(os.path.join(cache_dir, f"{column}.npy"), mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+    return pd.DataFrame(columns, copy=False)
+
+
+def prefer_sparse_column(nonzero, rows, dtype):
+    """
+    0이 아닌 값이 nonzero개인 컬럼을 희소 컬럼 (값 + int32 행 번호)으로 두는 편이 일반 배열보다 작은지 여부.
+    """
+    return nonzero * (dtype.itemsize + 4) < rows * dtype.itemsize
+
+
+def sparse_column(rows, values, length):
+    """
+    0이 아닌 값의 (행 번호, 값) 배열로 채움 값이 0인 희소 컬럼 (pandas SparseArray)을 만듦.
+    채움 값을 값과 같은 dtype으로 두어야 행 선택 (take, 마스크) 후에도 dtype이 유지됨.
+    :param rows: 오름차순 행 번호 배열
+    :param values: 행 번호별 값 배열 (메모리 맵이면 복사하지 않음)
+    :param length: 컬럼 길이 (전체 행 수)
+    """
+    from scipy import sparse
+
+    matrix = sparse.csc_array((values, rows, np.array([0, len(rows)])), shape=(length, 1))
+    index = pd.arrays.SparseArray.from_spmatrix(matrix).sp_index
+    return pd.arrays.SparseArray(values, sparse_index=index, dtype=pd.SparseDtype(values.dtype, values.dtype.type(0)))
+
+
+def _write_npy_header(file, dtype, rows):
+    """
+    1차원 .npy 헤더를 씀. 헤더는 64바이트 단위로 패딩되므로 행 수가 바뀌어도 길이가 같음 (마지막에 덮어쓰기 가능).
+    """
+    np.lib.format.write_array_header_1_0(
+        file, {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)})
+
+
+def _skip_rows(file, dtype, rows):
+    """
+    0으로 채울 구간만큼 파일 크기를 늘림 (실제로 쓰지 않으므로 디스크와 메모리를 쓰지 않음).
+    """
+    file.truncate(file.tell() + rows * dtype.itemsize)
+    file.seek(0, os.SEEK_END)
+
+
+def _store_sparse_column(cache_dir, column, dtype, rows):
+    """
+    저장된 일반 컬럼 파일을 0이 아닌 값의 (행 번호, 값) 파일 쌍으로 바꿈 (블록 단위로 읽으므로 메모리는 일정함).
+    """
+    dense_file = os.path.join(cache_dir, f"{column}.npy")
+    dense = np.load(dense_file, mmap_mode="r")
+    with open(os.path.join(cache_dir, f"{column}.rows.npy"), "w+b") as row_file, \
+            open(os.path.join(cache_dir, f"{column}.values.npy"), "w+b") as value_file:
+        _write_npy_header(row_file, np.dtype(np.int64), 0)
+        _write_npy_header(value_file, dtype, 0)
+        nonzero = 0
+        for start in range(0, rows, _SPARSE_BLOCK):
+            block = np.asarray(dense[start:start + _SPARSE_BLOCK])
+            found = np.flatnonzero(block)
+            row_file.write((found + start).astype(np.int64).data)
+            value_file.write(np.ascontiguousarray(block[found]).data)
+            nonzero += len(found)
+        for file, file_dtype in ((row_file, np.dtype(np.int64)), (value_file, dtype)):
+            file.seek(0)
+            _write_npy_header(file, file_dtype, nonzero)
+    del dense
+    os.remove(dense_file)
+
+
+def store_cached_log(file_path, chunks, sparse_columns=()):
+    """
+    파싱한 청크를 컬럼별 .npy 파일에 바로 이어 써서 로그 옆에 캐시를 만듦 (메모리는 청크 크기에 비례).
+    .npy 헤더는 행 수 0으로 먼저 쓰고 마지막에 전체 행 수로 다시 쓰며, 일부 청크에만 있는 컬럼
+    (Classic 청크의 FD 바이트 컬럼 등)의 빈 구간은 0으로 채움.
+    sparse_columns 중 0이 아닌 값이 적은 컬럼은 마지막에 (행 번호, 값) 파일 쌍으로 바꿔서 저장함.
+    임시 디렉토리에 모두 쓴 뒤 이름을 바꿔서, 중간에 실패해도 깨진 캐시가 남지 않도록 함.
+    :param file_path: 원본 CAN 로그 파일 경로
+    :param chunks: 시간 순 프레임 청크 (parse_can_log 청크) iterable
+    :param sparse_columns: 희소 컬럼으로 저장할 수 있는 컬럼 이름 목록 (예: FD 바이트 컬럼)
+    :return: 저장 성공 여부 (실패 시 청크를 끝까지 읽지 않았을 수 있음)
+    """
+    cache_dir = get_cache_dir(file_path)
+    temp_dir = f"{cache_dir}.tmp{os.getpid()}"
+    files = {}
+    nonzero = dict.fromkeys(sparse_columns, 0)
+    rows = 0
+    reading = False
+    try:
+        stat = os.stat(file_path)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        reading = True
+        for chunk in chunks:
+            reading = False
+            for column in chunk.columns:
+                if column not in files:
+                    dtype = chunk[column].dtype
+                    file = open(os.path.join(temp_dir, f"{column}.npy"), "w+b")
+                    files[column] = (file, dtype)
+                    _write_npy_header(file, dtype, 0)
+                    _skip_rows(file, dtype, rows)
+            for column, (file, dtype) in files.items():
+                if column in chunk.columns:
+                    values = chunk[column].to_numpy(dtype=dtype)
+                    file.write(np.ascontiguousarray(values).data)
+                    if column in nonzero:
+                        nonzero[column] += np.count_nonzero(values)
+                else:
+                    _skip_rows(file, dtype, len(chunk))
+            rows += len(chunk)
+            reading = True
+        reading = False
+
+        for file, dtype in files.values():
+            file.seek(0)
+            _write_npy_header(file, dtype, rows)
+            file.close()
+        sparse = [column for column in files
+                  if column in nonzero and prefer_sparse_column(nonzero[column], rows, files[column][1])]
+        for column in sparse:
+            _store_sparse_column(temp_dir, column, files[column][1], rows)
+        _write_meta(temp_dir, {
+            "version": CACHE_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": compute_file_hash(file_path),
+            "rows": rows,
+            "columns": list(files),
+            "sparse_columns": sparse,
+        })
+
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(temp_dir, cache_dir)
+        return True
+    except OSError as e:
+        if reading:
+            # 로그 읽기 오류는 캐시 문제가 아니므로 호출자에게 그대로 전달
+            raise
+        print(f"캐시 저장 실패: {e}")
+        return False
+    finally:
+        for file, _ in files.values():
+            file.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def clear_cached_log(file_path):
+    """
+    로그 파일의 캐시를 삭제.
+    """
+    shutil.rmtree(get_cache_dir(file_path), ignore_errors=True)
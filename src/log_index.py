@@ -0,0 +1,114 @@
+import os
+import sys
+
+import numpy as np
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import parse_can_id
+from src.data_analysis import sort_by_can_id
+
+
+class CANLogIndex:
+    """
+    시간 순으로 정렬된 CAN 로그와 CAN ID별 행 오프셋 인덱스.
+    로드 시 한 번만 만들어 두고, 시간 구간 조회는 이진 탐색 후 슬라이스(복사 없음)로,
+    ID 조회는 ID별 행 오프셋 구간을 이진 탐색해 고른 k개 행만 가져오므로
+    조회 비용이 전체 행 수가 아닌 O(log n + k)에 비례함 (메모리 맵 컬럼도 전체를 복사하지 않음).
+    """
+
+    def __init__(self, df):
+        """
+        :param df: CAN 로그 데이터프레임 (시간 순이 아니면 안정 정렬한 복사본을 사용)
+        """
+        timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+        if not np.all(timestamps[1:] >= timestamps[:-1]):
+            df = df.iloc[np.argsort(timestamps, kind="stable")].reset_index(drop=True)
+            timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+        self.data = df
+        self._timestamps = timestamps
+
+        # ID별로 연속된 행 오프셋 목록 (ID 내에서는 시간 순)
+        order, can_ids, frame_counts = sort_by_can_id(df)
+        ends = np.cumsum(frame_counts)
+        self._id_rows = order
+        self._id_timestamps = timestamps[order]
+        self._id_ranges = {int(can_id): (int(end - count), int(end))
+                           for can_id, count, end in zip(can_ids, frame_counts, ends)}
+        self._id_counts = frame_counts
+        self.can_ids = can_ids
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def start_time(self):
+        return self._timestamps[0] if len(self._timestamps) else np.nan
+
+    @property
+    def end_time(self):
+        return self._timestamps[-1] if len(self._timestamps) else np.nan
+
+    def _time_bounds(self, timestamps, start_time, end_time):
+        start = 0 if start_time is None else np.searchsorted(timestamps, start_time, side="left")
+        stop = len(timestamps) if end_time is None else np.searchsorted(timestamps, end_time, side="right")
+        return int(start), int(max(start, stop))
+
+    def time_range(self, start_time=None, end_time=None):
+        """
+        start_time <= Timestamp <= end_time 인 행을 반환 (이진 탐색 후 슬라이스).
+        """
+        start, stop = self._time_bounds(self._timestamps, start_time, end_time)
+        return self.data.iloc[start:stop]
+
+    def by_can_id(self, can_id, start_time=None, end_time=None):
+        """
+        특정 CAN ID의 행을 시간 순으로 반환 (시간 구간 옵션).
+        ID별 행 오프셋에서 조건에 맞는 구간을 찾아 그 행들만 가져옴 (원래 행 인덱스 유지).
+        :param can_id: "0x123" 형태의 문자열 또는 정수 CAN ID
+        """
+        start, stop = self._id_ranges.get(parse_can_id(can_id), (0, 0))
+        lo, hi = self._time_bounds(self._id_timestamps[start:stop], start_time, end_time)
+        return self.data.take(self._id_rows[start + lo:start + hi])
+
+    def query(self, start_time=None, end_time=None, can_id=None):
+        """
+        시간 구간과 CAN ID(옵션)로 행을 조회.
+        """
+        if can_id is None:
+            return self.time_range(start_time, end_time)
+        return self.by_can_id(can_id, start_time, end_time)
+
+    def timestamps(self, start_time=None, end_time=None, can_id=None):
+        """
+        조회 조건에 맞는 타임스탬프 배열만 반환 (데이터프레임을 만들지 않음).
+        """
+        if can_id is None:
+            start, stop = self._time_bounds(self._timestamps, start_time, end_time)
+            return self._timestamps[start:stop]
+        start, stop = self._id_ranges.get(parse_can_id(can_id), (0, 0))
+        lo, hi = self._time_bounds(self._id_timestamps[start:stop], start_time, end_time)
+        return self._id_timestamps[start + lo:start + hi]
+
+    def timestamps_by_id(self):
+        """
+        ID별로 모은 전체 타임스탬프 (can_ids 순서, ID 내에서는 시간 순)와 ID별 프레임 수.
+        :return: (타임스탬프 배열, ID별 프레임 수 배열)
+        """
+        return self._id_timestamps, self._id_counts
+
+    def count(self, start_time=None, end_time=None, can_id=None):
+        """
+        조회 조건에 맞는 행 수 (O(log n)).
+        """
+        return len(self.timestamps(start_time, end_time, can_id))
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    from src.can_parser import parse_can_log
+
+    index = CANLogIndex(parse_can_log("data/sample_can_log.csv"))
+    print(index.time_range(0.001, 0.06))
+    print(index.by_can_id("0x123", 0.002, 0.3))
@@ -0,0 +1,113 @@
+import numpy as np
+
+# Classic CAN / CAN FD 페이로드 최대 바이트 수
+PAYLOAD_WIDTH = 8
+FD_PAYLOAD_WIDTH = 64
+
+# ASCII 16진수 문자 → 값 변환 테이블 (16진수가 아닌 문자는 0)
+_HEX_LUT = np.zeros(256, dtype=np.uint8)
+for _value, _char in enumerate("0123456789abcdef"):
+    _HEX_LUT[ord(_char)] = _value
+    _HEX_LUT[ord(_char.upper())] = _value
+
+# 값 → 대문자 16진수 ASCII 문자
+_HEX_DIGITS = np.frombuffer(b"0123456789ABCDEF", dtype=np.uint8)
+
+# CAN FD DLC 코드(0~15) → 페이로드 바이트 수. Classic CAN은 DLC 9~15도 8바이트
+FD_DLC_LENGTHS = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64], dtype=np.uint8)
+CLASSIC_DLC_LENGTHS = np.minimum(FD_DLC_LENGTHS, PAYLOAD_WIDTH)
+
+
+def dlc_to_length(dlc, is_fd=False):
+    """
+    DLC 코드를 페이로드 바이트 수로 변환.
+    :param dlc: DLC 코드 배열 (0~15)
+    :param is_fd: 프레임별 CAN FD 여부 (bool 배열 또는 스칼라)
+    :return: uint8 바이트 수 배열
+    """
+    codes = np.minimum(np.asarray(dlc, dtype=np.int64), 15)
+    return np.where(is_fd, FD_DLC_LENGTHS[codes], CLASSIC_DLC_LENGTHS[codes]).astype(np.uint8)
+
+
+def length_to_dlc(lengths):
+    """
+    페이로드 바이트 수를 그 길이를 담을 수 있는 가장 작은 DLC 코드로 변환 (FD 길이 12~64 → 9~15).
+    """
+    lengths = np.minimum(np.asarray(lengths, dtype=np.int64), FD_PAYLOAD_WIDTH)
+    return np.searchsorted(FD_DLC_LENGTHS, lengths, side="left").astype(np.uint8)
+
+
+def payload_width_for(lengths):
+    """
+    프레임 바이트 수 목록에 필요한 페이로드 행렬 폭 (모두 8바이트 이하이면 8, 아니면 FD 폭 64).
+    """
+    lengths = np.asarray(lengths)
+    return FD_PAYLOAD_WIDTH if len(lengths) and lengths.max() > PAYLOAD_WIDTH else PAYLOAD_WIDTH
+
+
+def payload_length_mask(lengths, width=PAYLOAD_WIDTH):
+    """
+    프레임별 유효 바이트 위치 마스크.
+    :param lengths: 프레임별 페이로드 바이트 수 (n,)
+    :param width: 페이로드 행렬 폭
+    :return: (n, width) bool 배열 (유효 바이트 True)
+    """
+    return np.arange(width) < np.asarray(lengths)[:, None]
+
+
+def decode_hex_payloads(payloads, width=PAYLOAD_WIDTH, lengths=None):
+    """
+    "01 02 03 ..." 또는 "010203..." 형태의 16진수 페이로드 문자열 컬럼을 (n, width) uint8 행렬로 변환.
+    모든 행을 2 * width 글자로 맞춘 뒤 하나의 ASCII 버퍼로 합쳐 조회 테이블로 한 번에 디코딩함.
+    :param payloads: 페이로드 문자열 Series
+    :param width: 페이로드 행렬 폭 (Classic 8, FD 64)
+    :param lengths: 프레임별 유효 바이트 수 (옵션, 주어지면 그 뒤의 바이트는 0으로 채움)
+    :return: C 연속 (n, width) uint8 행렬
+    """
+    text = (
+        payloads.fillna("")
+        .astype(str)
+        .str.replace(" ", "", regex=False)
+        .str.slice(0, 2 * width)
+        .str.ljust(2 * width, "0")
+    )
+    buffer = np.frombuffer("".join(text).encode("ascii"), dtype=np.uint8)
+    digits = _HEX_LUT[buffer].reshape(len(text), 2 * width)
+    payload = (digits[:, 0::2] << 4) | digits[:, 1::2]
+    if lengths is not None:
+        payload[~payload_length_mask(lengths, width)] = 0
+    return payload
+
+
+def pack_payloads(byte_strings, width=PAYLOAD_WIDTH):
+    """
+    bytes 페이로드 목록 (python-can 메시지 등)을 (n, width) uint8 행렬로 변환 (짧으면 0으로 채우고 길면 자름).
+    """
+    padding = bytes(width)
+    buffer = b"".join((bytes(data) + padding)[:width] for data in byte_strings)
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, width)
+
+
+def encode_hex_payloads(payload, lengths=None, sep=" "):
+    """
+    (n, width) uint8 페이로드 행렬을 "01 02 03" 형태의 문자열 배열로 변환 (보고서/로그 출력용).
+    바이트마다 16진수 두 글자와 구분자를 고정 폭 버퍼에 채운 뒤, 유효 길이 뒤는 NUL로 지워서 한 번에 문자열로 변환함.
+    :param payload: (n, width) uint8 페이로드 행렬
+    :param lengths: 프레임별 유효 바이트 수 (옵션, 기본은 전체 폭)
+    :param sep: 바이트 사이 구분자 (""이면 candump 형식 "010203")
+    :return: (n,) 문자열 배열
+    """
+    payload = np.asarray(payload, dtype=np.uint8)
+    n, width = payload.shape
+    if width == 0:
+        return np.full(n, "", dtype=object)
+    lengths = np.full(n, width) if lengths is None else np.minimum(np.asarray(lengths, dtype=np.int64), width)
+
+    stride = 2 + len(sep)
+    chars = np.zeros((n, width, stride), dtype=np.uint8)
+    chars[:, :, 2:] = np.frombuffer(sep.encode("ascii"), dtype=np.uint8)
+    chars[:, :, 0] = _HEX_DIGITS[payload >> 4]
+    chars[:, :, 1] = _HEX_DIGITS[payload & 0x0F]
+    chars = chars.reshape(n, stride * width)
+    chars[np.arange(stride * width) >= (stride * lengths - len(sep))[:, None]] = 0
+    return np.ascontiguousarray(chars).view(f"S{stride * width}").ravel().astype(str)
@@ -0,0 +1,247 @@
+import os
+import sys
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from src.anomaly_detection import (
+    detect_anomalies,
+    detect_anomalies_out_of_core,
+    detect_signal_anomalies,
+    train_anomaly_model,
+    save_anomaly_model,
+    load_anomaly_model
+)
+from src.can_parser import parse_can_log
+from src.data_analysis import (
+    filter_by_time_range,
+    calculate_cycle_time_statistics,
+    run_analysis,  # 단일 패스 분석 엔진
+    run_analysis_parallel
+)
+from src.data_visualization import (
+    frequency_plot_data,
+    time_series_plot_data,
+    anomaly_plot_data,
+    anomaly_plot_data_from_chunks,
+    normal_point_counts,
+    interval_plot_data,
+    signal_plot_data,
+    render_figures,
+    show_figures
+)
+from src.dbc_decoder import load_dbc, decode_signals
+from src.diagnostic_rules import load_rules
+from src.profiling import StageProfiler, format_timing_table
+from src.report_generator import generate_html_report, generate_pdf_report
+
+# --out-of-core 모드에서 이상 행 (점수, 행 번호 포함)을 저장하는 파일
+OUT_OF_CORE_ANOMALY_FILE = "anomalies_scored.csv"
+
+
+def _output_path(output_dir, name):
+    """
+    출력 파일 경로. output_dir이 없으면 이름 그대로 (현재 디렉토리), 있으면 그 디렉토리 아래 (경로의 파일 이름만 사용).
+    """
+    if output_dir is None:
+        return name
+    return os.path.join(output_dir, os.path.basename(name))
+
+
+def analyze_log(args, output_dir=None):
+    """
+    로그 하나에 대해 파싱부터 보고서 생성까지 전체 분석 파이프라인을 실행.
+    :param args: main.py 명령줄 옵션 (argparse.Namespace, args.file이 분석할 로그)
+    :param output_dir: 그래프/보고서/프로파일 결과를 저장할 디렉토리 (None이면 현재 디렉토리의 기존 파일 이름)
+    :return: 로그 요약 딕셔너리 (프레임 수, 고유 ID 수, 기간, 이상치 수, 진단 수, 보고서 경로). 로그를 읽지 못하면 None
+    """
+    profiler = StageProfiler(enabled=args.profile or bool(args.cprofile), cprofile_path=args.cprofile and _output_path(output_dir, args.cprofile))
+
+    # 1. CAN 로그 데이터 읽기
+    with profiler.stage("parse") as stage:
+        data = parse_can_log(args.file, chunksize=args.chunk_size, use_cache=not args.no_cache,
+                             log_format=args.log_format)
+        stage["rows"] = None if data is None else len(data)
+    if data is None:
+        print("Failed to load CAN log data.")
+        return None
+
+    # 2. 데이터 분석 (통계, 빈도, 품질 평가, 시간 간격 통계, 진단 규칙을 한 번의 스캔으로 계산)
+    rules = load_rules(args.rules) if args.rules else None
+    with profiler.stage("analysis", rows=len(data)):
+        if args.workers > 1:
+            # 시간 샤드별 병렬 분석 (결과는 직렬 실행과 동일)
+            analysis = run_analysis_parallel(data, workers=args.workers, file_path=None if args.no_cache else args.file,
+                                             rules=rules)
+        else:
+            analysis = run_analysis(data, rules=rules)
+    stats = analysis["statistics"]
+    freq_data = analysis["frequency"]
+
+    # 3. 데이터 품질 평가
+    evaluation_report = analysis["evaluation_report"]
+    print("Data Quality Evaluation:")
+    print(evaluation_report)
+
+    # 4. 시간 간격 통계 계산
+    time_interval_stats = analysis["time_interval_stats"]
+    print("Time Interval Statistics:")
+    for key, value in time_interval_stats.items():
+        print(f"{key}: {value:.6f} seconds")
+
+    # 5. 진단 결과 생성
+    diagnostics = analysis["diagnostics"]
+    print("Diagnostics Summary:")
+    for diagnostic in diagnostics:
+        print(f"- {diagnostic}")
+    if args.findings_file:
+        findings_file = _output_path(output_dir, args.findings_file)
+        analysis["findings"].to_csv(findings_file, index=False)
+        print(f"Diagnostic findings saved as {findings_file}")
+
+    # 5-1. CAN ID별 주기 통계
+    with profiler.stage("cycle_time_statistics", rows=len(data)):
+        cycle_time_stats = calculate_cycle_time_statistics(data)
+    print("Per-ID Cycle Time Statistics:")
+    print(cycle_time_stats)
+
+    # 6. 데이터 시각화 (전체 데이터 기준). 그래프는 데이터를 미리 집계해 두고 마지막에 한 번만 그림
+    with profiler.stage("plot_data"):
+        plot_jobs = [("frequency", frequency_plot_data(freq_data), _output_path(output_dir, "frequency_plot.png"))]
+
+    # 7. 시간 기반 데이터 필터링
+    with profiler.stage("time_filter") as stage:
+        filtered_data = filter_by_time_range(data, args.start_time, args.end_time)
+        stage["rows"] = len(filtered_data)
+    print(f"Filtered Data from {args.start_time} to {args.end_time}:")
+    print(filtered_data)
+
+    # 8. 시간 기반 시각화
+    with profiler.stage("plot_data", rows=len(filtered_data)):
+        plot_jobs.append(("time_series", time_series_plot_data(filtered_data), _output_path(output_dir, "message_frequency_over_time.png")))
+
+    # 9. 시간 간격 시각화
+    with profiler.stage("plot_data"):
+        plot_jobs.append(("time_intervals", interval_plot_data(data, analysis["interval_histogram"]), _output_path(output_dir, "time_interval_plot.png")))
+
+    # 10. 이상 탐지 실행 (저장된 모델이 있으면 예측만 수행)
+    model_file = args.train_model and _output_path(output_dir, args.train_model)
+    out_of_core = getattr(args, "out_of_core", False)
+    anomaly_file = args.anomaly_file and _output_path(output_dir, args.anomaly_file)
+    with profiler.stage("anomaly_detection", rows=len(data)):
+        model_bundle = load_anomaly_model(args.model) if args.model else None
+        if out_of_core:
+            # 이미 읽은 프레임 (캐시가 있으면 메모리 맵)을 청크 단위로 두 번 훑으며 표본으로 학습하고 점수 계산 (로그를 다시 파싱하지 않음).
+            # 이상 행은 anomaly_file에 바로 저장하고 그래프용으로는 청크별 정상 점 요약과 이상 행만 모음
+            # (메모리가 로그 길이가 아니라 이상치 수에 비례)
+            anomaly_file = anomaly_file or _output_path(output_dir, OUT_OF_CORE_ANOMALY_FILE)
+            normal_points, anomaly_chunks = [], []
+
+            def collect(chunk, scores, labels):
+                normal_points.append(normal_point_counts(chunk, labels))
+                anomalous = np.flatnonzero(labels == -1)
+                anomaly_chunks.append(chunk.iloc[anomalous].assign(Score=scores[anomalous]))
+
+            result = detect_anomalies_out_of_core(
+                data, anomaly_file, model_bundle=model_bundle,
+                sample_size=args.sample_size, per_id=args.per_id_sample if args.stratified_sample else None,
+                chunksize=args.chunk_size, on_chunk=collect)
+            if args.train_model:
+                save_anomaly_model(result["model"], model_file)
+            anomalies = pd.concat(anomaly_chunks, ignore_index=True) if anomaly_chunks else data.iloc[:0].assign(Score=0.0)
+        else:
+            if args.train_model:
+                save_anomaly_model(train_anomaly_model(data), model_file)
+            detected_data = detect_anomalies(data, model_bundle=model_bundle)
+            anomalies = detected_data[detected_data["Anomaly"] == -1]
+    print("Anomalies Detected:")
+    print(anomalies)  # 이상치 출력
+
+    # 11. 이상 탐지 결과 시각화
+    with profiler.stage("plot_data", rows=len(data)):
+        if out_of_core:
+            anomaly_plot = anomaly_plot_data_from_chunks(normal_points, anomalies)
+        else:
+            anomaly_plot = anomaly_plot_data(detected_data)
+        plot_jobs.insert(1, ("anomalies", anomaly_plot, _output_path(output_dir, "anomalies_plot.png")))
+
+    # 12-1. DBC 시그널 디코딩 및 시그널 기반 이상 탐지 (옵션)
+    if args.dbc:
+        with profiler.stage("signal_decoding", rows=len(data)):
+            decoded = decode_signals(data, load_dbc(args.dbc))
+            for name, signals in decoded.items():
+                signal_anomalies = detect_signal_anomalies(signals)
+                print(f"Decoded signals for {name} ({(signal_anomalies['Anomaly'] == -1).sum()} signal anomalies):")
+                print(signals.drop(columns=["CAN_ID"]).describe())
+            signal_data = signal_plot_data(decoded)
+            if signal_data["series"]:
+                plot_jobs.append(("signals", signal_data, _output_path(output_dir, "signals_plot.png")))
+            else:
+                print("No decoded signals to plot.")
+
+    # 12. 그래프 저장 (서로 독립적인 그래프는 --workers 개 프로세스에서 동시에 그림)
+    with profiler.stage("render_plots", rows=len(plot_jobs)):
+        graph_files = render_figures(plot_jobs, workers=args.workers)
+    if getattr(args, "show_plots", False):
+        show_figures(plot_jobs)
+
+    # 13. 보고서 생성 (--profile이면 보고서 생성 전까지의 단계별 시간 표를 포함)
+    timing = profiler.records() if args.profile else None
+    report_file = _output_path(output_dir, f"CAN_analysis_report.{args.report_type}")
+    with profiler.stage("report", rows=len(anomalies)):
+        if args.report_type == "pdf":
+            # PDF 생성
+            generate_pdf_report(
+                analysis_results=stats,
+                graph_files=graph_files,
+                anomalies=anomalies,
+                evaluation_report=evaluation_report,
+                time_interval_stats=time_interval_stats,
+                diagnostics=diagnostics,  # 진단 결과 추가
+                cycle_time_stats=cycle_time_stats,
+                file_name=report_file,
+                report_type="with_graphs",
+                max_anomaly_rows=args.max_report_anomalies,
+                anomaly_file=anomaly_file,
+                anomaly_file_written=out_of_core,
+                timing=timing
+            )
+            print(f"Report generated as PDF: {report_file}")
+        elif args.report_type == "html":
+            # HTML 생성
+            generate_html_report(
+                analysis_results=stats,
+                graph_files=graph_files,
+                evaluation_report=evaluation_report,
+                time_interval_stats=time_interval_stats,
+                anomalies=anomalies,
+                diagnostics=diagnostics,  # 진단 결과 추가
+                cycle_time_stats=cycle_time_stats,
+                file_name=report_file,
+                max_anomaly_rows=args.max_report_anomalies,
+                anomaly_file=anomaly_file,
+                anomaly_file_written=out_of_core,
+                timing=timing
+            )
+            print(f"Report generated as HTML: {report_file}")
+
+    # 14. 단계별 실행 시간 요약 (--profile / --cprofile)
+    if args.profile:
+        print("Stage Timing:")
+        print(format_timing_table(profiler.records()))
+        profiler.save_json(_output_path(output_dir, args.profile_json))
+    profiler.save_cprofile()
+
+    return {
+        "log": args.file,
+        "frames": len(data),
+        "unique_ids": stats["Unique CAN IDs"],
+        "duration_s": float(data["Timestamp"].max() - data["Timestamp"].min()) if len(data) else 0.0,
+        "anomalies": len(anomalies),
+        "diagnostics": len(analysis["findings"]),
+        "report": report_file,
+    }
+
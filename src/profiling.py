@@ -0,0 +1,156 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 보고서/콘솔 타이밍 표의 컬럼
+TIMING_COLUMNS = ["Stage", "Wall (s)", "CPU (s)", "Peak RSS (MB)", "RSS Growth (MB)", "Rows"]
+
+
+def peak_rss_mb():
+    """
+    현재 프로세스의 최대 RSS (MB). resource 모듈이 없는 플랫폼에서는 None.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _cpu_seconds():
+    # 종료된 자식 프로세스 (--workers 프로세스 풀)의 CPU 시간도 포함
+    children = os.times()
+    return time.process_time() + children.children_user + children.children_system
+
+
+class StageProfiler:
+    """
+    파이프라인 단계별 wall 시간, CPU 시간, 최대 RSS, 처리 행 수를 기록.
+    최대 RSS는 프로세스 최대값이므로 단계가 끝난 시점의 값이며, RSS Growth는 그 단계에서 최대값이 늘어난 양
+    (메모리 최대치를 끌어올린 단계를 찾는 용도). 같은 이름의 단계가 여러 번 실행되면 시간과 행 수를 합산함.
+    """
+
+    def __init__(self, enabled=True, cprofile_path=None):
+        """
+        :param enabled: False이면 아무것도 측정하지 않음 (stage()는 빈 기록만 돌려줌)
+        :param cprofile_path: 주어지면 단계 실행 구간을 cProfile로 수집해 이 경로에 pstats 파일로 저장
+        """
+        self.enabled = enabled
+        self.cprofile_path = cprofile_path
+        self.stages = {}
+        self._profile = None
+        if enabled and cprofile_path:
+            import cProfile
+            self._profile = cProfile.Profile()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        with 블록 하나를 단계로 측정. 블록 안에서 record["rows"]에 처리 행 수를 넣을 수 있음.
+        :param name: 단계 이름
+        :param rows: 처리 행 수 (블록 안에서 정해지면 생략)
+        """
+        record = {"rows": rows}
+        if not self.enabled:
+            yield record
+            return
+
+        baseline = peak_rss_mb()
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if self._profile is not None:
+            self._profile.enable()
+        try:
+            yield record
+        finally:
+            if self._profile is not None:
+                self._profile.disable()
+            peak = peak_rss_mb()
+            self._add(name, time.perf_counter() - wall, _cpu_seconds() - cpu, peak,
+                      None if peak is None else peak - baseline, record["rows"])
+
+    def _add(self, name, wall, cpu, peak, growth, rows):
+        entry = self.stages.setdefault(name, {"stage": name, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                              "peak_rss_mb": None, "rss_growth_mb": None, "rows": None})
+        entry["calls"] += 1
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+        entry["peak_rss_mb"] = peak
+        if growth is not None:
+            entry["rss_growth_mb"] = (entry["rss_growth_mb"] or 0.0) + growth
+        if rows is not None:
+            entry["rows"] = (entry["rows"] or 0) + int(rows)
+
+    def records(self):
+        """
+        단계별 측정 결과 목록 (실행 순서).
+        """
+        return [dict(entry) for entry in self.stages.values()]
+
+    def total_wall_seconds(self):
+        return sum(entry["wall_s"] for entry in self.stages.values())
+
+    def save_json(self, file_name):
+        """
+        측정 결과를 JSON으로 저장.
+        """
+        with open(file_name, "w", encoding="utf-8") as file:
+            json.dump({"total_wall_s": self.total_wall_seconds(), "stages": self.records()}, file, indent=2)
+        print(f"Stage timing saved as {file_name}")
+
+    def save_cprofile(self, top=25):
+        """
+        cProfile 결과를 pstats 파일로 저장하고 누적 시간 상위 함수를 출력.
+        """
+        if self._profile is None:
+            return
+        import pstats
+
+        self._profile.dump_stats(self.cprofile_path)
+        print(f"cProfile stats saved as {self.cprofile_path} (top {top} by cumulative time):")
+        pstats.Stats(self._profile).sort_stats("cumulative").print_stats(top)
+
+
+def timing_rows(records):
+    """
+    측정 결과를 TIMING_COLUMNS 순서의 문자열 행 목록으로 변환 (콘솔/보고서 표 공용).
+    """
+    def megabytes(value):
+        return "n/a" if value is None else f"{value:.1f}"
+
+    return [[record["stage"] if record.get("calls", 1) == 1 else f"{record['stage']} (x{record['calls']})",
+             f"{record['wall_s']:.3f}", f"{record['cpu_s']:.3f}", megabytes(record["peak_rss_mb"]),
+             megabytes(record["rss_growth_mb"]), "" if record["rows"] is None else f"{record['rows']:,}"]
+            for record in records]
+
+
+def format_timing_table(records):
+    """
+    측정 결과를 고정 폭 텍스트 표로 변환.
+    """
+    rows = [TIMING_COLUMNS] + timing_rows(records)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(TIMING_COLUMNS))]
+    lines = ["  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in
+                       enumerate(zip(row, widths))) for row in rows]
+    lines.insert(1, "-" * len(lines[0]))
+    return "\n".join(lines)
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    import numpy as np
+
+    profiler = StageProfiler()
+    with profiler.stage("allocate") as stage:
+        values = np.ones(10_000_000)
+        stage["rows"] = len(values)
+    for _ in range(3):
+        with profiler.stage("sum", rows=len(values)):
+            values.sum()
+    print(format_timing_table(profiler.records()))
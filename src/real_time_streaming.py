@@ -1,69 +1,548 @@
 import sys
 import os
-import csv
+import argparse
+import asyncio
+import socket
 import time
-import pandas as pd  # pandas 추가
 
+import numpy as np
 
 # Add the parent directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.anomaly_detection import detect_anomalies
-from src.can_parser import parse_can_log
+from src.anomaly_detection import StreamingAnomalyDetector
+from src.can_parser import (
+    parse_can_log, format_can_id, payload_matrix, make_frame, frame_flags, frame_payload_width, message_flags
+)
+from src.payload_codec import PAYLOAD_WIDTH, FD_PAYLOAD_WIDTH, pack_payloads, length_to_dlc
+from src.data_analysis import summarize_block, merge_summaries, finalize_summary
+from src.diagnostic_rules import DEFAULT_RULES, compile_rules, load_rules
+from src.window_statistics import WindowStatistics, DEFAULT_BITRATE
 
 
-def simulate_streaming(file_path, interval=1.0):
+
+def wire_dtype(width=PAYLOAD_WIDTH):
     """
-    Simulates streaming by reading a CSV file line by line.
-    :param file_path: Path to the CAN log file.
-    :param interval: Time interval between each data row in seconds.
+    Binary wire format used by the UDP/TCP sources: one fixed-size little-endian record per frame.
+    flags carries the parse_can_log Flags bits (extended ID, FD, BRS, ESI, remote).
+    :param width: Payload bytes per record (8 for classic CAN = 24 bytes, 64 for CAN FD = 80 bytes).
+    """
+    return np.dtype([
+        ("timestamp", "<f8"),
+        ("can_id", "<u4"),
+        ("dlc", "u1"),
+        ("flags", "u1"),
+        ("reserved", "V2"),
+        ("data", "u1", (width,)),
+    ])
+
+
+WIRE_DTYPE = wire_dtype(PAYLOAD_WIDTH)
+FD_WIRE_DTYPE = wire_dtype(FD_PAYLOAD_WIDTH)
+
+# Default UDP/TCP port for live ingestion.
+DEFAULT_PORT = 29536
+
+# Frames held in the ring buffer between a source and the dispatcher.
+DEFAULT_RING_CAPACITY = 1 << 18
+
+# Frames handed to the consumers per batch.
+DEFAULT_BATCH_SIZE = 8192
+
+# Batches queued per consumer before the dispatcher (and so the source) waits.
+DEFAULT_QUEUE_SIZE = 8
+
+# Longest single sleep while pacing a replay, so long gaps stay responsive to cancellation.
+_MAX_REPLAY_SLEEP = 0.1
+
+
+def frames_to_records(df, dtype=None):
+    """
+    Converts a frame DataFrame into wire-format records.
+    :param df: CAN log DataFrame (parse_can_log columns).
+    :param dtype: Wire dtype (default: FD_WIRE_DTYPE for logs with FD payload columns, else WIRE_DTYPE).
+    :return: Structured array of the wire dtype.
+    """
+    if dtype is None:
+        dtype = FD_WIRE_DTYPE if frame_payload_width(df) > PAYLOAD_WIDTH else WIRE_DTYPE
+    records = np.zeros(len(df), dtype=dtype)
+    records["timestamp"] = df["Timestamp"].to_numpy()
+    records["can_id"] = df["CAN_ID"].to_numpy()
+    records["dlc"] = df["DLC"].to_numpy()
+    records["flags"] = frame_flags(df)
+    records["data"] = payload_matrix(df, dtype["data"].shape[0])
+    return records
+
+
+def convert_records(records, dtype):
+    """
+    Converts records between the classic and FD wire dtypes (payloads are padded or truncated).
+    """
+    if records.dtype == dtype:
+        return records
+    converted = np.zeros(len(records), dtype=dtype)
+    for name in ["timestamp", "can_id", "dlc", "flags"]:
+        converted[name] = records[name]
+    width = min(records.dtype["data"].shape[0], dtype["data"].shape[0])
+    converted["data"][:, :width] = records["data"][:, :width]
+    return converted
+
+
+def records_to_frame(records):
+    """
+    Converts wire-format records back into a frame DataFrame (same dtypes as parse_can_log).
+    """
+    return make_frame(records["timestamp"], records["can_id"], records["dlc"], records["data"], records["flags"])
+
+
+def encode_frames(df):
+    """
+    Encodes frames into the binary wire format sent to the UDP/TCP sources.
+    """
+    return frames_to_records(df).tobytes()
+
+
+def decode_frames(buffer, dtype=WIRE_DTYPE):
+    """
+    Decodes a wire-format buffer into records without copying.
+    Trailing bytes that do not form a whole record are ignored.
+    """
+    usable = len(buffer) - len(buffer) % dtype.itemsize
+    return np.frombuffer(buffer, dtype=dtype, count=usable // dtype.itemsize)
+
+
+class FrameRingBuffer:
+    """
+    Bounded ring buffer of wire-format records between one source and one dispatcher.
+    put() waits while the buffer is full, so a slow consumer slows the source down
+    instead of growing memory.
+    """
+
+    def __init__(self, capacity=DEFAULT_RING_CAPACITY, dtype=WIRE_DTYPE):
+        self.capacity = capacity
+        self.dtype = dtype
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._head = 0
+        self._size = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+    def __len__(self):
+        return self._size
+
+    async def put(self, records):
+        """
+        Appends records, waiting for free space as needed.
+        """
+        records = convert_records(records, self.dtype)
+        offset = 0
+        while offset < len(records):
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._size < self.capacity)
+                count = min(len(records) - offset, self.capacity - self._size)
+                tail = (self._head + self._size) % self.capacity
+                first = min(count, self.capacity - tail)
+                self._buffer[tail:tail + first] = records[offset:offset + first]
+                self._buffer[:count - first] = records[offset + first:offset + count]
+                self._size += count
+                offset += count
+                self._changed.notify_all()
+
+    async def get(self, max_frames):
+        """
+        Removes up to max_frames records, waiting while the buffer is empty.
+        :return: Structured array of records, or None once the buffer is closed and drained.
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._size or self._closed)
+            if not self._size:
+                return None
+            count = min(max_frames, self._size)
+            first = min(count, self.capacity - self._head)
+            records = np.concatenate([self._buffer[self._head:self._head + first], self._buffer[:count - first]])
+            self._head = (self._head + count) % self.capacity
+            self._size -= count
+            self._changed.notify_all()
+            return records
+
+    async def close(self):
+        """
+        Marks the end of the stream; get() returns None after the remaining records.
+        """
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+async def replay_source(data, speed=1.0, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Replays a CAN log with its original timing.
+    :param data: CAN log DataFrame or path to a log file.
+    :param speed: Replay speed multiplier (2.0 = twice as fast). None or 0 replays as fast as possible.
+    :param batch_size: Maximum frames yielded at once.
+    """
+    if not hasattr(data, "columns"):
+        data = parse_can_log(data)
+        if data is None:
+            return
+    timestamps = data["Timestamp"].to_numpy()
+    loop = asyncio.get_running_loop()
+    start_wall, start_log = loop.time(), timestamps[0] if len(timestamps) else 0.0
+
+    position = 0
+    while position < len(data):
+        end = min(position + batch_size, len(data))
+        if speed:
+            # Frames whose log time has already been reached on the scaled wall clock
+            log_now = start_log + (loop.time() - start_wall) * speed
+            due = int(np.searchsorted(timestamps, log_now, side="right"))
+            if due <= position:
+                await asyncio.sleep(min((timestamps[position] - log_now) / speed, _MAX_REPLAY_SLEEP))
+                continue
+            end = min(end, due)
+        yield frames_to_records(data.iloc[position:end])
+        position = end
+
+
+async def udp_source(host="127.0.0.1", port=DEFAULT_PORT, queue_size=1024, fd=False):
     """
+    Receives wire-format frames over UDP. Each datagram holds one or more records;
+    an empty datagram ends the stream. UDP has no flow control, so datagrams that
+    arrive while the queue is full are dropped and counted.
+    :param fd: Expect FD_WIRE_DTYPE records instead of WIRE_DTYPE.
+    """
+    dtype = FD_WIRE_DTYPE if fd else WIRE_DTYPE
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(queue_size)
+
+    class _Protocol(asyncio.DatagramProtocol):
+        dropped = 0
+
+        def datagram_received(self, datagram, address):
+            try:
+                queue.put_nowait(datagram)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    transport, protocol = await loop.create_datagram_endpoint(_Protocol, local_addr=(host, port))
+    try:
+        transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+    except OSError:
+        pass
     try:
-        with open(file_path, "r") as file:
-            reader = csv.DictReader(file)
+        while True:
+            datagram = await queue.get()
+            if not datagram:
+                break
+            yield decode_frames(datagram, dtype)
+    finally:
+        transport.close()
+        if protocol.dropped:
+            print(f"[WARNING] Dropped {protocol.dropped} UDP datagrams (consumers too slow).")
 
-            print("[INFO] Starting real-time CAN data stream simulation...")
-            print("-" * 50)
 
-            for row in reader:
-                print(f"[INFO] New Data: {row}")
+async def tcp_source(host="127.0.0.1", port=DEFAULT_PORT, max_connections=None, read_size=1 << 16, fd=False):
+    """
+    Receives a wire-format frame stream over TCP. Records may be split across reads.
+    Reading pauses while the pipeline is full, so TCP flow control throttles the sender.
+    :param max_connections: Ends the stream after this many clients have disconnected (None = serve forever).
+    :param fd: Expect FD_WIRE_DTYPE records instead of WIRE_DTYPE.
+    """
+    dtype = FD_WIRE_DTYPE if fd else WIRE_DTYPE
+    queue = asyncio.Queue(DEFAULT_QUEUE_SIZE)
 
-                # Process data for anomaly detection
-                data_row = {
-                    "Timestamp": float(row["Timestamp"]),
-                    "CAN_ID": row["CAN_ID"],
-                    "DLC": int(row["DLC"]),
-                    "Data": row["Data"]
-                }
+    async def handle(reader, writer):
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(read_size)
+                if not chunk:
+                    break
+                pending += chunk
+                records = decode_frames(pending, dtype)
+                if len(records):
+                    pending = pending[records.nbytes:]
+                    await queue.put(records)
+        finally:
+            writer.close()
+            await queue.put(None)
 
-                # Convert the single row to a DataFrame
-                df_row = pd.DataFrame([data_row])
+    server = await asyncio.start_server(handle, host, port)
+    closed = 0
+    try:
+        while max_connections is None or closed < max_connections:
+            records = await queue.get()
+            if records is None:
+                closed += 1
+                continue
+            yield records
+    finally:
+        server.close()
 
-                try:
-                    # Anomaly detection
-                    detected_data = detect_anomalies(df_row)
-                    print(f"[DEBUG] Detected anomalies: {detected_data}")  # 디버깅 추가
-                    anomaly_flag = detected_data.iloc[0]["Anomaly"]  # 첫 번째 행의 Anomaly 값 확인
 
-                    if anomaly_flag == -1:
-                        print(
-                            f"[WARNING] Anomaly detected at Timestamp {data_row['Timestamp']}: CAN ID {data_row['CAN_ID']}"
-                        )
-                except Exception as e:
-                    print(f"[ERROR] Anomaly detection failed: {e}")
+async def socketcan_source(channel="vcan0", interface="socketcan", batch_size=DEFAULT_BATCH_SIZE, fd=False):
+    """
+    Receives frames from a live bus through python-can (SocketCAN by default, e.g. vcan0 for testing).
+    Messages already queued are drained together into one batch.
+    :param fd: Open the bus in CAN FD mode and yield FD_WIRE_DTYPE records.
+    """
+    dtype = FD_WIRE_DTYPE if fd else WIRE_DTYPE
+    try:
+        import can
+    except ImportError as e:
+        raise ImportError("SocketCAN ingestion requires python-can: pip install python-can") from e
 
-                # Wait for the next interval
-                time.sleep(interval)
+    bus = can.Bus(channel=channel, interface=interface, fd=fd)
+    reader = can.AsyncBufferedReader()
+    notifier = can.Notifier(bus, [reader], loop=asyncio.get_running_loop())
+    try:
+        while True:
+            messages = [await reader.get_message()]
+            while len(messages) < batch_size and not reader.buffer.empty():
+                messages.append(reader.buffer.get_nowait())
+            messages = [message for message in messages if not message.is_error_frame]
+            records = np.zeros(len(messages), dtype=dtype)
+            records["timestamp"] = [message.timestamp for message in messages]
+            records["can_id"] = [message.arbitration_id for message in messages]
+            # python-can reports the byte count, FD frames are stored as DLC codes
+            records["dlc"] = [int(length_to_dlc(len(message.data))) if message.is_fd else message.dlc
+                              for message in messages]
+            records["flags"] = [message_flags(message) for message in messages]
+            records["data"] = pack_payloads([message.data for message in messages], dtype["data"].shape[0])
+            yield records
+    finally:
+        notifier.stop()
+        bus.shutdown()
 
-    except FileNotFoundError:
-        print(f"[ERROR] File not found: {file_path}")
-    except Exception as e:
-        print(f"[ERROR] An error occurred: {e}")
+
+async def run_pipeline(source, consumers, batch_size=DEFAULT_BATCH_SIZE, ring_capacity=DEFAULT_RING_CAPACITY,
+                       queue_size=DEFAULT_QUEUE_SIZE, fd=False):
+    """
+    Runs a source through a bounded ring buffer and fans each decoded batch out to every consumer.
+    Each consumer has its own bounded queue; when any queue is full the dispatcher waits,
+    the ring buffer fills and the source is paused (backpressure end to end).
+    :param source: Async iterator of wire-format records (e.g. replay_source, udp_source).
+    :param consumers: Callables taking a frame DataFrame batch (may be coroutine functions).
+    :param fd: Keep 64-byte CAN FD payloads in the ring buffer (classic records are padded).
+    :return: Dict with frames, batches, elapsed seconds and frames_per_second.
+    """
+    ring = FrameRingBuffer(ring_capacity, FD_WIRE_DTYPE if fd else WIRE_DTYPE)
+    queues = [asyncio.Queue(queue_size) for _ in consumers]
+    totals = {"frames": 0, "batches": 0}
+
+    async def produce():
+        try:
+            async for records in source:
+                await ring.put(records)
+                # Let the dispatcher run even when the ring never fills
+                await asyncio.sleep(0)
+        finally:
+            await ring.close()
+
+    async def dispatch():
+        while True:
+            records = await ring.get(batch_size)
+            if records is None:
+                break
+            frame = records_to_frame(records)
+            totals["frames"] += len(frame)
+            totals["batches"] += 1
+            for queue in queues:
+                await queue.put(frame)
+        for queue in queues:
+            await queue.put(None)
+
+    async def consume(consumer, queue):
+        while True:
+            frame = await queue.get()
+            if frame is None:
+                break
+            result = consumer(frame)
+            if asyncio.iscoroutine(result):
+                await result
+
+    start = time.perf_counter()
+    await asyncio.gather(produce(), dispatch(), *(consume(c, q) for c, q in zip(consumers, queues)))
+    elapsed = time.perf_counter() - start
+    totals["elapsed"] = elapsed
+    totals["frames_per_second"] = totals["frames"] / elapsed if elapsed > 0 else float("inf")
+    return totals
+
+
+class AnomalyConsumer:
+    """
+    Scores each batch with a StreamingAnomalyDetector and keeps the anomalous frames.
+    Prints one line per batch that contains anomalies, never one per frame.
+    """
+
+    def __init__(self, detector, warmup_frames=0, max_kept=100_000):
+        """
+        :param detector: StreamingAnomalyDetector (already fitted unless warmup_frames > 0).
+        :param warmup_frames: Number of leading stream frames used to train the detector before scoring.
+        :param max_kept: Maximum number of anomalous frames kept in memory.
+        """
+        self.detector = detector
+        self.warmup_frames = warmup_frames
+        self.max_kept = max_kept
+        self.scored = 0
+        self.anomaly_count = 0
+        self.anomalies = []
+        self._kept = 0
+
+    def __call__(self, frame):
+        if self.warmup_frames > 0:
+            warmup, frame = frame.iloc[:self.warmup_frames], frame.iloc[self.warmup_frames:]
+            self.detector.partial_fit(warmup)
+            self.warmup_frames -= len(warmup)
+            if len(frame) == 0:
+                return
+
+        scored = self.detector.score_batch(frame)
+        self.scored += len(scored)
+        anomalies = scored[scored["Anomaly"] == -1]
+        if len(anomalies) == 0:
+            return
+        self.anomaly_count += len(anomalies)
+        if self._kept < self.max_kept:
+            self.anomalies.append(anomalies.iloc[:self.max_kept - self._kept])
+            self._kept += len(self.anomalies[-1])
+        timestamps = anomalies["Timestamp"].to_numpy()
+        print(f"[WARNING] {len(anomalies)} anomalies between Timestamp {timestamps[0]} and {timestamps[-1]} "
+              f"(first: CAN ID {format_can_id(anomalies['CAN_ID'].iloc[0])}, score {anomalies['Score'].iloc[0]:.2f})")
+
+
+class SummaryConsumer:
+    """
+    Folds each batch into the mergeable analysis summary used by run_analysis,
+    so statistics, frequency, interval results and rule findings are available for the stream so far.
+    """
+
+    def __init__(self, rules=None):
+        """
+        :param rules: Diagnostic rule dictionaries (diagnostic_rules.load_rules). None uses DEFAULT_RULES.
+        """
+        self.rules = compile_rules(DEFAULT_RULES if rules is None else rules)
+        self.summary = None
+
+    def __call__(self, frame):
+        block = summarize_block(frame, self.rules)
+        self.summary = block if self.summary is None else merge_summaries(self.summary, block)
+
+    def result(self):
+        """
+        :return: finalize_summary result for all frames seen, or None before the first batch.
+        """
+        return finalize_summary(self.summary) if self.summary is not None else None
+
+
+def print_window(result):
+    """
+    Prints one summary line (plus diagnostics) per closed WindowStatistics window.
+    """
+    stats = result["statistics"]
+    print(f"[WINDOW] {result['window_start']:.3f}-{result['window_end']:.3f}s: {stats['Total Messages']} frames, "
+          f"{stats['Unique CAN IDs']} IDs, bus load {result['bus_load']:.1%}")
+    for diagnostic in result["diagnostics"]:
+        print(f"[WINDOW]   {diagnostic}")
+
+
+def simulate_streaming(file_path, speed=1.0, baseline_file=None, baseline_size=1000, batch_size=DEFAULT_BATCH_SIZE,
+                       consumers=()):
+    """
+    Simulates streaming by replaying a CAN log through the asyncio pipeline.
+    The detector is trained once on a baseline window and then scores each batch
+    against the learned per-ID period, DLC and payload statistics.
+    :param file_path: Path to the CAN log file.
+    :param speed: Replay speed multiplier relative to the log timestamps (None = as fast as possible).
+    :param baseline_file: Known-good log used for training (optional).
+    :param baseline_size: Number of leading frames used for training when no baseline file is given.
+    :param batch_size: Frames per analysis batch.
+    :param consumers: Additional consumers fed the same batches (e.g. a WindowStatistics).
+    :return: (AnomalyConsumer, pipeline totals), or None if a log cannot be read.
+    """
+    data = parse_can_log(file_path)
+    if data is None:
+        print(f"[ERROR] Failed to load CAN log: {file_path}")
+        return None
+
+    detector = StreamingAnomalyDetector()
+    if baseline_file:
+        baseline = parse_can_log(baseline_file)
+        if baseline is None:
+            print(f"[ERROR] Failed to load baseline log: {baseline_file}")
+            return None
+    else:
+        baseline, data = data.iloc[:baseline_size], data.iloc[baseline_size:]
+    detector.fit(baseline)
+    if baseline_file:
+        detector.reset_stream()
+    print(f"[INFO] Detector trained on {len(baseline)} baseline frames.")
+
+    print("[INFO] Starting real-time CAN data stream simulation...")
+    anomalies = AnomalyConsumer(detector)
+    totals = asyncio.run(run_pipeline(replay_source(data, speed=speed, batch_size=batch_size), [anomalies, *consumers],
+                                      batch_size=batch_size, fd=frame_payload_width(data) > PAYLOAD_WIDTH))
+    print(f"[INFO] Streamed {totals['frames']} frames in {totals['elapsed']:.2f}s "
+          f"({totals['frames_per_second']:.0f} frames/s), {anomalies.anomaly_count} anomalies.")
+    return anomalies, totals
 
 
 if __name__ == "__main__":
-    # Path to the CAN log file
-    file_path = os.path.join(os.path.dirname(__file__), "../data/sample_can_log.csv")
+    parser = argparse.ArgumentParser(description="CANalyzer real-time streaming")
+    parser.add_argument("--source", choices=["replay", "udp", "tcp", "socketcan"], default="replay",
+                        help="Frame source")
+    parser.add_argument("--file", type=str, default=os.path.join(os.path.dirname(__file__), "../data/sample_can_log.csv"),
+                        help="CAN log to replay (replay source)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (0 = as fast as possible)")
+    parser.add_argument("--baseline", type=str, default=None, help="Known-good log used to train the detector")
+    parser.add_argument("--warmup", type=int, default=1000,
+                        help="Without --baseline, train on this many leading frames of the stream")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="UDP/TCP listen address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="UDP/TCP listen port")
+    parser.add_argument("--channel", type=str, default="vcan0", help="SocketCAN channel")
+    parser.add_argument("--interface", type=str, default="socketcan", help="python-can interface")
+    parser.add_argument("--window", type=float, default=None, help="Print live statistics per window of this length (s)")
+    parser.add_argument("--step", type=float, default=None, help="Sliding window step (s, default: tumbling windows)")
+    parser.add_argument("--bitrate", type=int, default=DEFAULT_BITRATE, help="Bus bitrate for the bus-load estimate")
+    parser.add_argument("--data-bitrate", type=int, default=None,
+                        help="CAN FD data-phase bitrate for frames with bit rate switching (default: --bitrate)")
+    parser.add_argument("--fd", action="store_true", help="Receive CAN FD frames (UDP/TCP/SocketCAN sources)")
+    parser.add_argument("--rules", type=str, default=None,
+                        help="JSON/YAML diagnostic rule file evaluated over the live stream and each --window "
+                             "(default: built-in bus checks)")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules) if args.rules else None
+    windows = []
+    if args.window:
+        windows.append(WindowStatistics(args.window, args.step, bitrate=args.bitrate, on_window=print_window,
+                                        data_bitrate=args.data_bitrate, rules=rules))
 
-    # Simulate streaming with a 1-second interval
-    simulate_streaming(file_path, interval=1.0)
+    if args.source == "replay":
+        # Replay the log; without a baseline log the leading frames train the detector and are not scored
+        simulate_streaming(args.file, speed=args.speed, baseline_file=args.baseline, baseline_size=args.warmup,
+                           consumers=windows)
+    else:
+        detector = StreamingAnomalyDetector()
+        warmup = args.warmup
+        if args.baseline:
+            detector.fit(parse_can_log(args.baseline))
+            warmup = 0
+        sources = {
+            "udp": lambda: udp_source(args.host, args.port, fd=args.fd),
+            "tcp": lambda: tcp_source(args.host, args.port, fd=args.fd),
+            "socketcan": lambda: socketcan_source(args.channel, args.interface, fd=args.fd),
+        }
+        summary = SummaryConsumer(rules)
+        anomalies = AnomalyConsumer(detector, warmup_frames=warmup)
+        try:
+            totals = asyncio.run(run_pipeline(sources[args.source](), [anomalies, summary, *windows], fd=args.fd))
+            print(f"[INFO] Received {totals['frames']} frames ({totals['frames_per_second']:.0f} frames/s), "
+                  f"{anomalies.anomaly_count} anomalies.")
+        except KeyboardInterrupt:
+            print("[INFO] Stream stopped.")
+        result = summary.result()
+        if result is not None:
+            print(result["statistics"])
+            for diagnostic in result["diagnostics"]:
+                print(f"[DIAGNOSTIC] {diagnostic}")
@@ -1,5 +1,7 @@
 import os
 import sys
+import numpy as np
+import pandas as pd
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
@@ -8,6 +10,159 @@ from reportlab.lib import colors
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from reportlab.platypus import KeepTogether
+from src.can_parser import format_can_id, payload_matrix, payload_lengths, payload_columns, PAYLOAD_COLUMNS
+from src.payload_codec import encode_hex_payloads, FD_PAYLOAD_WIDTH
+from src.profiling import TIMING_COLUMNS, timing_rows
+
+# 보고서 본문에 직접 넣는 최대 이상치 행 수 (넘으면 ID별 요약 + 전체 표는 별도 파일)
+MAX_INLINE_ANOMALIES = 500
+
+# 이상치 요약 표에 표시하는 CAN ID 수 (이상치가 많은 순)
+TOP_ANOMALY_IDS = 20
+
+# PDF 표 하나에 넣는 행 수 (큰 표를 여러 페이지의 작은 표로 나눠서 배치 시간을 행 수에 비례하게 유지)
+PDF_TABLE_CHUNK = 200
+
+# 별도 파일/HTML에 한 번에 변환해서 쓰는 행 수
+WRITE_CHUNK = 100_000
+
+# 그래프 파일 이름별 PDF 보고서 제목
+GRAPH_TITLES = {
+    "frequency_plot.png": "Message Frequency by CAN ID",
+    "anomalies_plot.png": "Anomaly Detection Results",
+    "message_frequency_over_time.png": "Message Frequency Over Time",
+    "time_interval_plot.png": "Message Time Intervals",
+    "signals_plot.png": "Decoded Signals",
+}
+
+
+def _anomaly_data(anomalies):
+    """
+    이상치 페이로드를 16진수 문자열 배열로 변환 (페이로드 컬럼이 없으면 빈 문자열).
+    """
+    if all(column in anomalies.columns for column in PAYLOAD_COLUMNS):
+        return encode_hex_payloads(payload_matrix(anomalies), payload_lengths(anomalies))
+    return np.full(len(anomalies), "", dtype=object)
+
+
+def _anomaly_rows(anomalies):
+    """
+    이상 탐지 결과를 보고서 표 행 (Timestamp, CAN_ID, DLC, Data)으로 변환.
+    페이로드는 보고서를 쓸 때만 16진수 문자열로 변환함 (DLC가 나타내는 바이트 수까지, FD는 최대 64바이트).
+    """
+    data = _anomaly_data(anomalies)
+    return [
+        [timestamp, format_can_id(can_id), int(dlc), payload]
+        for timestamp, can_id, dlc, payload in zip(
+            anomalies["Timestamp"].to_numpy(), anomalies["CAN_ID"].to_numpy(), anomalies["DLC"].to_numpy(), data)
+    ]
+
+
+def select_inline_anomalies(anomalies, max_rows=MAX_INLINE_ANOMALIES):
+    """
+    보고서 본문에 넣을 이상치 행을 선택. max_rows 이하이면 전체, 넘으면 CAN ID마다 같은 수의 행을
+    그 ID의 이상치 전체에 고르게 퍼지도록 골라 한 ID가 표를 독차지하지 않게 함.
+    :return: 시간 순으로 정렬된 이상치 데이터프레임 (최대 max_rows 행)
+    """
+    if len(anomalies) <= max_rows:
+        return anomalies
+    per_id = max(max_rows // max(anomalies["CAN_ID"].nunique(), 1), 1)
+    groups = anomalies.groupby("CAN_ID", sort=False)
+    position = groups.cumcount().to_numpy()
+    size = groups["CAN_ID"].transform("size").to_numpy()
+    # ID별 행을 per_id개 구간으로 나눠 구간마다 첫 행을 고름 (per_id 이하인 ID는 전체)
+    stratum = position * per_id // size
+    keep = (position == 0) | (stratum != (position - 1) * per_id // size)
+    return anomalies[keep].sort_values("Timestamp", kind="stable").iloc[:max_rows]
+
+
+def summarize_anomalies(anomalies, top=TOP_ANOMALY_IDS):
+    """
+    CAN ID별 이상치 수와 처음/마지막 발생 시각 (이상치가 많은 top개 ID).
+    :return: CAN_ID 인덱스, Count, First, Last 컬럼 데이터프레임
+    """
+    summary = anomalies.groupby("CAN_ID")["Timestamp"].agg(["count", "min", "max"])
+    summary.columns = ["Count", "First", "Last"]
+    return summary.sort_values("Count", ascending=False, kind="stable").head(top)
+
+
+def anomaly_table(anomalies):
+    """
+    이상치 프레임을 파일 저장용 표 (Timestamp, 16진수 CAN_ID, DLC, Data, 그 외 Score 등 추가 컬럼)로 변환.
+    """
+    skipped = {"Timestamp", "CAN_ID", "DLC", "Flags", "Anomaly", *payload_columns(FD_PAYLOAD_WIDTH)}
+    extra = [column for column in anomalies.columns if column not in skipped]
+    return pd.DataFrame({
+        "Timestamp": anomalies["Timestamp"].to_numpy(),
+        "CAN_ID": [format_can_id(can_id) for can_id in anomalies["CAN_ID"].to_numpy()],
+        "DLC": anomalies["DLC"].to_numpy(),
+        "Data": _anomaly_data(anomalies),
+        **{column: anomalies[column].to_numpy() for column in extra},
+    })
+
+
+def import_pyarrow():
+    """
+    Parquet 파일 저장에 필요한 pyarrow를 import (없으면 설치 방법을 담은 ImportError).
+    분석/점수 계산 전에 호출하면 중간에 실패해 일부만 쓴 파일이 남지 않음.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet 파일을 쓰려면 pyarrow가 필요합니다: pip install pyarrow") from e
+    return pyarrow
+
+
+def write_anomaly_table(anomalies, file_name):
+    """
+    전체 이상치 표를 CSV 또는 Parquet 파일로 저장 (확장자로 판별, Parquet은 pyarrow 필요).
+    CSV는 WRITE_CHUNK 행씩 변환해서 이어 쓰므로 메모리가 이상치 수에 비례해 늘지 않음.
+    :param anomalies: 이상치 데이터프레임
+    :param file_name: 저장할 파일 경로 (.csv / .parquet)
+    :return: file_name
+    """
+    if file_name.lower().endswith(".parquet"):
+        import_pyarrow()
+        anomaly_table(anomalies).to_parquet(file_name, index=False)
+    else:
+        for start in range(0, max(len(anomalies), 1), WRITE_CHUNK):
+            anomaly_table(anomalies.iloc[start:start + WRITE_CHUNK]).to_csv(
+                file_name, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    print(f"Anomaly table saved as {file_name}")
+    return file_name
+
+
+def _prepare_anomalies(anomalies, report_file, max_rows, anomaly_file, anomaly_file_written=False):
+    """
+    보고서 본문용 이상치 행과 ID별 요약, 전체 표 파일을 준비.
+    이상치가 max_rows를 넘거나 anomaly_file이 주어지면 전체 표를 별도 파일로 저장함
+    (기본 경로: <보고서 이름>_anomalies.csv). anomaly_file_written이면 이미 저장된 anomaly_file을 그대로 가리킴.
+    :return: (본문 이상치, 요약 또는 None, 전체 표 파일 경로 또는 None)
+    """
+    truncated = len(anomalies) > max_rows
+    if truncated and anomaly_file is None:
+        anomaly_file = f"{os.path.splitext(report_file)[0]}_anomalies.csv"
+    if anomaly_file is not None and not anomaly_file_written:
+        write_anomaly_table(anomalies, anomaly_file)
+    if not truncated:
+        return anomalies, None, anomaly_file
+    return select_inline_anomalies(anomalies, max_rows), summarize_anomalies(anomalies), anomaly_file
+
+
+def graph_title(graph_file):
+    """
+    그래프 파일 이름에 맞는 보고서 제목 (알 수 없는 파일은 파일 이름으로 만듦).
+    """
+    name = os.path.basename(graph_file)
+    return GRAPH_TITLES.get(name, os.path.splitext(name)[0].replace("_", " ").title())
+
+
+def _report_link(path, report_file):
+    """
+    HTML 보고서에 넣을 경로 (보고서 파일이 있는 디렉토리 기준 상대 경로).
+    """
+    return os.path.relpath(os.path.abspath(path), os.path.dirname(os.path.abspath(report_file)))
 
 
 def generate_pdf_report(
@@ -17,11 +172,18 @@ def generate_pdf_report(
         evaluation_report=None,
         time_interval_stats=None,
         diagnostics=None,  # Diagnostics 추가
+        cycle_time_stats=None,  # CAN ID별 주기 통계
         file_name="report.pdf",
-        report_type="basic"
+        report_type="basic",
+        max_anomaly_rows=MAX_INLINE_ANOMALIES,
+        anomaly_file=None,
+        anomaly_file_written=False,  # anomaly_file이 이미 저장되어 있으면 True (다시 쓰지 않음)
+        timing=None  # 단계별 실행 시간 (StageProfiler.records())
 ):
     """
     통합 PDF 보고서를 생성합니다.
+    이상치가 max_anomaly_rows를 넘으면 본문에는 CAN ID별 요약과 일부 행만 넣고 전체 표는 anomaly_file
+    (기본 <보고서 이름>_anomalies.csv)에 저장합니다. 이상치 표는 PDF_TABLE_CHUNK 행씩 나눠서 페이지를 넘깁니다.
     """
     try:
         from reportlab.platypus import PageBreak
@@ -52,19 +214,44 @@ def generate_pdf_report(
 
         # 3. Detected Anomalies
         if report_type in ["with_anomalies", "with_graphs"] and anomalies is not None:
-            table_data = [["Timestamp", "CAN_ID", "DLC"]] + [
-                [row["Timestamp"], row["CAN_ID"], row["DLC"]] for _, row in anomalies.iterrows()
-            ]
-            table = Table(table_data, colWidths=[150, 150, 150])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d3d3d3")),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-            ]))
-            story.append(KeepTogether([Paragraph("Detected Anomalies:", styles['Heading2']), table]))
+            inline, summary, anomaly_file = _prepare_anomalies(anomalies, file_name, max_anomaly_rows, anomaly_file,
+                                                              anomaly_file_written)
+            heading = [Paragraph("Detected Anomalies:", styles['Heading2'])]
+            if summary is not None:
+                heading.append(Paragraph(
+                    f"{len(anomalies)} anomalies in {anomalies['CAN_ID'].nunique()} CAN IDs. "
+                    f"Showing {len(inline)} rows; the full table is in {anomaly_file}.", styles['Normal']))
+                summary_table = Table(
+                    [["CAN_ID", "Count", "First", "Last"]] + [
+                        [format_can_id(can_id), int(count), f"{first:.6f}", f"{last:.6f}"]
+                        for can_id, count, first, last in zip(summary.index, summary["Count"].to_numpy(),
+                                                              summary["First"].to_numpy(), summary["Last"].to_numpy())
+                    ], repeatRows=1)
+                summary_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d3d3d3")),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+                ]))
+                heading += [summary_table, Spacer(1, 10)]
+
+            # 행이 많아도 표 하나를 한 페이지에 맞추려 하지 않도록 PDF_TABLE_CHUNK 행씩 나눈 표를 이어 붙임
+            rows = _anomaly_rows(inline)
+            tables = []
+            for start in range(0, max(len(rows), 1), PDF_TABLE_CHUNK):
+                table = Table([["Timestamp", "CAN_ID", "DLC", "Data"]] + rows[start:start + PDF_TABLE_CHUNK],
+                              colWidths=[100, 80, 50, 220], repeatRows=1)
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d3d3d3")),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+                ]))
+                tables.append(table)
+            story.append(KeepTogether(heading + tables[:1]))
+            story += tables[1:]
             story.append(Spacer(1, 20))
 
         # 4. Time Interval Statistics
@@ -74,17 +261,46 @@ def generate_pdf_report(
                 story.append(Paragraph(f"{key}: {value:.6f} seconds", styles['Normal']))
             story.append(Spacer(1, 20))
 
+        # 4-1. Per-ID Cycle Time Statistics
+        if cycle_time_stats is not None and not cycle_time_stats.empty:
+            table_data = [["CAN_ID", "Count", "Period", "Std", "P99 Jitter", "Late", "Missed"]] + [
+                [format_can_id(can_id), int(row["Count"]), f"{row['Expected Period']:.6f}", f"{row['Std Interval']:.6f}",
+                 f"{row['P99 Jitter']:.6f}", int(row["Late Frames"]), int(row["Missed Frames"])]
+                for can_id, row in cycle_time_stats.iterrows()
+            ]
+            table = Table(table_data, repeatRows=1)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d3d3d3")),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+            ]))
+            story.append(Paragraph("Per-ID Cycle Time Statistics:", styles['Heading2']))
+            story.append(table)
+            story.append(Spacer(1, 20))
+
         # 5. Data Quality Evaluation
         if evaluation_report:
             story.append(Paragraph("Data Quality Evaluation:", styles['Heading2']))
             story.append(Paragraph(evaluation_report.replace("\n", "<br />"), styles['Normal']))
             story.append(Spacer(1, 20))
 
+        # 5-1. Stage Timing (--profile)
+        if timing:
+            table = Table([TIMING_COLUMNS] + timing_rows(timing), repeatRows=1)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#d3d3d3")),
+                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+            ]))
+            story.append(KeepTogether([Paragraph("Stage Timing:", styles['Heading2']), table]))
+            story.append(Spacer(1, 20))
+
         # 6. Graphs
         if report_type in ["with_graphs", "with_anomalies"] and graph_files:
-            graph_titles = ["Message Frequency by CAN ID", "Anomaly Detection Results", "Message Frequency Over Time",
-                            "Message Time Intervals"]
-            for title, graph_file in zip(graph_titles, graph_files):
+            for graph_file in graph_files:
+                title = graph_title(graph_file)
                 if os.path.exists(graph_file):
                     graph_group = KeepTogether([
                         Paragraph(title, styles['Heading3']),
@@ -109,68 +325,118 @@ def generate_html_report(
         time_interval_stats=None,  # 시간 간격 통계 추가
         anomalies=None,  # 이상 탐지 결과 추가
         diagnostics=None,  # Diagnostics 추가
-        file_name="report.html"
+        cycle_time_stats=None,  # CAN ID별 주기 통계
+        file_name="report.html",
+        max_anomaly_rows=MAX_INLINE_ANOMALIES,
+        anomaly_file=None,
+        anomaly_file_written=False,  # anomaly_file이 이미 저장되어 있으면 True (다시 쓰지 않음)
+        timing=None  # 단계별 실행 시간 (StageProfiler.records())
 ):
     """
     HTML 보고서를 생성합니다.
+    조각 문자열을 목록에 모았다가 파일에 한 번에 쓰고, 이상치가 max_anomaly_rows를 넘으면
+    CAN ID별 요약과 일부 행만 넣고 전체 표는 anomaly_file (기본 <보고서 이름>_anomalies.csv)에 저장합니다.
     """
     try:
+        html = []
+        # HTML 시작
+        html.append("<html><head><title>CAN Analysis Report</title></head><body>")
+        html.append("<h1>CAN Analysis Report</h1>")
+
+        # 1. Diagnostics Summary
+        if diagnostics:
+            html.append("<h2>Diagnostics Summary:</h2>")
+            html.append("<ul>")
+            for diagnostic in diagnostics:
+                html.append(f"<li>{diagnostic}</li>")
+            html.append("</ul>")
+
+        # 2. Analysis Results
+        html.append("<h2>Analysis Results:</h2>")
+        html.append("<table border='1' style='border-collapse: collapse; width: 50%;'>")
+        html.append("<tr><th>Metric</th><th>Value</th></tr>")
+        for key, value in analysis_results.items():
+            html.append(f"<tr><td>{key}</td><td>{value}</td></tr>")
+        html.append("</table>")
+
+        # 3. Detected Anomalies
+        if anomalies is not None and not anomalies.empty:
+            inline, summary, anomaly_file = _prepare_anomalies(anomalies, file_name, max_anomaly_rows, anomaly_file,
+                                                              anomaly_file_written)
+            html.append("<h2>Detected Anomalies:</h2>")
+            if summary is not None:
+                html.append(f"<p>{len(anomalies)} anomalies in {anomalies['CAN_ID'].nunique()} CAN IDs. "
+                            f"Showing {len(inline)} rows; the full table is in "
+                            f"<a href='{_report_link(anomaly_file, file_name)}'>{anomaly_file}</a>.</p>")
+                html.append("<table border='1' style='border-collapse: collapse; width: 50%;'>")
+                html.append("<tr><th>CAN_ID</th><th>Count</th><th>First</th><th>Last</th></tr>")
+                html.append("".join(
+                    f"<tr><td>{format_can_id(can_id)}</td><td>{count}</td><td>{first:.6f}</td><td>{last:.6f}</td></tr>"
+                    for can_id, count, first, last in zip(summary.index, summary["Count"].to_numpy(),
+                                                          summary["First"].to_numpy(), summary["Last"].to_numpy())))
+                html.append("</table><br>")
+            html.append("<table border='1' style='border-collapse: collapse; width: 80%;'>")
+            html.append("<tr><th>Timestamp</th><th>CAN_ID</th><th>DLC</th><th>Data</th></tr>")
+            for start in range(0, len(inline), WRITE_CHUNK):
+                html.append("".join(
+                    f"<tr><td>{timestamp}</td><td>{can_id}</td><td>{dlc}</td><td>{payload}</td></tr>"
+                    for timestamp, can_id, dlc, payload in _anomaly_rows(inline.iloc[start:start + WRITE_CHUNK])))
+            html.append("</table>")
+
+        # 4. Time Interval Statistics
+        if time_interval_stats:
+            html.append("<h2>Time Interval Statistics:</h2>")
+            html.append("<ul>")
+            for key, value in time_interval_stats.items():
+                html.append(f"<li>{key}: {value:.6f} seconds</li>")
+            html.append("</ul>")
+
+        # 4-1. Per-ID Cycle Time Statistics
+        if cycle_time_stats is not None and not cycle_time_stats.empty:
+            html.append("<h2>Per-ID Cycle Time Statistics:</h2>")
+            html.append("<table border='1' style='border-collapse: collapse; width: 80%;'>")
+            html.append("<tr><th>CAN_ID</th><th>Count</th><th>Expected Period</th><th>Mean Interval</th>"
+                    "<th>Std Interval</th><th>P99 Jitter</th><th>Late Frames</th><th>Missed Frames</th></tr>")
+            columns = [cycle_time_stats[name].to_numpy() for name in
+                       ("Count", "Expected Period", "Mean Interval", "Std Interval", "P99 Jitter",
+                        "Late Frames", "Missed Frames")]
+            html.append("".join(
+                f"<tr><td>{format_can_id(can_id)}</td><td>{int(count)}</td>"
+                f"<td>{period:.6f}</td><td>{mean:.6f}</td><td>{std:.6f}</td><td>{jitter:.6f}</td>"
+                f"<td>{int(late)}</td><td>{int(missed)}</td></tr>"
+                for can_id, count, period, mean, std, jitter, late, missed in zip(cycle_time_stats.index, *columns)))
+            html.append("</table>")
+
+        # 5. Data Quality Evaluation
+        if evaluation_report:
+            html.append("<h2>Data Quality Evaluation:</h2>")
+            html.append("<pre>")
+            html.append(evaluation_report)
+            html.append("</pre>")
+
+        # 5-1. Stage Timing (--profile)
+        if timing:
+            html.append("<h2>Stage Timing:</h2>")
+            html.append("<table border='1' style='border-collapse: collapse; width: 80%;'>")
+            html.append("<tr>" + "".join(f"<th>{column}</th>" for column in TIMING_COLUMNS) + "</tr>")
+            for row in timing_rows(timing):
+                html.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>")
+            html.append("</table>")
+
+        # 6. Graphs
+        if graph_files:
+            html.append("<h2>Graphs:</h2>")
+            for graph_file in graph_files:
+                if os.path.exists(graph_file):
+                    html.append(f"<div><img src='{_report_link(graph_file, file_name)}' alt='Graph' style='width: 80%;'></div><br>")
+                else:
+                    html.append(f"<p>Graph file not found: {graph_file}</p>")
+
+        # HTML 종료
+        html.append("</body></html>")
+
         with open(file_name, "w", encoding="utf-8") as file:
-            # HTML 시작
-            file.write("<html><head><title>CAN Analysis Report</title></head><body>")
-            file.write("<h1>CAN Analysis Report</h1>")
-
-            # 1. Diagnostics Summary
-            if diagnostics:
-                file.write("<h2>Diagnostics Summary:</h2>")
-                file.write("<ul>")
-                for diagnostic in diagnostics:
-                    file.write(f"<li>{diagnostic}</li>")
-                file.write("</ul>")
-
-            # 2. Analysis Results
-            file.write("<h2>Analysis Results:</h2>")
-            file.write("<table border='1' style='border-collapse: collapse; width: 50%;'>")
-            file.write("<tr><th>Metric</th><th>Value</th></tr>")
-            for key, value in analysis_results.items():
-                file.write(f"<tr><td>{key}</td><td>{value}</td></tr>")
-            file.write("</table>")
-
-            # 3. Detected Anomalies
-            if anomalies is not None and not anomalies.empty:
-                file.write("<h2>Detected Anomalies:</h2>")
-                file.write("<table border='1' style='border-collapse: collapse; width: 80%;'>")
-                file.write("<tr><th>Timestamp</th><th>CAN_ID</th><th>DLC</th></tr>")
-                for _, row in anomalies.iterrows():
-                    file.write(f"<tr><td>{row['Timestamp']}</td><td>{row['CAN_ID']}</td><td>{row['DLC']}</td></tr>")
-                file.write("</table>")
-
-            # 4. Time Interval Statistics
-            if time_interval_stats:
-                file.write("<h2>Time Interval Statistics:</h2>")
-                file.write("<ul>")
-                for key, value in time_interval_stats.items():
-                    file.write(f"<li>{key}: {value:.6f} seconds</li>")
-                file.write("</ul>")
-
-            # 5. Data Quality Evaluation
-            if evaluation_report:
-                file.write("<h2>Data Quality Evaluation:</h2>")
-                file.write("<pre>")
-                file.write(evaluation_report)
-                file.write("</pre>")
-
-            # 6. Graphs
-            if graph_files:
-                file.write("<h2>Graphs:</h2>")
-                for graph_file in graph_files:
-                    if os.path.exists(graph_file):
-                        file.write(f"<div><img src='{graph_file}' alt='Graph' style='width: 80%;'></div><br>")
-                    else:
-                        file.write(f"<p>Graph file not found: {graph_file}</p>")
-
-            # HTML 종료
-            file.write("</body></html>")
+            file.write("".join(html))
 
         print(f"HTML report saved as {file_name}")
     except Exception as e:
@@ -0,0 +1,338 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# 현재 파일의 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.can_parser import frame_flags, payload_lengths, FLAG_EXTENDED, FLAG_FD, FLAG_BRS
+from src.diagnostic_rules import (DEFAULT_RULES, compile_rules, empty_rule_state, evaluate_rule_block,
+                                  finalize_rule_state, format_findings, merge_rule_states)
+
+# 버스 부하 계산에 사용하는 기본 비트레이트 (bit/s)
+DEFAULT_BITRATE = 500_000
+
+
+def frame_bits(lengths, flags, data_rate_ratio=1.0):
+    """
+    프레임별 비트 수를 중재(nominal) 비트레이트 기준 비트 시간으로 계산 (비트 스터핑 제외, 프레임 간 간격 3비트 포함).
+    Classic 표준 ID: 47 + 8 * 길이, 확장 ID: 67 + 8 * 길이
+    FD: 중재 구간 30 (확장 ID 49) 비트 + 데이터 구간 (ESI, DLC, 데이터, 스터프 카운트, CRC17/21) 비트
+    :param lengths: 프레임별 페이로드 바이트 수
+    :param flags: 프레임별 Flags 비트
+    :param data_rate_ratio: 데이터 비트레이트 / 중재 비트레이트 (BRS 프레임의 데이터 구간에만 적용)
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    flags = np.asarray(flags)
+    extended = (flags & FLAG_EXTENDED) != 0
+    classic = np.where(extended, 67, 47) + 8 * lengths
+
+    data_phase = np.where(lengths > 16, 30, 26) + 8 * lengths
+    data_phase = np.where(flags & FLAG_BRS, data_phase / data_rate_ratio, data_phase)
+    fd = np.where(extended, 49, 30) + data_phase
+    return np.where(flags & FLAG_FD, fd, classic)
+
+
+def _moments(values, groups, n_groups):
+    """
+    그룹별 (개수, 평균, 편차 제곱합 M2). 평균을 먼저 구한 뒤 편차 제곱을 더하므로 제곱합 - n·평균² 방식의 상쇄 오차가 없음.
+    :return: (3, n_groups) 배열
+    """
+    count = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, np.bincount(groups, weights=values, minlength=n_groups) / count, 0.0)
+    m2 = np.bincount(groups, weights=np.square(values - mean[groups]), minlength=n_groups)
+    return np.stack([count, mean, m2])
+
+
+def _merge_moments(left, right):
+    """
+    두 구간의 (개수, 평균, M2)를 병합 (Chan 병렬 알고리즘, 개수가 0인 쪽은 결과에 영향 없음).
+    """
+    count = left[0] + right[0]
+    delta = right[1] - left[1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weight = np.where(count > 0, right[0] / count, 0.0)
+    return np.stack([count, left[1] + delta * weight, left[2] + right[2] + delta * delta * left[0] * weight])
+
+
+class WindowStatistics:
+    """
+    스트리밍 CAN 트래픽의 텀블링/슬라이딩 창 통계.
+    창을 step 길이의 판(pane)으로 나눠 판별 ID별 부분 합 (빈도, DLC 합, 비트 수), 간격의 (개수, 평균, M2)와
+    진단 규칙 부분 결과 (diagnostic_rules.evaluate_rule_block)를 링 버퍼에 보관함.
+    프레임 갱신은 자기 판에 더하기만 하므로 프레임당 O(1)이고, 창 결과는 창에 속한 판들을 합쳐서 만듦.
+    메모리는 (window / step) × CAN ID 수에 비례하며 스트림 길이와 무관함.
+    step을 생략하면 텀블링 창 (window == step)이 됨.
+    이미 창에서 빠진 판에 속하는 늦은 프레임은 반영하지 않고 late_frames에 개수만 셈.
+    """
+
+    def __init__(self, window=1.0, step=None, bitrate=DEFAULT_BITRATE, on_window=None, data_bitrate=None, rules=None):
+        """
+        :param window: 창 길이 (초)
+        :param step: 슬라이딩 간격 (초, window의 약수). None이면 텀블링 창
+        :param bitrate: 버스 (중재) 비트레이트 (bit/s, 버스 부하 계산용)
+        :param data_bitrate: CAN FD 데이터 구간 비트레이트 (bit/s, BRS 프레임에 적용). None이면 bitrate와 같음
+        :param on_window: 창이 닫힐 때마다 창 결과 딕셔너리로 호출되는 함수 (옵션)
+        :param rules: 창마다 평가할 진단 규칙 딕셔너리 목록 (diagnostic_rules.load_rules). None이면 DEFAULT_RULES
+        """
+        step = window if step is None else step
+        panes = int(round(window / step))
+        if panes < 1 or not np.isclose(panes * step, window):
+            raise ValueError("window는 step의 정수 배여야 합니다.")
+        self.window = window
+        self.step = step
+        self.panes = panes
+        self.bitrate = bitrate
+        self.data_bitrate = bitrate if data_bitrate is None else data_bitrate
+        self.on_window = on_window
+        self.rules = compile_rules(DEFAULT_RULES if rules is None else rules)
+
+        self._slots = {}
+        self._ids = np.empty(0, dtype=np.uint32)
+        self._last_timestamp = np.empty(0)
+        self._last_frame = np.nan
+        self._current = None
+        self.late_frames = 0
+
+        # 링 버퍼 위치별 판 번호 (-1이면 비어 있음)와 판별 부분 합
+        self._pane_numbers = np.full(panes, -1, dtype=np.int64)
+        self._id_sums = {name: np.zeros((panes, 0)) for name in ["count", "dlc", "bits"]}
+        # 간격의 (개수, 평균, M2): ID별 간격은 (3, 판, ID), ID 구분 없는 간격은 (3, 판, 1)
+        self._id_moments = np.zeros((3, panes, 0))
+        self._gap_moments = np.zeros((3, panes, 1))
+        self._gap_min = np.full(panes, np.inf)
+        self._gap_max = np.full(panes, -np.inf)
+
+        # 판별 규칙 부분 결과와, 판 첫 프레임 / 판에서 처음 나온 ID별 직전 프레임의 타임스탬프
+        self._rule_states = [None] * panes
+        self._lead_frames = np.full(panes, np.nan)
+        self._lead_ids = [None] * panes
+
+    def __call__(self, frame):
+        self.update(frame)
+
+    def _add_ids(self, can_ids):
+        new_ids = np.setdiff1d(can_ids, self._ids)
+        if len(new_ids) == 0:
+            return
+        self._ids = np.concatenate([self._ids, new_ids.astype(np.uint32)])
+        self._slots = {int(can_id): slot for slot, can_id in enumerate(self._ids)}
+        self._last_timestamp = np.concatenate([self._last_timestamp, np.full(len(new_ids), np.nan)])
+        for name, sums in self._id_sums.items():
+            self._id_sums[name] = np.hstack([sums, np.zeros((self.panes, len(new_ids)))])
+        self._id_moments = np.concatenate([self._id_moments, np.zeros((3, self.panes, len(new_ids)))], axis=2)
+
+    def _reset_pane(self, number):
+        slot = number % self.panes
+        self._pane_numbers[slot] = number
+        for sums in self._id_sums.values():
+            sums[slot] = 0
+        self._id_moments[:, slot] = 0
+        self._gap_moments[:, slot] = 0
+        self._gap_min[slot] = np.inf
+        self._gap_max[slot] = -np.inf
+        self._rule_states[slot] = None
+        self._lead_frames[slot] = np.nan
+        self._lead_ids[slot] = None
+
+    def _advance(self, number):
+        """
+        현재 판을 닫고 number 판으로 이동. 그 사이에 끝나는 창들의 결과를 반환 (빈 창은 최대 panes개까지).
+        """
+        results = [self.window_result(closed) for closed in range(self._current, min(number, self._current + self.panes))]
+        self._current = number
+        self._reset_pane(number)
+        return results
+
+    def _accumulate(self, number, slots, dlc, bits, intervals, gaps):
+        slot = number % self.panes
+        n_ids = len(self._ids)
+        sums = self._id_sums
+        sums["count"][slot] += np.bincount(slots, minlength=n_ids)
+        sums["dlc"][slot] += np.bincount(slots, weights=dlc, minlength=n_ids)
+        sums["bits"][slot] += np.bincount(slots, weights=bits, minlength=n_ids)
+
+        valid = ~np.isnan(intervals)
+        self._id_moments[:, slot] = _merge_moments(self._id_moments[:, slot],
+                                                   _moments(intervals[valid], slots[valid], n_ids))
+
+        gaps = gaps[~np.isnan(gaps)]
+        if len(gaps):
+            self._gap_moments[:, slot] = _merge_moments(self._gap_moments[:, slot],
+                                                        _moments(gaps, np.zeros(len(gaps), dtype=np.intp), 1))
+            self._gap_min[slot] = min(self._gap_min[slot], gaps.min())
+            self._gap_max[slot] = max(self._gap_max[slot], gaps.max())
+
+    def _evaluate_rules(self, number, block, timestamps, intervals, gaps):
+        """
+        프레임 조각에 규칙을 적용해 판의 규칙 부분 결과에 병합.
+        판의 첫 프레임과 판에서 처음 나온 ID의 직전 프레임 타임스탬프를 기록해 두어,
+        창 시작 경계를 가로지르는 간격도 창 결과에서 gap 규칙으로 검사함 (간격은 뒤 프레임이 속한 판에 포함).
+        """
+        slot = number % self.panes
+        state = evaluate_rule_block(block, self.rules)
+        leads = pd.Series(timestamps - intervals, index=block["CAN_ID"].to_numpy().astype(np.int64))
+        leads = leads[~leads.index.duplicated()]
+        if self._rule_states[slot] is None:
+            self._rule_states[slot] = state
+            self._lead_frames[slot] = timestamps[0] - gaps[0]
+            self._lead_ids[slot] = leads
+        else:
+            self._rule_states[slot] = merge_rule_states(self._rule_states[slot], state)
+            known = self._lead_ids[slot]
+            self._lead_ids[slot] = pd.concat([known, leads[~leads.index.isin(known.index)]])
+
+    def _window_rule_state(self, numbers):
+        """
+        창에 속한 판 (시간 순)의 규칙 부분 결과를 병합하고, 창 직전 프레임과의 간격을 gap 규칙으로 검사.
+        """
+        slots = [number % self.panes for number in numbers if self._rule_states[number % self.panes] is not None]
+        if not slots:
+            return empty_rule_state(self.rules)
+        state = self._rule_states[slots[0]]
+        for slot in slots[1:]:
+            state = merge_rule_states(state, self._rule_states[slot])
+
+        # 창 시작 경계: 직전 프레임만 담은 (개수 0) 부분 결과와 병합해 간격 위반만 가져옴
+        leads = pd.concat([self._lead_ids[slot] for slot in slots])
+        leads = leads[~leads.index.duplicated()].dropna()
+        lead = {**empty_rule_state(self.rules), "rows": 1, "first_timestamp": self._lead_frames[slots[0]],
+                "last_timestamp": self._lead_frames[slots[0]],
+                "ids": pd.DataFrame({"Count": np.zeros(len(leads), dtype=np.int64), "First": leads.to_numpy(),
+                                     "Last": leads.to_numpy()}, index=pd.Index(leads.index, name="CAN_ID"))}
+        return {**state, "violations": merge_rule_states(lead, state)["violations"]}
+
+    def update(self, df):
+        """
+        시간 순 프레임 배치를 반영하고, 이 배치로 닫힌 창들의 결과를 반환.
+        간격은 배치/창 경계를 넘어 이전 프레임과 이어서 계산하며, 뒤 프레임이 속한 판에 포함됨.
+        :param df: CAN 로그 데이터프레임 (시간 순 배치)
+        :return: 닫힌 창 결과 딕셔너리 목록 (window_result 참고)
+        """
+        if len(df) == 0:
+            return []
+        timestamps = df["Timestamp"].to_numpy(dtype=np.float64)
+        can_ids = df["CAN_ID"].to_numpy()
+        dlc = df["DLC"].to_numpy().astype(np.float64)
+        self._add_ids(pd.unique(can_ids))
+        slots = pd.Index(self._ids).get_indexer(can_ids)
+
+        # 같은 ID의 이전 프레임과의 간격 (배치 첫 프레임은 이전 배치의 마지막 프레임과 비교)
+        intervals = df.groupby("CAN_ID", sort=False)["Timestamp"].diff().to_numpy(dtype=np.float64, copy=True)
+        first = np.isnan(intervals)
+        intervals[first] = timestamps[first] - self._last_timestamp[slots[first]]
+        last = df.groupby("CAN_ID")["Timestamp"].last()
+        self._last_timestamp[pd.Index(self._ids).get_indexer(last.index)] = last.to_numpy()
+
+        # ID 구분 없는 연속 프레임 간 간격 (calculate_time_interval_statistics와 같은 정의)
+        gaps = np.diff(timestamps, prepend=self._last_frame)
+        self._last_frame = timestamps[-1]
+        bits = frame_bits(payload_lengths(df), frame_flags(df), self.data_bitrate / self.bitrate).astype(np.float64)
+
+        numbers = np.floor(timestamps / self.step).astype(np.int64)
+        starts = np.concatenate([[0], np.flatnonzero(numbers[1:] != numbers[:-1]) + 1])
+        ends = np.concatenate([starts[1:], [len(numbers)]])
+        closed = []
+        for start, end in zip(starts, ends):
+            number = int(numbers[start])
+            if self._current is None:
+                self._current = number
+                self._reset_pane(number)
+            elif number > self._current:
+                closed.extend(self._advance(number))
+            elif number <= self._current - self.panes:
+                # 링 버퍼의 그 자리는 최신 판이 쓰고 있으므로 버리고 개수만 셈
+                self.late_frames += end - start
+                continue
+            elif self._pane_numbers[number % self.panes] != number:
+                # 프레임 없이 지나간 판 (그 자리의 이전 판은 이미 창에서 빠짐)
+                self._reset_pane(number)
+            part = slice(start, end)
+            self._accumulate(number, slots[part], dlc[part], bits[part], intervals[part], gaps[part])
+            self._evaluate_rules(number, df.iloc[part], timestamps[part], intervals[part], gaps[part])
+
+        if self.on_window is not None:
+            for result in closed:
+                self.on_window(result)
+        return closed
+
+    def window_result(self, number=None):
+        """
+        number 판에서 끝나는 창의 통계 (None이면 진행 중인 현재 창).
+        :return: window_start, window_end, statistics, frequency, time_interval_stats,
+                 id_statistics, bus_load, diagnostics, findings 키를 가진 딕셔너리
+                 (statistics / frequency / time_interval_stats는 오프라인 분석 함수와 같은 형식,
+                 findings는 창 안의 진단 규칙 결과 표, diagnostics는 그 결과의 문자열 목록)
+        """
+        number = self._current if number is None else number
+        if number is None:
+            return None
+        valid = (self._pane_numbers > number - self.panes) & (self._pane_numbers <= number)
+        sums = {name: values[valid].sum(axis=0) for name, values in self._id_sums.items()}
+        moments = np.zeros((3, len(self._ids)))
+        gap_moments = np.zeros((3, 1))
+        for slot in np.flatnonzero(valid):
+            moments = _merge_moments(moments, self._id_moments[:, slot])
+            gap_moments = _merge_moments(gap_moments, self._gap_moments[:, slot])
+
+        count = sums["count"]
+        present = count > 0
+        total = int(count.sum())
+        frequency = pd.Series(count[present].astype(np.int64), index=pd.Index(self._ids[present], name="CAN_ID"),
+                              name="count").sort_values(ascending=False, kind="stable")
+
+        interval_count, mean, m2 = moments
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(m2 / (interval_count - 1))
+        id_statistics = pd.DataFrame({
+            "Count": count[present].astype(np.int64),
+            "Rate": count[present] / self.window,
+            "Mean Interval": np.where(interval_count > 0, mean, np.nan)[present],
+            "Std Interval": np.where(interval_count > 1, std, np.nan)[present],
+        }, index=pd.Index(self._ids[present], name="CAN_ID")).sort_index()
+
+        gap_count, gap_mean, gap_m2 = gap_moments[:, 0]
+        time_interval_stats = {
+            "Min Interval": self._gap_min[valid].min() if gap_count else np.nan,
+            "Max Interval": self._gap_max[valid].max() if gap_count else np.nan,
+            "Mean Interval": gap_mean if gap_count else np.nan,
+            "Std Interval": np.sqrt(gap_m2 / (gap_count - 1)) if gap_count > 1 else np.nan,
+        }
+
+        window_end = (number + 1) * self.step
+        findings = finalize_rule_state(self._window_rule_state(np.sort(self._pane_numbers[valid])))
+        return {
+            "window_start": window_end - self.window,
+            "window_end": window_end,
+            "statistics": {
+                "Total Messages": total,
+                "Unique CAN IDs": int(present.sum()),
+                "Average DLC": sums["dlc"].sum() / total if total else np.nan,
+            },
+            "frequency": frequency,
+            "time_interval_stats": time_interval_stats,
+            "id_statistics": id_statistics,
+            "bus_load": sums["bits"].sum() / (self.window * self.bitrate),
+            "diagnostics": format_findings(findings),
+            "findings": findings,
+        }
+
+
+# 테스트 실행
+if __name__ == "__main__":
+    from src.can_parser import parse_can_log
+
+    # 샘플 데이터 로드
+    data = parse_can_log("data/sample_can_log.csv")
+    stats = WindowStatistics(window=0.2, step=0.1)
+    for result in stats.update(data) + [stats.window_result()]:
+        print(f"[{result['window_start']:.1f}, {result['window_end']:.1f}) "
+              f"bus load {result['bus_load']:.2%}", result["statistics"])
+        print(result["id_statistics"])
+
+    # 창에서 이미 빠진 판의 늦은 프레임은 현재 창에 섞이지 않고 개수만 셈
+    stats.update(data.iloc[:1])
+    print(f"Late frames dropped: {stats.late_frames}")
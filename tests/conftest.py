@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 루트를 경로에 추가 (src 패키지 import)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from src.create_sample_data import write_synthetic_log
+
+
+@pytest.fixture(scope="session")
+def sample_log():
+    """
+    저장소에 포함된 샘플 CSV 로그 경로.
+    """
+    return os.path.join(ROOT_DIR, "data", "sample_can_log.csv")
+
+
+@pytest.fixture(scope="session")
+def synthetic_log(tmp_path_factory):
+    """
+    Classic 프레임만 있는 합성 CSV 로그 (20,000 프레임).
+    """
+    file_path = str(tmp_path_factory.mktemp("logs") / "synthetic.csv")
+    write_synthetic_log(file_path, 20_000, seed=1)
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def fd_log(tmp_path_factory):
+    """
+    ID의 10%가 CAN FD 프레임인 합성 CSV 로그 (20,000 프레임).
+    """
+    file_path = str(tmp_path_factory.mktemp("logs") / "synthetic_fd.csv")
+    write_synthetic_log(file_path, 20_000, seed=2, fd_fraction=0.1)
+    return file_path
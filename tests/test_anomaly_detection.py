@@ -0,0 +1,130 @@
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.anomaly_detection as anomaly_detection
+from src.anomaly_detection import (
+    StreamingAnomalyDetector, detect_anomalies, detect_anomalies_out_of_core, sample_features, train_anomaly_model
+)
+from src.can_parser import parse_can_log, payload_lengths, payload_matrix
+from src.create_sample_data import generate_synthetic_log
+
+
+def test_reservoir_sample_does_not_depend_on_chunk_size(synthetic_log):
+    data = parse_can_log(synthetic_log, use_cache=False)
+    whole, total = sample_features(data, sample_size=500, chunksize=len(data))
+    chunked, chunked_total = sample_features(data, sample_size=500, chunksize=1_000)
+    assert total == chunked_total == len(data)
+    assert len(whole) == 500
+    # 청크 크기와 무관하게 같은 난수 키를 받으므로 같은 행이 뽑힘
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_per_id_sample_caps_each_can_id(synthetic_log):
+    data = parse_can_log(synthetic_log, use_cache=False)
+    sample, _ = sample_features(data, per_id=20, chunksize=3_000, features=["Interval", "DLC"])
+    expected = np.minimum(data["CAN_ID"].value_counts(), 20).sum()
+    assert len(sample) == expected
+
+
+def test_score_frame_matches_score_batch():
+    data = generate_synthetic_log(30_000, seed=3)
+    baseline, stream = data.iloc[:10_000], data.iloc[10_000:]
+    batch = StreamingAnomalyDetector().fit(baseline).score_batch(stream)
+
+    detector = StreamingAnomalyDetector().fit(baseline)
+    payload = payload_matrix(stream)
+    lengths = stream["DLC"].to_numpy()
+    scores = [detector.score_frame(timestamp, int(can_id), dlc, payload[row, :dlc])
+              for row, (timestamp, can_id, dlc) in enumerate(zip(stream["Timestamp"], stream["CAN_ID"], lengths))]
+    score, anomaly = map(np.array, zip(*scores))
+    np.testing.assert_allclose(score, batch["Score"].to_numpy(), rtol=1e-12)
+    np.testing.assert_array_equal(anomaly, batch["Anomaly"].to_numpy())
+
+
+def test_micro_batches_match_single_batch():
+    data = generate_synthetic_log(30_000, seed=4)
+    baseline, stream = data.iloc[:10_000], data.iloc[10_000:]
+    whole = StreamingAnomalyDetector().fit(baseline).score_batch(stream)
+    detector = StreamingAnomalyDetector().fit(baseline)
+    parts = pd.concat([detector.score_batch(stream.iloc[start:start + 777])
+                       for start in range(0, len(stream), 777)])
+    pd.testing.assert_frame_equal(parts, whole)
+
+
+def test_score_frame_matches_score_batch_with_fd_frames(fd_log):
+    data = parse_can_log(fd_log, use_cache=False)
+    baseline, stream = data.iloc[:5_000], data.iloc[5_000:12_000]
+    batch = StreamingAnomalyDetector().fit(baseline).score_batch(stream)
+
+    detector = StreamingAnomalyDetector().fit(baseline)
+    payload = payload_matrix(stream)
+    lengths = payload_lengths(stream)
+    scores = [detector.score_frame(timestamp, int(can_id), dlc, payload[row, :lengths[row]])
+              for row, (timestamp, can_id, dlc) in enumerate(zip(stream["Timestamp"], stream["CAN_ID"], stream["DLC"]))]
+    score, anomaly = map(np.array, zip(*scores))
+    np.testing.assert_allclose(score, batch["Score"].to_numpy(), rtol=1e-12)
+    np.testing.assert_array_equal(anomaly, batch["Anomaly"].to_numpy())
+
+
+def test_short_warmup_tolerates_counters_and_slow_signals():
+    # 바이트 0은 롤링 카운터, 바이트 1~2는 천천히 변하는 신호이며 1,000 프레임으로는 값 범위를 다 볼 수 없음
+    data = generate_synthetic_log(200_000, seed=7, burst_rate=0.0, attack_rate=0.0)
+    detector = StreamingAnomalyDetector().fit(data.iloc[:1_000])
+    scored = detector.score_batch(data.iloc[1_000:])
+    known = np.isin(scored["CAN_ID"].to_numpy(), detector._ids)
+    assert (scored["Anomaly"].to_numpy()[known] == -1).mean() < 0.01
+
+
+def test_spoofed_payload_is_flagged():
+    data = generate_synthetic_log(40_000, seed=8, burst_rate=0.0, attack_rate=0.0)
+    baseline, stream = data.iloc[:20_000], data.iloc[20_000:].copy()
+    can_id = stream.loc[stream["DLC"] == 8, "CAN_ID"].iloc[0]
+    row = stream.index[stream["CAN_ID"] == can_id][10]
+    # 고정값 바이트 (B7)를 바꾼 프레임 한 개
+    stream.loc[row, "B7"] = np.uint8(stream.at[row, "B7"] ^ 0x80)
+    scored = StreamingAnomalyDetector().fit(baseline).score_batch(stream)
+    assert scored.at[row, "Anomaly"] == -1
+
+
+def test_detect_anomalies_returns_same_columns_with_and_without_model(synthetic_log):
+    data = parse_can_log(synthetic_log, use_cache=False).iloc[:5_000]
+    fitted = detect_anomalies(data)
+    scored = detect_anomalies(data, model_bundle=train_anomaly_model(data))
+    assert list(fitted.columns) == list(scored.columns) == [*data.columns, "Score", "Anomaly"]
+    # 같은 데이터로 학습한 모델이므로 점수와 판정이 같음
+    np.testing.assert_array_equal(fitted["Anomaly"].to_numpy(), scored["Anomaly"].to_numpy())
+    np.testing.assert_allclose(fitted["Score"].to_numpy(), scored["Score"].to_numpy())
+
+
+def test_out_of_core_reads_the_cache_instead_of_the_log(synthetic_log, tmp_path, monkeypatch):
+    file_path = str(tmp_path / "cached.csv")
+    shutil.copy(synthetic_log, file_path)
+    from_log = detect_anomalies_out_of_core(file_path, str(tmp_path / "from_log.csv"), sample_size=2_000,
+                                            chunksize=3_000)
+    data = parse_can_log(file_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("log was parsed again")
+
+    # 캐시가 있으면 로그를 다시 읽지 않고 같은 결과를 냄
+    monkeypatch.setattr(anomaly_detection, "iter_can_log_chunks", fail)
+    from_cache = detect_anomalies_out_of_core(file_path, str(tmp_path / "from_cache.csv"), sample_size=2_000,
+                                              chunksize=3_000)
+    from_frame = detect_anomalies_out_of_core(data, str(tmp_path / "from_frame.csv"), sample_size=2_000,
+                                              chunksize=3_000)
+    for result in [from_cache, from_frame]:
+        np.testing.assert_array_equal(result["rows"], from_log["rows"])
+        np.testing.assert_array_equal(result["scores"], from_log["scores"])
+    assert open(tmp_path / "from_cache.csv").read() == open(tmp_path / "from_log.csv").read()
+
+
+def test_parquet_output_without_pyarrow_fails_before_scoring(synthetic_log, tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    output_file = tmp_path / "anomalies.parquet"
+    with pytest.raises(ImportError, match="pyarrow"):
+        detect_anomalies_out_of_core(synthetic_log, str(output_file), sample_size=1_000, chunksize=3_000)
+    assert not output_file.exists()
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.can_parser import iter_can_log_chunks, parse_can_log
+from src.create_sample_data import write_synthetic_log
+from src.data_analysis import calculate_cycle_time_statistics, run_analysis, run_analysis_parallel
+
+
+def _assert_same_analysis(left, right):
+    assert left["statistics"] == right["statistics"]
+    assert left["time_interval_stats"] == right["time_interval_stats"]
+    pd.testing.assert_series_equal(left["frequency"], right["frequency"])
+    assert left["evaluation_report"] == right["evaluation_report"]
+    assert left["diagnostics"] == right["diagnostics"]
+    pd.testing.assert_frame_equal(left["findings"], right["findings"])
+    for left_array, right_array in zip(left["interval_histogram"], right["interval_histogram"]):
+        np.testing.assert_array_equal(left_array, right_array)
+
+
+def test_chunked_analysis_matches_whole_frame(synthetic_log):
+    data = parse_can_log(synthetic_log, use_cache=False)
+    chunked = run_analysis(iter_can_log_chunks(synthetic_log, chunksize=4_096), block_size=4_096)
+    _assert_same_analysis(chunked, run_analysis(data, block_size=4_096))
+
+
+def test_cycle_time_statistics_with_repeated_timestamps():
+    # 같은 타임스탬프만 반복되는 ID는 기대 주기가 0이므로 누락/지연 프레임이 없어야 함
+    repeated = pd.DataFrame({"Timestamp": [0.0, 0.0, 0.0, 0.1, 0.2, 0.3, 0.5],
+                             "CAN_ID": np.array([1, 1, 1, 2, 2, 2, 2], dtype=np.uint32),
+                             "DLC": np.full(7, 8, dtype=np.uint8)})
+    with np.errstate(all="raise"):
+        cycle_times = calculate_cycle_time_statistics(repeated)
+    assert cycle_times.loc[1, "Missed Frames"] == 0 and cycle_times.loc[1, "Late Frames"] == 0
+    assert cycle_times.loc[2, "Missed Frames"] == 1
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_parallel_analysis_matches_serial(tmp_path, use_cache):
+    file_path = str(tmp_path / "parallel.csv")
+    write_synthetic_log(file_path, 300_000, seed=6)
+    data = parse_can_log(file_path, use_cache=use_cache)
+    serial = run_analysis(data)
+    parallel = run_analysis_parallel(data, workers=4, file_path=file_path if use_cache else None)
+    _assert_same_analysis(parallel, serial)
+
+
+def test_frequency_ties_keep_first_appearance_order():
+    data = pd.DataFrame({"Timestamp": np.arange(4, dtype=np.float64),
+                         "CAN_ID": np.array([0x300, 0x200, 0x100, 0x300], dtype=np.uint32),
+                         "DLC": np.full(4, 8, dtype=np.uint8)})
+    for block_size in [1, 2, 4]:
+        frequency = run_analysis(data, block_size=block_size)["frequency"]
+        assert frequency.index.tolist() == [0x300, 0x200, 0x100]
+        assert frequency.tolist() == [2, 1, 1]
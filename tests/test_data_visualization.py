@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from src.data_visualization import _m4_reduce, signal_plot_data
+
+
+def _signal(n, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = np.sort(rng.uniform(0, 100, n))
+    values = np.sin(timestamps) + rng.normal(0, 0.01, n)
+    values[rng.choice(n, 20, replace=False)] = 50.0  # 짧은 스파이크
+    return timestamps, values
+
+
+def test_m4_reduce_keeps_first_last_min_max_per_bin():
+    timestamps, values = _signal(500_000)
+    reduced_times, reduced_values = _m4_reduce(timestamps, values, bins=1000)
+    assert len(reduced_times) <= 4 * 1000
+    assert np.all(np.diff(reduced_times) >= 0)
+
+    width = (timestamps[-1] - timestamps[0]) / 1000
+    groups = np.minimum(((timestamps - timestamps[0]) / width).astype(np.int64), 999)
+    expected = pd.Series(values).groupby(groups).agg(["first", "last", "min", "max"])
+    reduced_groups = np.minimum(((reduced_times - timestamps[0]) / width).astype(np.int64), 999)
+    actual = pd.Series(reduced_values).groupby(reduced_groups).agg(["first", "last", "min", "max"])
+    pd.testing.assert_frame_equal(actual, expected)
+    # 스파이크가 있는 구간마다 스파이크 하나는 남음
+    assert np.count_nonzero(reduced_values == 50.0) == len(np.unique(groups[values == 50.0]))
+
+
+def test_m4_reduce_leaves_short_series_unchanged():
+    timestamps, values = _signal(1_000)
+    reduced_times, reduced_values = _m4_reduce(timestamps, values, bins=1000)
+    np.testing.assert_array_equal(reduced_times, timestamps)
+    np.testing.assert_array_equal(reduced_values, values)
+
+
+def test_signal_plot_data_bounds_points_per_series():
+    timestamps, values = _signal(200_000)
+    decoded = {"Engine": pd.DataFrame({"Timestamp": timestamps, "CAN_ID": 0x0C0, "RPM": values,
+                                       "Gear": np.round(values).astype(np.int64)})}
+    series = signal_plot_data(decoded, max_bins=500)["series"]
+    assert [label for label, _, _ in series] == ["Engine.RPM", "Engine.Gear"]
+    for label, reduced_times, reduced_values in series:
+        assert len(reduced_times) == len(reduced_values) <= 4 * 500
+        column = decoded["Engine"][label.split(".")[1]]
+        assert (reduced_values.min(), reduced_values.max()) == (column.min(), column.max())
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.dbc_decoder import extract_raw_signal
+
+
+def _reference_bits(signal):
+    """
+    시그널 비트 위치를 MSB부터 한 비트씩 나열 (DBC 비트 번호 규칙을 그대로 따름).
+    """
+    start, length = signal["start_bit"], signal["length"]
+    if signal["byte_order"] == "little_endian":
+        return [start + length - 1 - k for k in range(length)]
+    bits = [start]
+    for _ in range(length - 1):
+        bit = bits[-1]
+        bits.append(bit + 15 if bit % 8 == 0 else bit - 1)
+    return bits
+
+
+def _reference_value(row, signal):
+    value = 0
+    for bit in _reference_bits(signal):
+        value = (value << 1) | int((row[bit // 8] >> (bit % 8)) & 1)
+    if signal["is_signed"] and value >> (signal["length"] - 1):
+        value -= 1 << signal["length"]
+    return value
+
+
+def _signals():
+    rng = np.random.default_rng(0)
+    for byte_order in ["little_endian", "big_endian"]:
+        for length in [1, 4, 8, 12, 16, 31, 32, 57, 63, 64]:
+            for _ in range(6):
+                # 16바이트 페이로드 안에 들어가는 시작 비트만 고름
+                if byte_order == "little_endian":
+                    start = int(rng.integers(0, 128 - length + 1))
+                else:
+                    msb = int(rng.integers(0, 128 - length + 1))
+                    start = (msb // 8) * 8 + 7 - msb % 8
+                for is_signed in [False, True]:
+                    yield {"name": "S", "start_bit": start, "length": length, "byte_order": byte_order,
+                           "is_signed": is_signed, "scale": 1.0, "offset": 0.0}
+
+
+@pytest.mark.parametrize("signal", list(_signals()),
+                         ids=lambda s: f"{s['byte_order']}-{s['start_bit']}-{s['length']}-{int(s['is_signed'])}")
+def test_extract_raw_signal_matches_bitwise_reference(signal):
+    payload = np.random.default_rng(signal["start_bit"] * 131 + signal["length"]).integers(
+        0, 256, size=(32, 16), dtype=np.uint8)
+    payload[0] = 0xFF
+    payload[1] = 0
+    values = extract_raw_signal(payload, signal)
+    expected = [_reference_value(row, signal) for row in payload]
+    assert [int(value) for value in values] == expected
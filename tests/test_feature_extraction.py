@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from src.can_parser import parse_can_log
+from src.data_analysis import iter_frame_blocks
+from src.feature_extraction import extract_features, iter_feature_chunks
+
+
+def test_chunked_features_match_whole_frame(fd_log):
+    data = parse_can_log(fd_log, use_cache=False)
+    whole, _ = extract_features(data)
+    chunked = pd.concat([features for _, features in iter_feature_chunks(iter_frame_blocks(data, 1_537))])
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_state_carries_previous_frames_across_chunks():
+    data = pd.DataFrame({"Timestamp": [0.0, 0.1, 0.2, 0.3], "CAN_ID": np.array([1, 2, 1, 1], dtype=np.uint32),
+                         "DLC": np.full(4, 1, dtype=np.uint8), "B0": np.array([0, 5, 3, 3], dtype=np.uint8)})
+    _, state = extract_features(data.iloc[:2])
+    features, _ = extract_features(data.iloc[2:], state)
+    np.testing.assert_allclose(features["Interval"], [0.2, 0.1])
+    np.testing.assert_array_equal(features["Byte Delta"], [3, 0])
@@ -0,0 +1,92 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.can_parser import parse_can_log, payload_matrix, FD_EXTENSION_COLUMNS
+from src.log_cache import load_cached_log, clear_cached_log
+
+
+def _copy_log(source, tmp_path):
+    target = str(tmp_path / os.path.basename(source))
+    shutil.copy(source, target)
+    return target
+
+
+def _assert_same_frames(left, right):
+    assert list(left.columns) == list(right.columns)
+    for column in ["Timestamp", "CAN_ID", "DLC", "Flags"]:
+        np.testing.assert_array_equal(np.asarray(left[column]), np.asarray(right[column]))
+    np.testing.assert_array_equal(payload_matrix(left), payload_matrix(right))
+
+
+def test_cached_log_matches_parsed_log(synthetic_log, tmp_path):
+    file_path = _copy_log(synthetic_log, tmp_path)
+    parsed = parse_can_log(file_path, use_cache=False)
+    stored = parse_can_log(file_path, chunksize=3_000)
+    cached = load_cached_log(file_path)
+    assert cached is not None
+    _assert_same_frames(stored, parsed)
+    _assert_same_frames(cached, parsed)
+
+
+def test_fd_extension_columns_round_trip_as_sparse(fd_log, tmp_path):
+    file_path = _copy_log(fd_log, tmp_path)
+    parsed = parse_can_log(file_path, use_cache=False, chunksize=3_000)
+    cached = parse_can_log(file_path, chunksize=3_000)
+    assert all(isinstance(parsed[column].dtype, pd.SparseDtype) for column in FD_EXTENSION_COLUMNS)
+    assert all(isinstance(cached[column].dtype, pd.SparseDtype) for column in FD_EXTENSION_COLUMNS)
+    _assert_same_frames(cached, parsed)
+    # 행 선택 후에도 uint8 희소 컬럼이 유지됨
+    subset = cached[cached["CAN_ID"].to_numpy() % 2 == 0]
+    assert subset[FD_EXTENSION_COLUMNS[0]].dtype == cached[FD_EXTENSION_COLUMNS[0]].dtype
+
+
+def test_cache_is_invalidated_when_log_changes(synthetic_log, tmp_path):
+    file_path = _copy_log(synthetic_log, tmp_path)
+    original = parse_can_log(file_path)
+    with open(file_path, "a", encoding="utf-8") as file:
+        file.write("999.0,0x123,2,01 02\n")
+    assert load_cached_log(file_path) is None
+    appended = parse_can_log(file_path)
+    assert len(appended) == len(original) + 1
+    assert appended["Timestamp"].iloc[-1] == 999.0
+
+
+def test_cache_survives_touch_but_not_same_size_edit(synthetic_log, tmp_path):
+    file_path = _copy_log(synthetic_log, tmp_path)
+    parse_can_log(file_path)
+    stat = os.stat(file_path)
+
+    # 내용이 같으면 mtime만 바뀌어도 해시가 같으므로 캐시 유지
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_cached_log(file_path) is not None
+
+    # 크기는 같고 내용만 바뀌면 다시 파싱
+    with open(file_path, "r+b") as file:
+        content = file.read()
+        position = content.index(b"0x", 100)
+        file.seek(position + 2)
+        file.write(b"7" if content[position + 2:position + 3] != b"7" else b"6")
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert load_cached_log(file_path) is None
+
+
+def test_unwritable_cache_falls_back_to_memory(synthetic_log, tmp_path):
+    file_path = _copy_log(synthetic_log, tmp_path)
+    clear_cached_log(file_path)
+    # 캐시 디렉토리 자리에 일반 파일이 있으면 캐시를 저장할 수 없음
+    open(file_path + ".cancache", "w").close()
+    data = parse_can_log(file_path)
+    _assert_same_frames(data, parse_can_log(file_path, use_cache=False))
+
+
+def test_empty_log_has_typed_columns(tmp_path):
+    file_path = str(tmp_path / "empty.csv")
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("Timestamp,CAN_ID,DLC,Data\n")
+    for use_cache in (True, True, False):
+        data = parse_can_log(file_path, use_cache=use_cache)
+        assert len(data) == 0
+        assert data["CAN_ID"].dtype == np.uint32 and data["B0"].dtype == np.uint8
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.can_parser import parse_can_log
+from src.log_index import CANLogIndex
+
+
+@pytest.fixture(scope="module")
+def cached_frame(synthetic_log):
+    # 캐시 메모리 맵 컬럼으로 만든 프레임
+    parse_can_log(synthetic_log)
+    return parse_can_log(synthetic_log)
+
+
+def test_by_can_id_matches_boolean_filter(cached_frame):
+    index = CANLogIndex(cached_frame)
+    timestamps = cached_frame["Timestamp"].to_numpy()
+    start_time, end_time = timestamps[len(timestamps) // 4], timestamps[len(timestamps) // 2]
+    for can_id in index.can_ids[:10]:
+        expected = cached_frame[(cached_frame["CAN_ID"] == can_id)
+                                & (cached_frame["Timestamp"] >= start_time) & (cached_frame["Timestamp"] <= end_time)]
+        selected = index.by_can_id(int(can_id), start_time, end_time)
+        pd.testing.assert_frame_equal(selected, expected)
+        assert index.count(start_time, end_time, int(can_id)) == len(expected)
+    assert len(index.by_can_id("0x7FF0")) == 0
+
+
+def test_by_can_id_on_unsorted_log():
+    data = pd.DataFrame({"Timestamp": [0.3, 0.1, 0.2, 0.0], "CAN_ID": np.array([1, 2, 1, 1], dtype=np.uint32),
+                         "DLC": np.full(4, 8, dtype=np.uint8)})
+    index = CANLogIndex(data)
+    np.testing.assert_array_equal(index.by_can_id(1)["Timestamp"].to_numpy(), [0.0, 0.2, 0.3])
+    np.testing.assert_array_equal(index.time_range(0.1, 0.2)["CAN_ID"].to_numpy(), [2, 1])
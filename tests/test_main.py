@@ -0,0 +1,17 @@
+import sys
+
+import pytest
+
+import main
+
+
+def test_parquet_anomaly_file_without_pyarrow_is_rejected_up_front(sample_log, tmp_path, monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--file", sample_log, "--output-dir", str(tmp_path),
+                                      "--anomaly-file", "anomalies.parquet"])
+    with pytest.raises(SystemExit) as exit_info:
+        main.main()
+    assert exit_info.value.code == 2
+    assert "pyarrow" in capsys.readouterr().err
+    # 분석을 시작하지 않았으므로 출력 파일이 없음
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.can_parser import format_can_id, parse_can_log
+from src.create_sample_data import generate_synthetic_log
+from src.data_analysis import iter_frame_blocks
+from src.diagnostic_rules import evaluate_rules
+from src.window_statistics import WindowStatistics
+
+
+def _direct_window(data, intervals, gaps, numbers, result, stats):
+    """
+    판을 거치지 않고 창에 속한 프레임만 골라서 직접 계산한 창 통계.
+    """
+    end = int(round(result["window_end"] / stats.step)) - 1
+    inside = (numbers > end - stats.panes) & (numbers <= end)
+    frames = data[inside]
+    window_intervals = pd.Series(intervals[inside]).groupby(frames["CAN_ID"].to_numpy()).agg(["mean", "std"])
+    return frames, window_intervals, gaps[inside]
+
+
+def _window_runs(data, stats, block_size=2_999):
+    results = []
+    for block in iter_frame_blocks(data, block_size):
+        results.extend(stats.update(block))
+    return results + [stats.window_result()]
+
+
+@pytest.mark.parametrize("window, step", [(0.5, 0.5), (0.5, 0.1)])
+def test_pane_merge_matches_direct_computation(window, step):
+    data = generate_synthetic_log(40_000, seed=5)
+    stats = WindowStatistics(window=window, step=step)
+    results = _window_runs(data, stats)
+    assert len(results) > 3
+
+    timestamps = data["Timestamp"].to_numpy()
+    intervals = data.groupby("CAN_ID")["Timestamp"].diff().to_numpy()
+    gaps = np.diff(timestamps, prepend=np.nan)
+    numbers = np.floor(timestamps / step).astype(np.int64)
+    for result in results:
+        frames, window_intervals, window_gaps = _direct_window(data, intervals, gaps, numbers, result, stats)
+        assert result["statistics"]["Total Messages"] == len(frames)
+        assert result["statistics"]["Unique CAN IDs"] == frames["CAN_ID"].nunique()
+        assert result["statistics"]["Average DLC"] == pytest.approx(frames["DLC"].mean())
+        counts = frames["CAN_ID"].value_counts().sort_index()
+        np.testing.assert_array_equal(result["id_statistics"]["Count"].to_numpy(), counts.to_numpy())
+
+        id_statistics = result["id_statistics"]
+        np.testing.assert_allclose(id_statistics["Mean Interval"].to_numpy(),
+                                   window_intervals["mean"].to_numpy(), rtol=1e-9)
+        np.testing.assert_allclose(id_statistics["Std Interval"].to_numpy(),
+                                   window_intervals["std"].to_numpy(), rtol=1e-9)
+        window_gaps = window_gaps[~np.isnan(window_gaps)]
+        assert result["time_interval_stats"]["Mean Interval"] == pytest.approx(window_gaps.mean(), rel=1e-9)
+        assert result["time_interval_stats"]["Std Interval"] == pytest.approx(window_gaps.std(ddof=1), rel=1e-9)
+        assert result["time_interval_stats"]["Max Interval"] == window_gaps.max()
+
+
+def test_std_of_near_constant_periods_is_accurate():
+    # 주기 10 ms, 지터 1 ns: 제곱합 - n·평균² 방식이면 분산이 상쇄 오차에 묻히는 경우
+    rng = np.random.default_rng(0)
+    data = generate_synthetic_log(6_000, seed=5)
+    data["CAN_ID"] = 0x100
+    data["Timestamp"] = 1_000 + np.arange(len(data)) * 0.01 + rng.normal(0, 1e-9, len(data))
+    stats = WindowStatistics(window=20.0, step=5.0)
+    results = _window_runs(data, stats)
+
+    intervals = data["Timestamp"].diff()
+    numbers = np.floor(data["Timestamp"].to_numpy() / stats.step).astype(np.int64)
+    for result in results:
+        end = int(round(result["window_end"] / stats.step)) - 1
+        inside = (numbers > end - stats.panes) & (numbers <= end)
+        expected = intervals[inside].std()
+        assert result["id_statistics"]["Std Interval"].iloc[0] == pytest.approx(expected, rel=1e-6)
+        assert result["time_interval_stats"]["Std Interval"] == pytest.approx(expected, rel=1e-6)
+
+
+# 프레임 단위 규칙, rate 규칙과 창 경계를 넘을 수 있는 gap 규칙
+WINDOW_RULES = [
+    {"name": "low_dlc", "type": "dlc", "min": 4},
+    {"name": "bus_gap", "type": "gap", "max_gap": 0.002},
+    {"name": "id_gap", "type": "gap", "can_id": 1607, "max_gap": 0.0103},
+    {"name": "byte2", "type": "payload", "byte": 2, "max": 8},
+    {"name": "id_rate", "type": "rate", "can_id": 1607, "expected_rate": 100, "tolerance": 0.01},
+    {"name": "missing", "type": "rate", "can_id": "0x7DF", "expected_rate": 10},
+]
+
+
+@pytest.mark.parametrize("window, step", [(0.5, 0.5), (0.5, 0.1)])
+def test_window_findings_match_rule_evaluation(window, step):
+    data = generate_synthetic_log(40_000, seed=5)
+    stats = WindowStatistics(window=window, step=step, rules=WINDOW_RULES)
+    results = _window_runs(data, stats)
+
+    timestamps = data["Timestamp"].to_numpy()
+    intervals = data.groupby("CAN_ID")["Timestamp"].diff().to_numpy()
+    gaps = np.diff(timestamps, prepend=np.nan)
+    numbers = np.floor(timestamps / step).astype(np.int64)
+    reported = 0
+    for result in results:
+        frames, _, window_gaps = _direct_window(data, intervals, gaps, numbers, result, stats)
+        findings = result["findings"]
+        gap_rules = findings["Rule"].isin(["bus_gap", "id_gap"])
+        expected = evaluate_rules(frames, WINDOW_RULES)
+        pd.testing.assert_frame_equal(findings[~gap_rules].reset_index(drop=True),
+                                      expected[~expected["Rule"].isin(["bus_gap", "id_gap"])].reset_index(drop=True))
+
+        # 간격은 창 직전 프레임과의 간격까지 포함 (뒤 프레임이 속한 창에 기록)
+        window_intervals = intervals[(numbers > int(round(result["window_end"] / step)) - 1 - stats.panes)
+                                     & (numbers <= int(round(result["window_end"] / step)) - 1)]
+        hits = {"bus_gap": window_gaps > 0.002,
+                "id_gap": (frames["CAN_ID"].to_numpy() == 1607) & (window_intervals > 0.0103)}
+        for name, mask in hits.items():
+            row = findings[findings["Rule"] == name]
+            times = frames["Timestamp"].to_numpy()[mask]
+            assert row["Count"].sum() == len(times)
+            if len(times):
+                assert (row["First Timestamp"].item(), row["Last Timestamp"].item()) == (times[0], times[-1])
+        reported += len(findings)
+    assert reported > len(results)
+
+
+def test_gap_across_tumbling_window_boundary_is_reported():
+    data = generate_synthetic_log(12, seed=5)
+    data["Timestamp"] = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 1.3, 1.4, 1.5, 1.6]
+    data.loc[3, "DLC"] = 1
+    stats = WindowStatistics(window=1.0)
+    first, second = stats.update(data) + [stats.window_result()]
+    assert first["diagnostics"] == [f"CAN ID {format_can_id(data['CAN_ID'].iloc[3])} [low_dlc] DLC below 2: "
+                                    "1 frames between 0.400000 s and 0.400000 s"]
+    assert second["diagnostics"] == ["Bus [bus_gap] gap > 0.2 s: 1 frames between 1.300000 s and 1.300000 s"]
+
+
+def test_late_frames_from_closed_panes_are_dropped(sample_log):
+    data = parse_can_log(sample_log, use_cache=False)
+    stats = WindowStatistics(window=0.2, step=0.1)
+    stats.update(data)
+    current = stats.window_result()["statistics"]
+    # 창에서 이미 빠진 판의 늦은 프레임은 현재 창에 섞이지 않고 개수만 셈
+    stats.update(data.iloc[:1])
+    assert stats.late_frames == 1
+    assert stats.window_result()["statistics"] == current